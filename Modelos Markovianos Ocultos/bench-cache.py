@@ -0,0 +1,94 @@
+# --- BENCHMARK: CACHE DE JANELAS E VITERBI POR CORRIDAS ---
+# 1) Job noturno simulado: uma frota manda janelas curtas, muitas delas
+#    repetidas (corridas de 'Normal', o mesmo encaixe na base). Compara
+#    ModeloHMM.viterbi_indices em cada janela com o CacheViterbi (taxa de
+#    acerto, despejos, tempo).
+# 2) Logs com corridas de comprimento médio L: viterbi_log contra o
+#    DecodificadorRuns (potências no semianel (max, +)), conferindo a log-prob
+#    e que o caminho devolvido a atinge (empates podem dar outro caminho).
+#
+# Uso:  python bench-cache.py [--janelas 20000] [--distintas 500] [--T 200000]
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+
+
+def janelas_da_frota(modelo, n_janelas, n_distintas, tamanho, rng):
+    """Janelas sorteadas (com repetição, popularidade ~ Zipf) de um conjunto de n_distintas."""
+    base = [np.repeat(rng.integers(0, modelo.n_observacoes, 4), rng.multinomial(tamanho - 4, [0.25] * 4) + 1)
+            for _ in range(n_distintas)]
+    populares = np.minimum(rng.zipf(1.3, n_janelas), n_distintas) - 1
+    return [base[i] for i in populares]
+
+
+def log_em_corridas(modelo, T, media, rng):
+    """Log de T observações em corridas de comprimento ~ geométrico com a média dada."""
+    comprimentos = rng.geometric(1.0 / media, size=T // max(1, int(media)) + 1)
+    simbolos = rng.integers(0, modelo.n_observacoes, len(comprimentos))
+    return np.repeat(simbolos, comprimentos)[:T]
+
+
+def log_prob_caminho(modelo, caminho, obs):
+    """log P(caminho, obs) somada passo a passo."""
+    caminho = np.asarray(caminho)
+    return float(modelo.log_pi[caminho[0]] + modelo.log_A[caminho[:-1], caminho[1:]].sum()
+                 + modelo.log_B[caminho, obs].sum())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do cache e do Viterbi por corridas')
+    parser.add_argument('--janelas', type=int, default=20000)
+    parser.add_argument('--distintas', type=int, default=500)
+    parser.add_argument('--tamanho', type=int, default=64, help='passos por janela')
+    parser.add_argument('--limite-kb', type=float, default=32.0, help='orçamento do cache')
+    parser.add_argument('--T', type=int, default=200000, help='tamanho dos logs em corridas')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    robo = ModeloHMM.carregar(CAMINHO_ROBO)
+
+    # --- 1) Cache de janelas ---
+    janelas = janelas_da_frota(robo, args.janelas, args.distintas, args.tamanho, rng)
+    inicio = time.perf_counter()
+    for janela in janelas:
+        robo.viterbi_indices(janela)
+    sem_cache = time.perf_counter() - inicio
+
+    cache = robo.cache_viterbi(limite_bytes=int(args.limite_kb * 1024))
+    inicio = time.perf_counter()
+    for janela in janelas:
+        cache.decodificar(janela)
+    com_cache = time.perf_counter() - inicio
+    est = cache.estatisticas()
+    print(f"{args.janelas} janelas de {args.tamanho} passos ({args.distintas} distintas), "
+          f"orçamento {args.limite_kb:.0f} KB")
+    print(f"  sem cache: {sem_cache:.3f}s | com cache: {com_cache:.3f}s ({sem_cache / com_cache:.1f}x)")
+    print(f"  acertos {est['taxa_acerto']:.1%}, {est['entradas']} entradas, {est['bytes'] / 1024:.1f} KB, "
+          f"{est['despejos']} despejos")
+
+    # --- 2) Viterbi por corridas ---
+    print(f"\nLogs de T = {args.T} em corridas (DecodificadorRuns vs viterbi_log):")
+    print(f"{'L médio':>8} | {'corridas':>9} | {'viterbi_log':>11} | {'por corridas':>12} | {'aceleração':>10} | "
+          f"{'mesma log P':>11} | {'caminho ótimo':>13}")
+    print("-" * 94)
+    runs = robo.decodificador_runs()
+    for media in (1, 2, 8, 32, 128, 1024):
+        obs = log_em_corridas(robo, args.T, media, rng)
+        n_corridas = int(np.count_nonzero(np.diff(obs)) + 1)
+        inicio = time.perf_counter()
+        _, lp_log = robo.viterbi_indices(obs)
+        t_log = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        caminho_runs, lp_runs = runs.decodificar(obs)
+        t_runs = time.perf_counter() - inicio
+        confere = 'sim' if np.isclose(lp_log, lp_runs, rtol=1e-9) else 'NÃO'
+        # Empates podem dar outro caminho: confere que o caminho devolvido atinge a log P ótima
+        otimo = 'sim' if np.isclose(log_prob_caminho(robo, caminho_runs, obs), lp_log, rtol=1e-9) else 'NÃO'
+        print(f"{media:>8} | {n_corridas:>9} | {t_log:10.3f}s | {t_runs:11.3f}s | {t_log / t_runs:9.1f}x | "
+              f"{confere:>11} | {otimo:>13}")
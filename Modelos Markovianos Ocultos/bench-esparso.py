@@ -0,0 +1,71 @@
+# --- BENCHMARK: MOTOR DENSO vs. ESPARSO (CSR) ---
+# Viterbi e forward para modelos com S = 3 .. 5000 estados em que cada
+# estado só transita para poucos vizinhos (como cômodo x atividade),
+# mostrando onde o custo O(nnz) do motor esparso passa a vencer o O(S^2).
+#
+# Uso:  python bench-esparso.py [--T 100] [--vizinhos 6]
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_esparso import TransicoesCSR, escolher_motor, forward_esparso, viterbi_esparso
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import forward, log_seguro, viterbi_log
+
+
+def modelo_esparso(S, vizinhos, n_obs, rng):
+    """A com 'vizinhos' sucessores por estado (ele mesmo + vizinhos aleatórios)."""
+    A = np.zeros((S, S))
+    for i in range(S):
+        destinos = rng.choice(S, size=min(S, vizinhos), replace=False)
+        A[i, destinos] = rng.random(len(destinos))
+        A[i, i] += 1.0
+    A /= A.sum(axis=1, keepdims=True)
+    pi = np.full(S, 1.0 / S)
+    B = rng.random((S, n_obs))
+    B /= B.sum(axis=1, keepdims=True)
+    return pi, A, B
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark dos motores denso e esparso')
+    parser.add_argument('--T', type=int, default=100, help='comprimento da sequência')
+    parser.add_argument('--vizinhos', type=int, default=6, help='sucessores por estado')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.semente)
+
+    print(f"{'S':>6} | {'densidade':>9} | {'vit. denso':>10} | {'vit. CSR':>10} | "
+          f"{'fwd denso':>10} | {'fwd CSR':>10} | {'auto':>8} | {'iguais?':>7}")
+    print("-" * 92)
+
+    robo = ModeloHMM.carregar(CAMINHO_ROBO)
+    casos = [('robo', robo.pi, robo.A, robo.B)]
+    for S in [10, 30, 100, 300, 1000, 3000, 5000]:
+        casos.append((S,) + modelo_esparso(S, args.vizinhos, 8, rng))
+
+    for nome, pi, A, B in casos:
+        S = len(pi)
+        obs = rng.integers(0, B.shape[1], args.T)
+        log_pi, log_A, log_B = log_seguro(pi), log_seguro(A), log_seguro(B)
+        csr = TransicoesCSR(A)
+
+        (caminho_d, _, _), t_vd = cronometrar(viterbi_log, log_pi, log_A, log_B, obs)
+        (caminho_e, _, _), t_ve = cronometrar(viterbi_esparso, log_pi, csr, log_B, obs)
+        (ll_d, _), t_fd = cronometrar(forward, pi, A, B, obs)
+        (ll_e, _), t_fe = cronometrar(forward_esparso, pi, csr, B, obs)
+        iguais = np.array_equal(caminho_d, caminho_e) and np.isclose(ll_d, ll_e)
+
+        rotulo = f"{nome}" if nome == 'robo' else f"{S}"
+        print(f"{rotulo:>6} | {csr.densidade:>9.4f} | {t_vd * 1e3:>8.1f}ms | {t_ve * 1e3:>8.1f}ms | "
+              f"{t_fd * 1e3:>8.1f}ms | {t_fe * 1e3:>8.1f}ms | {escolher_motor(A):>8} | "
+              f"{'sim' if iguais else 'NÃO':>7}")
@@ -0,0 +1,88 @@
+# --- BENCHMARK: HMM FATORIAL (K ROBÔS NA MESMA CASA) ---
+# Tempo do Viterbi e do forward-backward do hmm_fatorial para K = 2 .. 6
+# robôs com o RoboHMM (S = 3) e interação na base de carga, contra o
+# Viterbi do hmm_nucleo sobre o HMM conjunto "achatado" (matriz de
+# transição S^K × S^K montada por Kronecker), enquanto ela couber no limite
+# de memória. Confere que os dois encontram a mesma log-probabilidade.
+# Para K pequeno o achatado ganha (S^K minúsculo, um passo = uma operação
+# NumPy); as contrações por fator passam à frente quando S^(2K) domina.
+#
+# Uso:  python bench-fatorial.py [--T 1000] [--K 2 3 4 5 6] [--S 3] [--limite-mb 256]
+#       (--S diferente de 3 usa modelos aleatórios do hmm_amostragem)
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_amostragem import amostrar, modelo_aleatorio
+from hmm_fatorial import (emissoes_conjuntas, forward_backward_fatorial, log_pi_conjunto,
+                          tensor_interacao, viterbi_fatorial)
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import log_seguro, viterbi_log
+
+
+def parametros(S, rng):
+    """(pi, A, B, interacao) do RoboHMM (S = 3) ou de um modelo aleatório."""
+    if S == 3:
+        robo = ModeloHMM.carregar(CAMINHO_ROBO)
+        interacao = np.ones((S, S))
+        base = robo.mapa_estados['Base']
+        interacao[base, base] = 0.05  # uma única base de carga
+        return robo.pi, robo.A, robo.B, interacao
+    pi, A, B = modelo_aleatorio(S, S, rng)
+    return pi, A, B, rng.uniform(0.5, 1.5, (S, S))
+
+
+def viterbi_achatado(pi, A, B, interacao, obs):
+    """Viterbi comum sobre o HMM conjunto com A_conj = A ⊗ ... ⊗ A (S^K × S^K)."""
+    K, T = obs.shape
+    A_conj = np.ones((1, 1))
+    for _ in range(K):
+        A_conj = np.kron(A_conj, A)
+    formato = (len(pi),) * K
+    log_B = log_seguro(B)
+    log_e = emissoes_conjuntas([log_B] * K, obs, 0, T, tensor_interacao(log_seguro(interacao), formato))
+    log_pi = log_pi_conjunto([log_seguro(pi)] * K).ravel()
+    # Emissões por instante no lugar de log B[:, obs[t]] (mesmo truque do hmm_emissoes)
+    return viterbi_log(log_pi, log_seguro(A_conj), log_e.reshape(T, -1).T, np.arange(T))[1]
+
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do HMM fatorial')
+    parser.add_argument('--T', type=int, default=1000)
+    parser.add_argument('--K', type=int, nargs='+', default=[2, 3, 4, 5, 6])
+    parser.add_argument('--S', type=int, default=3)
+    parser.add_argument('--limite-mb', type=float, default=256.0,
+                        help='maior matriz S^K × S^K (float64) montada para a comparação')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    pi, A, B, interacao = parametros(args.S, rng)
+    S = len(pi)
+    print(f"T = {args.T}, S = {S} por robô")
+    print(f"{'K':>2} | {'S^K':>7} | {'Viterbi fat.':>12} | {'FB fat.':>9} | {'Viterbi achat.':>14} | "
+          f"{'A fat. (KB)':>11} | {'A achat. (MB)':>13} | {'mesma log P':>11}")
+    print("-" * 100)
+    for K in args.K:
+        obs = np.stack([amostrar(pi, A, B, args.T, rng=rng)[1] for _ in range(K)])
+        (_, lp_fat), t_vit = medir(viterbi_fatorial, [log_seguro(pi)] * K, [log_seguro(A)] * K,
+                                   [log_seguro(B)] * K, obs, log_seguro(interacao))
+        _, t_fb = medir(forward_backward_fatorial, [pi] * K, [A] * K, [B] * K, obs, interacao)
+
+        mb_achatado = S ** (2 * K) * 8 / 2**20
+        if mb_achatado <= args.limite_mb:
+            lp_ach, t_ach = medir(viterbi_achatado, pi, A, B, interacao, obs)
+            achatado, confere = f"{t_ach:13.3f}s", 'sim' if np.isclose(lp_fat, lp_ach) else 'NÃO'
+        else:
+            achatado, confere = f"{'(não cabe)':>14}", '-'
+        print(f"{K:>2} | {S**K:>7} | {t_vit:11.3f}s | {t_fb:8.3f}s | {achatado} | "
+              f"{K * S * S * 8 / 1024:>11.2f} | {mb_achatado:>13.2f} | {confere:>11}")
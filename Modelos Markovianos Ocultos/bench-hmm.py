@@ -0,0 +1,182 @@
+# --- SUÍTE DE BENCHMARKS DO HMM COM FROTA SINTÉTICA ---
+# Gera frotas sintéticas com hmm_amostragem (RoboHMM e modelos aleatórios
+# com S até 1000) e mede amostragem, Viterbi (único e em lote),
+# forward-backward e treino Baum-Welch. A acurácia da decodificação é
+# conferida contra os estados ocultos sorteados. O resultado sai em JSON
+# para comparação entre versões (regressões de tempo).
+#
+# Uso:  python bench-hmm.py [--nivel rapido|padrao|completo] [--json saida.json]
+#       python bench-hmm.py --json novo.json --comparar antigo.json [--tolerancia 1.2]
+#       (completo inclui T = 10^7 e S = 1000 com T = 10^4)
+# -----------------------------------------------------------------
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from hmm_amostragem import amostrar, modelo_aleatorio
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import forward_backward, log_seguro, viterbi_log, viterbi_lote
+from hmm_treino import treinar_baum_welch
+
+# Casos de cada nível: (modelo, S, T) em 'sequencia' e (modelo, S, N, T) em 'lote'/'treino';
+# 'robo' usa o robo_hmm.json
+NIVEIS = {
+    'rapido': {
+        'sequencia': [('robo', 3, 10**3), ('robo', 3, 10**4), ('aleatorio', 10, 10**3), ('aleatorio', 100, 10**3)],
+        'lote': [('robo', 3, 100, 500)],
+        'treino': [('robo', 3, 20, 500)],
+    },
+    'padrao': {
+        'sequencia': [('robo', 3, 10**3), ('robo', 3, 10**4), ('robo', 3, 10**5), ('robo', 3, 10**6),
+                      ('aleatorio', 10, 10**4), ('aleatorio', 100, 10**4), ('aleatorio', 1000, 10**3)],
+        'lote': [('robo', 3, 1000, 1000), ('aleatorio', 10, 1000, 1000)],
+        'treino': [('robo', 3, 100, 1000), ('aleatorio', 10, 100, 1000)],
+    },
+    'completo': {
+        'sequencia': [('robo', 3, 10**3), ('robo', 3, 10**4), ('robo', 3, 10**5), ('robo', 3, 10**6),
+                      ('robo', 3, 10**7), ('aleatorio', 10, 10**5), ('aleatorio', 100, 10**4),
+                      ('aleatorio', 1000, 10**4)],
+        'lote': [('robo', 3, 10000, 1000), ('aleatorio', 10, 10000, 1000)],
+        'treino': [('robo', 3, 1000, 1000), ('aleatorio', 10, 1000, 1000), ('aleatorio', 100, 100, 1000)],
+    },
+}
+
+ITERACOES_TREINO = 5
+
+
+def parametros(nome, S, rng):
+    if nome == 'robo':
+        robo = ModeloHMM.carregar(CAMINHO_ROBO)
+        return robo.pi, robo.A, robo.B
+    return modelo_aleatorio(S, max(3, min(S, 32)), rng)
+
+
+def medir(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def registro(algoritmo, modelo, S, T, N, segundos, **extras):
+    passos = T * N
+    return dict(algoritmo=algoritmo, modelo=modelo, S=S, T=T, N=N, segundos=segundos,
+                passos_por_segundo=passos / segundos if segundos > 0 else None, **extras)
+
+
+def bench_sequencia(modelo, S, T, rng):
+    pi, A, B = parametros(modelo, S, rng)
+    (estados, obs), t_amostra = medir(amostrar, pi, A, B, T, rng=rng)
+    resultados = [registro('amostragem', modelo, S, T, 1, t_amostra)]
+
+    (caminho, _, _), t_vit = medir(viterbi_log, log_seguro(pi), log_seguro(A), log_seguro(B), obs)
+    resultados.append(registro('viterbi', modelo, S, T, 1, t_vit,
+                               acuracia=float(np.mean(caminho == estados))))
+
+    (posteriores, _), t_fb = medir(forward_backward, pi, A, B, obs)
+    resultados.append(registro('forward_backward', modelo, S, T, 1, t_fb,
+                               acuracia=float(np.mean(posteriores.argmax(axis=1) == estados))))
+    return resultados
+
+
+def bench_lote(modelo, S, N, T, rng):
+    pi, A, B = parametros(modelo, S, rng)
+    estados, obs = amostrar(pi, A, B, T, N=N, rng=rng)
+    comprimentos = np.full(N, T)
+    (caminhos, _), segundos = medir(viterbi_lote, log_seguro(pi), log_seguro(A), log_seguro(B),
+                                    obs, comprimentos=comprimentos)
+    return [registro('viterbi_lote', modelo, S, T, N, segundos,
+                     acuracia=float(np.mean(caminhos == estados)))]
+
+
+def bench_treino(modelo, S, N, T, rng):
+    pi, A, B = parametros(modelo, S, rng)
+    _, obs = amostrar(pi, A, B, T, N=N, rng=rng)
+    # Ponto de partida: parâmetros verdadeiros perturbados (mesmo suporte)
+    inicio = [perturbar(M, rng) for M in (pi, A, B)]
+    (_, A_est, B_est, historico), segundos = medir(
+        treinar_baum_welch, list(obs), *inicio, max_iter=ITERACOES_TREINO, tol=0.0,
+        n_processos=1, verbose=False)
+    return [registro('treino', modelo, S, T, N, segundos / len(historico),
+                     iteracoes=len(historico), log_verossimilhanca=historico[-1],
+                     erro_A=float(np.abs(A_est - A).mean()), erro_B=float(np.abs(B_est - B).mean()))]
+
+
+def perturbar(M, rng):
+    """Multiplica cada entrada por um fator em [0.5, 1.5] e renormaliza as linhas."""
+    M = M * rng.uniform(0.5, 1.5, M.shape)
+    return M / M.sum(axis=-1, keepdims=True)
+
+
+def chave(resultado):
+    return (resultado['algoritmo'], resultado['modelo'], resultado['S'], resultado['T'], resultado['N'])
+
+
+def comparar(atuais, caminho_base, tolerancia):
+    """Imprime atual/base por caso e devolve quantos ficaram mais lentos que a tolerância."""
+    with open(caminho_base, encoding='utf-8') as arquivo:
+        base = {chave(r): r for r in json.load(arquivo)['resultados']}
+    print(f"\nComparação com {caminho_base} (razão = tempo atual / tempo base):")
+    regressoes = 0
+    for resultado in atuais:
+        anterior = base.get(chave(resultado))
+        if anterior is None:
+            continue
+        razao = resultado['segundos'] / anterior['segundos']
+        marca = ''
+        if razao > tolerancia:
+            marca = '  <-- REGRESSÃO'
+            regressoes += 1
+        algoritmo, modelo, S, T, N = chave(resultado)
+        print(f"  {algoritmo:>16} {modelo:>9} S={S:<5} T={T:<9} N={N:<6} {razao:6.2f}x{marca}")
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks do HMM')
+    parser.add_argument('--nivel', choices=list(NIVEIS), default='padrao')
+    parser.add_argument('--json', help='arquivo JSON de saída')
+    parser.add_argument('--comparar', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--tolerancia', type=float, default=1.2, help='razão de tempo considerada regressão')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    nivel = NIVEIS[args.nivel]
+    resultados = []
+    for modelo, S, T in nivel['sequencia']:
+        resultados += bench_sequencia(modelo, S, T, rng)
+    for modelo, S, N, T in nivel['lote']:
+        resultados += bench_lote(modelo, S, N, T, rng)
+    for modelo, S, N, T in nivel['treino']:
+        resultados += bench_treino(modelo, S, N, T, rng)
+
+    print(f"{'algoritmo':>16} | {'modelo':>9} | {'S':>5} | {'T':>9} | {'N':>6} | {'tempo':>9} | "
+          f"{'passos/s':>11} | {'acurácia':>8}")
+    print("-" * 96)
+    for r in resultados:
+        acuracia = f"{r['acuracia']:.3f}" if 'acuracia' in r else '-'
+        print(f"{r['algoritmo']:>16} | {r['modelo']:>9} | {r['S']:>5} | {r['T']:>9} | {r['N']:>6} | "
+              f"{r['segundos']:>8.3f}s | {r['passos_por_segundo']:>11,.0f} | {acuracia:>8}")
+
+    if args.json:
+        saida = {
+            'meta': {'data': datetime.now().isoformat(timespec='seconds'), 'nivel': args.nivel,
+                     'semente': args.semente, 'python': platform.python_version(),
+                     'numpy': np.__version__, 'plataforma': platform.platform()},
+            'resultados': resultados,
+        }
+        with open(args.json, 'w', encoding='utf-8') as arquivo:
+            json.dump(saida, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados gravados em {args.json}")
+
+    if args.comparar:
+        regressoes = comparar(resultados, args.comparar, args.tolerancia)
+        if regressoes:
+            print(f"\n{regressoes} caso(s) mais lento(s) que {args.tolerancia:.2f}x a base")
+            sys.exit(1)
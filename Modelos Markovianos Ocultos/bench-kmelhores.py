@@ -0,0 +1,55 @@
+# --- BENCHMARK: VITERBI DOS K MELHORES CAMINHOS ---
+# Tempo do hmm_kmelhores.viterbi_k_melhores para K = 1 .. 50 no RoboHMM
+# (e num modelo maior), mostrando o crescimento linear em K, e conferindo
+# que o melhor caminho coincide com o do viterbi_log.
+#
+# Uso:  python bench-kmelhores.py [--T 5000] [--S 20]
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_kmelhores import viterbi_k_melhores
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import log_seguro, viterbi_log
+
+
+def modelo_aleatorio(S, M, rng):
+    pi = rng.random(S)
+    A = rng.random((S, S))
+    B = rng.random((S, M))
+    return (log_seguro(pi / pi.sum()), log_seguro(A / A.sum(axis=1, keepdims=True)),
+            log_seguro(B / B.sum(axis=1, keepdims=True)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do Viterbi dos K melhores caminhos')
+    parser.add_argument('--T', type=int, default=5000, help='comprimento da sequência')
+    parser.add_argument('--S', type=int, default=20, help='estados do modelo aleatório')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    robo = ModeloHMM.carregar(CAMINHO_ROBO)
+    casos = [('robo', (robo.log_pi, robo.log_A, robo.log_B)),
+             (f'S={args.S}', modelo_aleatorio(args.S, 8, rng))]
+
+    for nome, (log_pi, log_A, log_B) in casos:
+        obs = rng.integers(0, log_B.shape[1], args.T)
+        if nome == 'robo':
+            # Sem 'Colisao' logo no início: pi(Preso) = 0 e Base não colide
+            obs[0] = 2
+        _, log_prob_ref, _ = viterbi_log(log_pi, log_A, log_B, obs)
+
+        print(f"\nModelo {nome} (T = {args.T})")
+        print(f"{'K':>4} | {'tempo':>8} | {'tempo/K':>8} | {'log P (1º)':>12} | {'1º - K-ésimo':>13} | {'1º ok?':>6}")
+        print("-" * 66)
+        for K in [1, 2, 5, 10, 20, 50]:
+            inicio = time.perf_counter()
+            caminhos, log_probs = viterbi_k_melhores(log_pi, log_A, log_B, obs, K)
+            duracao = time.perf_counter() - inicio
+            ok = np.isclose(log_probs[0], log_prob_ref)
+            print(f"{K:>4} | {duracao:>7.3f}s | {duracao / K * 1e3:>6.1f}ms | {log_probs[0]:>12.3f} | "
+                  f"{log_probs[0] - log_probs[-1]:>13.4f} | {'sim' if ok else 'NÃO':>6}")
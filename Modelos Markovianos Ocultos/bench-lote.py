@@ -0,0 +1,72 @@
+# --- BENCHMARK: DECODIFICAÇÃO EM LOTE (VÁRIOS ROBÔS) ---
+# Mede a vazão (sequências/s) do hmm_nucleo.viterbi_lote, nas formas
+# preenchida (N, T) e ragged (buffer + offsets), contra um laço Python
+# que chama viterbi_log robô por robô.
+#
+# Uso:  python bench-lote.py [--T 500] [--semente 0]
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import log_seguro, viterbi_log, viterbi_lote
+
+# Parâmetros do RoboHMM (robo_hmm.json)
+ROBO = ModeloHMM.carregar(CAMINHO_ROBO)
+PI, A, B = ROBO.pi, ROBO.A, ROBO.B
+
+
+def gerar_frota(N, T, rng):
+    """Logs (N, T) amostrados do RoboHMM, com comprimentos entre T/2 e T."""
+    acumulada_a = np.cumsum(A, axis=1)
+    acumulada_b = np.cumsum(B, axis=1)
+    estados = np.empty((N, T), dtype=np.intp)
+    estados[:, 0] = np.sum(rng.random((N, 1)) >= np.cumsum(PI), axis=1)
+    for t in range(1, T):
+        estados[:, t] = np.sum(rng.random((N, 1)) >= acumulada_a[estados[:, t-1]], axis=1)
+    obs = np.sum(rng.random((N, T, 1)) >= acumulada_b[estados], axis=2).astype(np.uint8)
+    comprimentos = rng.integers(T // 2, T + 1, size=N)
+    return obs, comprimentos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do Viterbi em lote do RoboHMM')
+    parser.add_argument('--T', type=int, default=500, help='comprimento máximo de cada log')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    log_pi, log_A, log_B = log_seguro(PI), log_seguro(A), log_seguro(B)
+
+    print(f"{'robôs':>8} | {'laço (seq/s)':>13} | {'lote (seq/s)':>13} | "
+          f"{'ragged (seq/s)':>14} | {'ganho':>6} | {'iguais?':>7}")
+    print("-" * 78)
+
+    for N in [100, 1000, 10000]:
+        obs, comprimentos = gerar_frota(N, args.T, rng)
+        offsets = np.concatenate(([0], np.cumsum(comprimentos)))
+        buffer = obs[np.arange(args.T) < comprimentos[:, None]]
+
+        inicio = time.perf_counter()
+        caminhos, _ = viterbi_lote(log_pi, log_A, log_B, obs, comprimentos=comprimentos)
+        t_lote = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        caminhos_ragged, _ = viterbi_lote(log_pi, log_A, log_B, buffer, offsets=offsets)
+        t_ragged = time.perf_counter() - inicio
+
+        # O laço robô a robô fica caro rápido; mede só uma amostra e extrapola
+        amostra = min(N, 200)
+        inicio = time.perf_counter()
+        iguais = True
+        for i in range(amostra):
+            caminho, _, _ = viterbi_log(log_pi, log_A, log_B, obs[i, :comprimentos[i]])
+            iguais &= np.array_equal(caminho, caminhos[i, :comprimentos[i]])
+        t_laco = (time.perf_counter() - inicio) * N / amostra
+        iguais &= np.array_equal(caminhos_ragged, caminhos[np.arange(args.T) < comprimentos[:, None]])
+
+        print(f"{N:>8} | {N / t_laco:>13.0f} | {N / t_lote:>13.0f} | {N / t_ragged:>14.0f} | "
+              f"{t_laco / t_lote:>5.1f}x | {'sim' if iguais else 'NÃO':>7}")
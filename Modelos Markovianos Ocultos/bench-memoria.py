@@ -0,0 +1,67 @@
+# --- BENCHMARK: MEMÓRIA x TEMPO DO VITERBI EM LOGS LONGOS ---
+# Pico de memória (tracemalloc) e tempo de cada variante do Viterbi:
+#   original   -> delta float64 + psi int64 (T, S), como o RoboHMM antigo
+#   completo   -> hmm_nucleo.viterbi_log (psi uint8, sem delta)
+#   checkpoint -> sqrt(T) checkpoints de delta, segmentos recalculados
+#   memmap     -> psi despejado em arquivo temporário
+#
+# Uso:  python bench-memoria.py            (T = 10^5 e 10^6)
+#       python bench-memoria.py --longo    (inclui T = 10^7)
+# -----------------------------------------------------------------
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import viterbi_checkpoint, viterbi_log, viterbi_memmap
+
+
+def medir(funcao, *args):
+    """Executa funcao(*args) e devolve (resultado, segundos, pico de memória em bytes)."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, duracao, pico
+
+
+def memoria_original(T, S):
+    """Bytes das tabelas do RoboHMM.viterbi original: delta float64 + psi int64."""
+    return T * S * (8 + 8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark de memória do Viterbi')
+    parser.add_argument('--longo', action='store_true', help='inclui T = 10^7')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    robo = ModeloHMM.carregar(CAMINHO_ROBO)
+    rng = np.random.default_rng(args.semente)
+    variantes = [
+        ('completo', lambda o: viterbi_log(robo.log_pi, robo.log_A, robo.log_B, o)[:2]),
+        ('checkpoint', lambda o: viterbi_checkpoint(robo.log_pi, robo.log_A, robo.log_B, o)),
+        ('memmap', lambda o: viterbi_memmap(robo.log_pi, robo.log_A, robo.log_B, o)),
+    ]
+
+    print(f"{'T':>10} | {'variante':>10} | {'tempo (s)':>9} | {'pico (MB)':>9} | "
+          f"{'vs original':>11} | {'igual?':>6}")
+    print("-" * 70)
+    for T in [10**5, 10**6] + ([10**7] if args.longo else []):
+        # Observações possíveis em qualquer estado (Normal/EmEspera) cobrem tudo sem zeros
+        obs = rng.choice(np.array([0, 1, 2], dtype=np.uint8), size=T, p=[0.6, 0.2, 0.2])
+        original = memoria_original(T, robo.n_estados)
+        print(f"{T:>10} | {'original':>10} | {'-':>9} | {original / 2**20:>9.1f} | {'1.00':>11} | {'-':>6}")
+        referencia = None
+        for nome, funcao in variantes:
+            (caminho, log_prob), duracao, pico = medir(funcao, obs)
+            if referencia is None:
+                referencia = (caminho, log_prob)
+            igual = np.array_equal(caminho, referencia[0]) and log_prob == referencia[1]
+            print(f"{T:>10} | {nome:>10} | {duracao:>9.2f} | {pico / 2**20:>9.1f} | "
+                  f"{pico / original:>11.3f} | {'sim' if igual else 'NÃO':>6}")
@@ -0,0 +1,77 @@
+# --- BENCHMARK: HMM SEMI-MARKOVIANO (DURAÇÃO EXPLÍCITA) ---
+# Tempo do Viterbi segmental e do forward-backward do hmm_semimarkov para
+# limites de duração D = 10 .. 500, contra um Viterbi segmental ingênuo
+# que recalcula a emissão de cada segmento candidato (custo O(T·S·D²)).
+# O modelo é o RoboHMM com episódios de 'Preso' de duração ~Poisson.
+#
+# Uso:  python bench-semimarkov.py [--T 2000] [--media-preso 8]
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_semimarkov import (ModeloSemiMarkov, duracao_poisson, forward_backward_semimarkov,
+                            viterbi_semimarkov)
+
+# O ingênuo é quadrático em D: mede só alguns passos e extrapola
+PASSOS_INGENUO = 200
+
+
+def viterbi_ingenuo(log_pi, log_A, log_B, log_duracoes, obs):
+    """Viterbi segmental sem somas acumuladas (só a log-prob final, sem censura)."""
+    log_B_T = log_B.T
+    S, D = log_duracoes.shape
+    T = len(obs)
+    entrada = np.empty((T, S))
+    entrada[0] = log_pi
+    for t in range(T):
+        melhor = np.full(S, -np.inf)
+        for d in range(1, min(D, t + 1) + 1):
+            u = t - d + 1
+            emissao = log_B_T[obs[u:t+1]].sum(axis=0)
+            melhor = np.maximum(melhor, entrada[u] + log_duracoes[:, d-1] + emissao)
+        if t + 1 < T:
+            entrada[t+1] = (melhor[:, None] + log_A).max(axis=0)
+    return melhor.max()
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do HMM semi-Markoviano')
+    parser.add_argument('--T', type=int, default=2000, help='comprimento da sequência')
+    parser.add_argument('--media-preso', type=float, default=8.0, help='duração média dos episódios Preso')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    robo = ModeloHMM.carregar(CAMINHO_ROBO)
+    rng = np.random.default_rng(args.semente)
+    obs = rng.choice(np.array([0, 1, 2]), size=args.T, p=[0.6, 0.2, 0.2])
+
+    print(f"{'D':>5} | {'viterbi':>9} | {'fwd-bwd':>9} | {'ingênuo (extrap.)':>17} | {'ganho':>7} | {'igual?':>6}")
+    print("-" * 70)
+    for D in [10, 50, 100, 200, 500]:
+        modelo = ModeloSemiMarkov.de_modelo_hmm(robo, D, {'Preso': duracao_poisson(args.media_preso, D)},
+                                                censurado=False)
+        parametros = (robo.log_pi, modelo.log_A, robo.log_B, modelo.log_duracoes)
+
+        (_, log_prob, _), t_vit = cronometrar(viterbi_semimarkov, *parametros, obs, False)
+        _, t_fb = cronometrar(forward_backward_semimarkov, robo.pi, modelo.A, robo.B,
+                              modelo.duracoes, obs, False)
+
+        # Ingênuo: tempo de PASSOS_INGENUO passos já no regime D completo, extrapolado para T
+        n = min(args.T, D + PASSOS_INGENUO)
+        (_, log_prob_curto, _), _ = cronometrar(viterbi_semimarkov, *parametros, obs[:n], False)
+        lp_ingenuo, t_ing = cronometrar(viterbi_ingenuo, *parametros, obs[:n])
+        t_ing *= args.T / n
+        igual = np.isclose(lp_ingenuo, log_prob_curto)
+
+        print(f"{D:>5} | {t_vit:>8.2f}s | {t_fb:>8.2f}s | {t_ing:>16.1f}s | {t_ing / t_vit:>6.1f}x | "
+              f"{'sim' if igual else 'NÃO':>6}")
@@ -0,0 +1,102 @@
+# --- BENCHMARK: VITERBI LOG-ESPAÇO VETORIZADO vs. IMPLEMENTAÇÃO ORIGINAL ---
+# Compara o hmm_nucleo.viterbi_log com o laço original do RoboHMM
+# (um laço Python por estado dentro do laço de tempo, em probabilidade linear).
+#
+# Uso:  python bench-viterbi.py            (T até 10^5)
+#       python bench-viterbi.py --longo    (inclui 10^6 e 10^7 só no novo)
+# -----------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+from hmm_nucleo import log_seguro, viterbi_log
+
+# Parâmetros do RoboHMM (robo_hmm.json)
+ROBO = ModeloHMM.carregar(CAMINHO_ROBO)
+PI, A, B = ROBO.pi, ROBO.A, ROBO.B
+
+
+def viterbi_original(pi, A, B, obs_indices, normalizar):
+    """Cópia do RoboHMM.viterbi original (normalizar=True reproduz o hmm-v2.py)."""
+    T = len(obs_indices)
+    n_estados = len(pi)
+    delta = np.zeros((T, n_estados))
+    psi = np.zeros((T, n_estados), dtype=int)
+
+    delta[0] = pi * B[:, obs_indices[0]]
+    for t in range(1, T):
+        obs_atual = obs_indices[t]
+        for s in range(n_estados):
+            prob_transicao = delta[t-1] * A[:, s]
+            estado_anterior_max = np.argmax(prob_transicao)
+            valor_max = prob_transicao[estado_anterior_max]
+            delta[t, s] = valor_max * B[s, obs_atual]
+            psi[t, s] = estado_anterior_max
+        if normalizar:
+            delta[t] = delta[t] / (np.sum(delta[t]) + 1e-10)
+
+    melhor_caminho = np.zeros(T, dtype=int)
+    melhor_caminho[T-1] = np.argmax(delta[T-1])
+    for t in range(T-2, -1, -1):
+        melhor_caminho[t] = psi[t+1, melhor_caminho[t+1]]
+    return melhor_caminho
+
+
+def gerar_logs(T, rng):
+    """Sequência de observações amostrada do próprio RoboHMM."""
+    u = rng.random(T)
+    acumulada = np.cumsum(A, axis=1).tolist()
+    estados = np.empty(T, dtype=np.intp)
+    estado = int(rng.choice(3, p=PI))
+    for t in range(T):
+        if t > 0:
+            linha = acumulada[estado]
+            estado = 0 if u[t] < linha[0] else (1 if u[t] < linha[1] else 2)
+        estados[t] = estado
+    acumulada_b = np.cumsum(B, axis=1)
+    u = rng.random(T)
+    return np.sum(u[:, None] >= acumulada_b[estados], axis=1)
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do Viterbi do RoboHMM')
+    parser.add_argument('--longo', action='store_true',
+                        help='inclui T=10^6 e T=10^7 (apenas para o decodificador novo)')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    log_pi, log_A, log_B = log_seguro(PI), log_seguro(A), log_seguro(B)
+
+    tamanhos = [10**2, 10**3, 10**4, 10**5]
+    tamanhos_longos = [10**6, 10**7] if args.longo else []
+
+    print(f"{'T':>10} | {'original (s)':>12} | {'v2 norm. (s)':>12} | {'log-vet. (s)':>12} | "
+          f"{'ganho':>6} | {'caminho = v2?':>13} | {'log P(caminho)':>15}")
+    print("-" * 100)
+
+    for T in tamanhos + tamanhos_longos:
+        obs = gerar_logs(T, rng)
+        (caminho, log_prob, _), t_novo = cronometrar(viterbi_log, log_pi, log_A, log_B, obs)
+
+        if T in tamanhos:
+            caminho_orig, t_orig = cronometrar(viterbi_original, PI, A, B, obs, False)
+            caminho_v2, t_v2 = cronometrar(viterbi_original, PI, A, B, obs, True)
+            igual = "sim" if np.array_equal(caminho, caminho_v2) else "NÃO"
+            # O original sem normalização zera o delta (underflow) em logs longos
+            if not np.array_equal(caminho, caminho_orig):
+                igual += " (orig. underflow)"
+            print(f"{T:>10} | {t_orig:>12.3f} | {t_v2:>12.3f} | {t_novo:>12.3f} | "
+                  f"{t_v2 / t_novo:>5.1f}x | {igual:>13} | {log_prob:>15.1f}")
+        else:
+            print(f"{T:>10} | {'-':>12} | {'-':>12} | {t_novo:>12.3f} | "
+                  f"{'-':>6} | {'-':>13} | {log_prob:>15.1f}")
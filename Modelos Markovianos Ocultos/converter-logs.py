@@ -0,0 +1,70 @@
+# --- CONVERSOR DE LOGS DA FROTA PARA O FORMATO .hmmlog ---
+# Converte logs de texto/CSV em um arquivo binário compacto (ver hmm_logs)
+# e mostra quanto tempo leva para abrir e decodificar o resultado.
+#
+# Uso:  python converter-logs.py frota.csv frota.hmmlog [--coluna-robo robo --coluna-obs observacao]
+#       python converter-logs.py robo01.txt robo02.txt frota.hmmlog
+#       python converter-logs.py --info frota.hmmlog
+# A tabela de símbolos vem do modelo (--modelo, padrão robo_hmm.json).
+# -----------------------------------------------------------------
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from hmm_logs import LogFrota, converter_csv, converter_textos
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+
+
+def mostrar_info(log, modelo):
+    inicio = time.perf_counter()
+    log = LogFrota(log.caminho, observacoes=modelo.observacoes)
+    t_abrir = time.perf_counter() - inicio
+
+    comprimentos = np.diff(log.offsets)
+    tamanho = os.path.getsize(log.caminho)
+    print(f"Arquivo: {log.caminho} ({tamanho / 2**20:.1f} MB)")
+    print(f"Sequências: {len(log)} de {len(set(log.robos))} robôs | observações: {log.n_observacoes}")
+    if len(log):
+        print(f"Comprimento: mín {comprimentos.min()}, médio {comprimentos.mean():.1f}, máx {comprimentos.max()}")
+    print(f"Símbolos: {log.observacoes}")
+    print(f"Abertura (memmap): {t_abrir * 1e3:.2f} ms")
+
+    if len(log):
+        # Decodifica o primeiro bloco direto do memmap, sem conversão
+        buffer, offsets = next(log.blocos())
+        inicio = time.perf_counter()
+        modelo.viterbi_lote(buffer, offsets=offsets)
+        duracao = time.perf_counter() - inicio
+        print(f"Viterbi no 1º bloco: {len(offsets) - 1} sequências, {len(buffer)} observações "
+              f"em {duracao:.2f} s ({len(buffer) / duracao:,.0f} obs/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Converte logs de texto/CSV para .hmmlog')
+    parser.add_argument('arquivos', nargs='+', help='entradas seguidas do .hmmlog de saída (ou só o .hmmlog com --info)')
+    parser.add_argument('--info', action='store_true', help='apenas mostra o conteúdo de um .hmmlog')
+    parser.add_argument('--modelo', default=CAMINHO_ROBO, help='modelo com a tabela de símbolos (.json/.npz)')
+    parser.add_argument('--coluna-robo', default='robo')
+    parser.add_argument('--coluna-obs', default='observacao')
+    parser.add_argument('--delimitador', default=',')
+    args = parser.parse_args()
+
+    modelo = ModeloHMM.carregar(args.modelo)
+    if args.info:
+        for caminho in args.arquivos:
+            mostrar_info(LogFrota(caminho), modelo)
+    else:
+        if len(args.arquivos) < 2:
+            parser.error("informe pelo menos uma entrada e o .hmmlog de saída")
+        *entradas, destino = args.arquivos
+        inicio = time.perf_counter()
+        if len(entradas) == 1 and entradas[0].lower().endswith('.csv'):
+            log = converter_csv(entradas[0], destino, modelo.observacoes, args.coluna_robo,
+                                args.coluna_obs, args.delimitador)
+        else:
+            log = converter_textos(entradas, destino, modelo.observacoes)
+        print(f"Convertido em {time.perf_counter() - inicio:.2f} s")
+        mostrar_info(log, modelo)
@@ -0,0 +1,44 @@
+# --- JOB NOTURNO: DIAGNÓSTICO DE TODA A FROTA ---
+# Diagnostica todos os logs de um diretório com o RoboHMM (ver
+# hmm_diagnostico) e grava uma linha por robô/sessão: tempo em 'Preso',
+# episódios de travamento, P(Preso) médio e score de anomalia
+# (-log-verossimilhança por passo; maior = comportamento mais estranho).
+#
+# Uso:  python diagnostico-frota.py logs/ [--saida diagnostico.npz] [--processos 8]
+#       (--saida .parquet/.csv exigem pandas; o cache fica em <saida>.cache.json)
+# -----------------------------------------------------------------
+
+import argparse
+
+import numpy as np
+
+from hmm_diagnostico import diagnosticar_frota, listar_logs, salvar_colunas
+from hmm_modelo import CAMINHO_ROBO, ModeloHMM
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Diagnóstico em lote dos logs da frota')
+    parser.add_argument('diretorio', help='diretório com logs .hmmlog, .csv ou .txt')
+    parser.add_argument('--saida', default='diagnostico_frota.npz', help='.npz, .parquet ou .csv')
+    parser.add_argument('--modelo', default=CAMINHO_ROBO, help='modelo (.json/.npz)')
+    parser.add_argument('--estado', default='Preso', help='estado de interesse')
+    parser.add_argument('--processos', type=int, default=None, help='tamanho do pool (padrão: n. de CPUs)')
+    parser.add_argument('--sem-cache', action='store_true', help='reprocessa todos os logs')
+    parser.add_argument('--top', type=int, default=5, help='sequências mais anômalas a listar')
+    args = parser.parse_args()
+
+    modelo = ModeloHMM.carregar(args.modelo)
+    caminhos = listar_logs(args.diretorio)
+    if not caminhos:
+        parser.error(f"nenhum log encontrado em '{args.diretorio}'")
+
+    cache = None if args.sem_cache else args.saida + '.cache.json'
+    colunas, _ = diagnosticar_frota(modelo, caminhos, args.estado, args.processos, cache)
+    salvar_colunas(args.saida, colunas)
+    print(f"Resumo gravado em {args.saida}")
+
+    if len(colunas['robo']) and args.top > 0:
+        print("\nSequências mais anômalas (score = -log P(O) / T):")
+        for i in np.argsort(-np.nan_to_num(colunas['score_anomalia'], nan=-np.inf))[:args.top]:
+            print(f"  {colunas['robo'][i]:>12} ({colunas['arquivo'][i]}): score {colunas['score_anomalia'][i]:.3f}, "
+                  f"{colunas['fracao_preso'][i]:.1%} do tempo em {args.estado}, "
+                  f"{colunas['episodios_preso'][i]} episódios (maior: {colunas['maior_episodio'][i]} passos)")
@@ -0,0 +1,99 @@
+# --- AMOSTRAGEM VETORIZADA DE SEQUÊNCIAS DO HMM (FROTA SINTÉTICA) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Gera estados ocultos e observações a partir de (pi, A, B) para N robôs
+# com T passos cada. A cadeia de Markov é sequencial, mas cada passo é um
+# mapa aleatório M_t(estado anterior) -> estado sorteado com um único
+# número uniforme; o estado em t é a composição M_t ∘ ... ∘ M_1 aplicada
+# ao estado inicial. As composições são calculadas por varredura de
+# prefixos (log2(L) passadas vetorizadas por bloco de L passos), então
+# T = 10^7 não precisa de um laço Python por passo.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import menor_dtype_inteiro
+
+# Elementos (N · L · S) de cada bloco de mapas da varredura
+ELEMENTOS_POR_BLOCO = 1 << 22
+
+
+def _sortear(acumuladas, u):
+    """Índice sorteado pela inversa da acumulada (última coluna protegida contra arredondamento)."""
+    return np.minimum((u[..., None] >= acumuladas).sum(axis=-1), acumuladas.shape[-1] - 1)
+
+
+def _compor_prefixos(mapas):
+    """
+    Varredura de Hillis-Steele sobre o eixo do tempo: ao final,
+    mapas[..., t, s] = (M_t ∘ ... ∘ M_0)(s).
+    """
+    L = mapas.shape[-2]
+    salto = 1
+    while salto < L:
+        # M_t ∘ P_{t-salto}: aplica o prefixo anterior e depois o mapa atual
+        mapas[..., salto:, :] = np.take_along_axis(mapas[..., salto:, :], mapas[..., :-salto, :], axis=-1)
+        salto *= 2
+    return mapas
+
+
+def amostrar(pi, A, B, T, N=None, rng=None, elementos_por_bloco=ELEMENTOS_POR_BLOCO):
+    """
+    Amostra (estados, obs) do HMM. Com N=None devolve arrays (T,); senão
+    (N, T). Os dtypes são os menores inteiros que comportam S e M.
+    """
+    rng = np.random.default_rng(rng)
+    pi = np.asarray(pi, dtype=np.float64)
+    A = np.asarray(A, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    S, M = B.shape
+    unico = N is None
+    N = 1 if unico else N
+    acumulada_pi = np.cumsum(pi)
+    acumulada_A = np.cumsum(A, axis=1)
+    acumulada_B = np.cumsum(B, axis=1)
+
+    estados = np.empty((N, T), dtype=menor_dtype_inteiro(S))
+    obs = np.empty((N, T), dtype=menor_dtype_inteiro(M))
+    if T == 0:
+        return (estados[0], obs[0]) if unico else (estados, obs)
+
+    atual = _sortear(acumulada_pi, rng.random(N))
+    estados[:, 0] = atual
+    L = max(1, elementos_por_bloco // (N * S))
+    for ini in range(1, T, L):
+        fim = min(ini + L, T)
+        # Mapa do passo t: estado anterior s -> primeiro j com u_t < acumulada_A[s, j]
+        u = rng.random((N, fim - ini))
+        mapas = np.empty((N, fim - ini, S), dtype=np.intp)
+        for s in range(S):
+            mapas[..., s] = np.searchsorted(acumulada_A[s], u, side='right')
+        np.minimum(mapas, S - 1, out=mapas)
+        _compor_prefixos(mapas)
+        bloco = np.take_along_axis(mapas, atual[:, None, None], axis=-1)[..., 0]
+        estados[:, ini:fim] = bloco
+        atual = bloco[:, -1]
+
+    # Emissões são independentes dado o estado: sorteio em blocos de passos
+    passos = max(1, elementos_por_bloco // (N * M))
+    for ini in range(0, T, passos):
+        fim = min(ini + passos, T)
+        obs[:, ini:fim] = _sortear(acumulada_B[estados[:, ini:fim]], rng.random((N, fim - ini)))
+    return (estados[0], obs[0]) if unico else (estados, obs)
+
+
+def modelo_aleatorio(S, M, rng=None, permanencia=0.9, nitidez=5.0):
+    """
+    (pi, A, B) aleatórios com estados 'pegajosos' (A[s, s] ~ permanencia) e
+    emissões concentradas (Dirichlet com um símbolo preferido por estado),
+    para que a decodificação tenha acurácia mensurável.
+    """
+    rng = np.random.default_rng(rng)
+    pi = rng.dirichlet(np.ones(S))
+    A = rng.dirichlet(np.ones(S), size=S) * (1.0 - permanencia)
+    A[np.arange(S), np.arange(S)] += permanencia
+    concentracao = np.ones((S, M))
+    concentracao[np.arange(S), np.arange(S) % M] += nitidez
+    B = np.array([rng.dirichlet(c) for c in concentracao])
+    return pi, A, B
@@ -0,0 +1,218 @@
+# --- CACHE DE DECODIFICAÇÃO E VITERBI POR CORRIDAS (RUN-LENGTH) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Muitos robôs mandam janelas idênticas (longas corridas de 'Normal', o
+# mesmo padrão de encaixe na base). CacheViterbi guarda o resultado de
+# cada janela sob a chave blake2b(impressão digital do modelo, janela),
+# com despejo LRU e um orçamento em bytes; trocar os parâmetros do modelo
+# muda a impressão digital, então resultados antigos nunca são servidos.
+#
+# DecodificadorRuns trata logs com corridas longas do mesmo símbolo: o
+# passo "transição + emissão de o" é a matriz M_o[i, j] = log A[i, j] +
+# log B[j, o], e uma corrida de L símbolos iguais é a potência M_o^L no
+# semianel (max, +). As potências M_o^(2^k) são calculadas por quadrados
+# sucessivos uma vez por modelo; cada corrida custa O(log L · S²) em vez
+# de O(L · S²). Cada quadrado guarda o estado do meio que venceu, e o
+# backtracking desdobra esses meios nível a nível para devolver um caminho
+# completo ótimo: mesma log-prob do viterbi_log, mas empates entre
+# caminhos igualmente prováveis podem ser resolvidos de outro jeito.
+# -----------------------------------------------------------------
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from hmm_nucleo import menor_dtype_inteiro, validar_observacoes
+
+# Orçamento padrão do cache e custo fixo estimado de cada entrada
+# (chave, tupla, nó do OrderedDict, float), somado ao tamanho do caminho
+LIMITE_BYTES = 64 * 2**20
+CUSTO_ENTRADA = 200
+
+
+def comprimir_runs(obs):
+    """Sequência de índices -> (simbolos, comprimentos) das corridas de símbolos iguais."""
+    obs = np.asarray(obs)
+    if len(obs) == 0:
+        return obs[:0], np.empty(0, dtype=np.intp)
+    inicios = np.flatnonzero(np.concatenate(([True], obs[1:] != obs[:-1])))
+    return obs[inicios], np.diff(np.append(inicios, len(obs)))
+
+
+class DecodificadorRuns:
+    """
+    Viterbi exato sobre um log em corridas (simbolos, comprimentos): um
+    caminho ótimo (mesma log-prob do viterbi_log; empates podem diferir). As
+    potências (max, +) de cada símbolo ficam guardadas e são reaproveitadas
+    entre logs. Vale a pena quando as corridas são longas; com corridas de
+    1 ou 2 símbolos o viterbi_log (um passo vetorizado por bloco) é mais rápido.
+    """
+
+    def __init__(self, log_pi, log_A, log_B):
+        self.log_pi = np.asarray(log_pi, dtype=np.float64)
+        self.log_A = np.asarray(log_A, dtype=np.float64)
+        self.log_B = np.asarray(log_B, dtype=np.float64)
+        self.n_estados = len(self.log_pi)
+        self._dtype = menor_dtype_inteiro(self.n_estados)
+        # Por símbolo: potencias[k] = M_o^(2^k), meios[k][i, j] = estado no instante 2^(k-1)
+        self._potencias = {}
+        self._meios = {}
+
+    def _niveis(self, simbolo, n_niveis):
+        """Garante M_o^(2^k) para k < n_niveis e devolve (potencias, meios)."""
+        potencias = self._potencias.setdefault(simbolo, [self.log_A + self.log_B[:, simbolo]])
+        meios = self._meios.setdefault(simbolo, [None])
+        while len(potencias) < n_niveis:
+            # (P ⊗ P)[i, j] = max_m P[i, m] + P[m, j]
+            anterior = potencias[-1]
+            candidatos = anterior[:, :, None] + anterior[None, :, :]
+            meio = candidatos.argmax(axis=1)
+            potencias.append(np.take_along_axis(candidatos, meio[:, None, :], axis=1)[:, 0, :])
+            meios.append(meio.astype(self._dtype))
+        return potencias, meios
+
+    def decodificar_runs(self, simbolos, comprimentos):
+        """(caminho (T,), log_prob) para o log dado em corridas."""
+        comprimentos = np.asarray(comprimentos, dtype=np.intp)
+        simbolos = validar_observacoes(simbolos, self.log_B.shape[1])
+        if len(simbolos) != len(comprimentos) or np.any(comprimentos < 1):
+            raise ValueError("'simbolos' e 'comprimentos' devem ter o mesmo tamanho, com comprimentos >= 1")
+        T = int(comprimentos.sum())
+
+        # --- Forward: delta ⊗ M_o^(2^k) para cada bit do comprimento da corrida ---
+        delta = self.log_pi + self.log_B[:, simbolos[0]]
+        passos = comprimentos.copy()
+        passos[0] -= 1  # o primeiro símbolo já entrou na inicialização
+        fatores = []  # (simbolo, nivel, backpointer da fronteira)
+        for simbolo, n in zip(simbolos.tolist(), passos.tolist()):
+            if n == 0:
+                continue
+            potencias, _ = self._niveis(simbolo, n.bit_length())
+            for nivel in range(n.bit_length()):
+                if n >> nivel & 1:
+                    candidatos = delta[:, None] + potencias[nivel]
+                    origem = candidatos.argmax(axis=0)
+                    delta = candidatos[origem, np.arange(self.n_estados)]
+                    fatores.append((simbolo, nivel, origem))
+
+        # --- Backtracking: desdobra cada fator de 2^nivel passos pelos meios ---
+        caminho = np.empty(T, dtype=np.intp)
+        fim = T - 1
+        estado = int(np.argmax(delta))
+        log_prob = float(delta[estado])
+        caminho[fim] = estado
+        for simbolo, nivel, origem in reversed(fatores):
+            inicio = int(origem[estado])
+            trecho = np.array([inicio, estado], dtype=np.intp)
+            meios = self._meios[simbolo]
+            for k in range(nivel, 0, -1):
+                novo = np.empty(2 * len(trecho) - 1, dtype=np.intp)
+                novo[0::2] = trecho
+                novo[1::2] = meios[k][trecho[:-1], trecho[1:]]
+                trecho = novo
+            caminho[fim - (1 << nivel) + 1:fim + 1] = trecho[1:]
+            fim -= 1 << nivel
+            estado = inicio
+        caminho[0] = estado
+        return caminho, log_prob
+
+    def decodificar(self, obs):
+        """(caminho, log_prob) de uma sequência de índices comum, comprimida em corridas."""
+        obs = validar_observacoes(obs, self.log_B.shape[1])
+        return self.decodificar_runs(*comprimir_runs(obs))
+
+
+def viterbi_runs(log_pi, log_A, log_B, simbolos, comprimentos):
+    """Atalho de DecodificadorRuns para um único log: (caminho, log_prob)."""
+    return DecodificadorRuns(log_pi, log_A, log_B).decodificar_runs(simbolos, comprimentos)
+
+
+class CacheViterbi:
+    """
+    Memoização de viterbi_indices por janela de observações, com despejo
+    LRU quando o total passa de 'limite_bytes'. A chave inclui a impressão
+    digital do modelo, recalculada a cada definir_parametros (e treinar);
+    alterar as matrizes no lugar (modelo.A[...] = ...) sem chamá-lo não é detectado.
+    Os caminhos devolvidos são somente leitura (compartilhados com o cache).
+    motor='runs' decodifica as faltas com o DecodificadorRuns.
+    """
+
+    def __init__(self, modelo, limite_bytes=LIMITE_BYTES, motor='padrao'):
+        if motor not in ('padrao', 'runs'):
+            raise ValueError(f"motor deve ser 'padrao' ou 'runs', recebido '{motor}'")
+        self.modelo = modelo
+        self.limite_bytes = int(limite_bytes)
+        self.motor = motor
+        self._entradas = OrderedDict()  # chave -> (caminho, log_prob, bytes)
+        self._versao = None             # ((log_pi, log_A, log_B), impressão digital em bytes)
+        self._runs = None
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+
+    def _impressao(self):
+        # definir_parametros sempre recalcula as matrizes em log (arrays novos):
+        # comparar a identidade delas, guardando as referências, evita
+        # recalcular o sha256 a cada janela
+        modelo = self.modelo
+        atuais = (modelo.log_pi, modelo.log_A, modelo.log_B)
+        if self._versao is None or any(a is not b for a, b in zip(self._versao[0], atuais)):
+            self._versao = (atuais, bytes.fromhex(modelo.impressao_digital()))
+            self._runs = None
+        return self._versao[1]
+
+    def chave(self, obs):
+        """blake2b(impressão digital do modelo, janela) em bytes."""
+        resumo = hashlib.blake2b(self._impressao(), digest_size=16)
+        resumo.update(np.ascontiguousarray(obs, dtype=np.int64).tobytes())
+        return resumo.digest()
+
+    def _decodificar(self, obs):
+        if self.motor == 'runs':
+            if self._runs is None:
+                self._runs = DecodificadorRuns(self.modelo.log_pi, self.modelo.log_A, self.modelo.log_B)
+            return self._runs.decodificar(obs)
+        return self.modelo.viterbi_indices(obs)
+
+    def decodificar(self, obs):
+        """(caminho, log_prob) da janela 'obs' (índices), do cache quando possível."""
+        chave = self.chave(obs)
+        entrada = self._entradas.get(chave)
+        if entrada is not None:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada[0], entrada[1]
+
+        self.faltas += 1
+        caminho, log_prob = self._decodificar(obs)
+        caminho = caminho.astype(menor_dtype_inteiro(self.modelo.n_estados))
+        caminho.flags.writeable = False
+        tamanho = caminho.nbytes + CUSTO_ENTRADA
+        if tamanho <= self.limite_bytes:
+            self._entradas[chave] = (caminho, log_prob, tamanho)
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.limite_bytes:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self.bytes_usados -= liberado
+                self.despejos += 1
+        return caminho, log_prob
+
+    def viterbi(self, sequencia_obs):
+        """Como ModeloHMM.viterbi_indices, mas a partir de nomes e devolvendo nomes."""
+        caminho, log_prob = self.decodificar(self.modelo.codificar(sequencia_obs))
+        return self.modelo.nomes_estados(caminho), log_prob
+
+    def limpar(self):
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def estatisticas(self):
+        consultas = self.acertos + self.faltas
+        return {
+            'entradas': len(self._entradas), 'bytes': self.bytes_usados, 'limite_bytes': self.limite_bytes,
+            'acertos': self.acertos, 'faltas': self.faltas, 'despejos': self.despejos,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,248 @@
+# --- DIAGNÓSTICO DA FROTA EM LOTE (JOB NOTURNO) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Para cada sequência de cada log de um diretório: Viterbi (tempo em
+# 'Preso' e episódios de travamento) e forward-backward (P(Preso) médio e
+# log-verossimilhança). Cada arquivo é um shard processado por um worker
+# do pool; logs cujo conteúdo (sha256) não mudou desde a última execução,
+# com o mesmo modelo, reaproveitam o resultado guardado no cache JSON.
+# Um log com problema (observação desconhecida, arquivo truncado...) só
+# tira aquele arquivo da saída: o erro vai para o relatório e o arquivo
+# fica fora do cache, para ser tentado de novo na próxima execução.
+# -----------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from hmm_logs import LogFrota, converter_csv, converter_textos
+
+EXTENSOES_LOG = ('.hmmlog', '.csv', '.txt')
+
+# Colunas da saída, uma linha por sequência (sessão de um robô)
+COLUNAS = ('arquivo', 'robo', 'n_passos', 'passos_preso', 'fracao_preso', 'episodios_preso',
+           'maior_episodio', 'prob_preso_media', 'log_verossimilhanca', 'score_anomalia')
+
+# Leitura do arquivo para o hash em pedaços de 1 MB
+TAMANHO_LEITURA_HASH = 1 << 20
+
+
+def hash_arquivo(caminho):
+    """sha256 (hex) do conteúdo do arquivo, lido em pedaços."""
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for pedaco in iter(lambda: arquivo.read(TAMANHO_LEITURA_HASH), b''):
+            resumo.update(pedaco)
+    return resumo.hexdigest()
+
+
+def listar_logs(diretorio):
+    """Arquivos de log (.hmmlog, .csv, .txt) do diretório, em ordem."""
+    return sorted(os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+                  if nome.lower().endswith(EXTENSOES_LOG))
+
+
+def abrir_log(caminho, observacoes, diretorio_temporario):
+    """Abre um .hmmlog direto; CSV/texto são convertidos antes (ver hmm_logs)."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.hmmlog':
+        return LogFrota(caminho, observacoes=observacoes)
+    destino = os.path.join(diretorio_temporario, 'log.hmmlog')
+    if extensao == '.csv':
+        return converter_csv(caminho, destino, observacoes)
+    return converter_textos([caminho], destino, observacoes)
+
+
+def resumir_bloco(modelo, buffer, offsets, estado_preso):
+    """
+    Métricas por sequência de um bloco ragged. Um episódio é um trecho
+    contínuo do caminho de Viterbi em 'estado_preso'.
+    """
+    N = len(offsets) - 1
+    comprimentos = np.diff(offsets)
+    caminhos, _ = modelo.viterbi_lote(buffer, offsets=offsets)
+    prob_preso, log_veross = modelo.posteriores_lote(buffer, offsets=offsets, estados_saida=estado_preso)
+
+    sequencia = np.repeat(np.arange(N), comprimentos)
+    preso = caminhos == estado_preso
+    inicios_seq = offsets[:-1][comprimentos > 0]
+    fins_seq = offsets[1:][comprimentos > 0] - 1
+
+    # Vizinhos dentro da mesma sequência (fronteiras contam como 'não preso')
+    anterior = np.zeros_like(preso)
+    anterior[1:] = preso[:-1]
+    anterior[inicios_seq] = False
+    seguinte = np.zeros_like(preso)
+    seguinte[:-1] = preso[1:]
+    seguinte[fins_seq] = False
+    comeco = np.flatnonzero(preso & ~anterior)
+    fim = np.flatnonzero(preso & ~seguinte)
+    duracao = fim - comeco + 1
+
+    episodios = np.bincount(sequencia[comeco], minlength=N)
+    maior = np.zeros(N, dtype=np.intp)
+    np.maximum.at(maior, sequencia[comeco], duracao)
+    passos_preso = np.bincount(sequencia, weights=preso, minlength=N).astype(np.intp)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fracao = passos_preso / comprimentos
+        prob_media = np.bincount(sequencia, weights=prob_preso, minlength=N) / comprimentos
+        score = np.where(comprimentos > 0, -log_veross / comprimentos, np.nan)
+    return {
+        'n_passos': comprimentos, 'passos_preso': passos_preso, 'fracao_preso': fracao,
+        'episodios_preso': episodios, 'maior_episodio': maior, 'prob_preso_media': prob_media,
+        'log_verossimilhanca': log_veross, 'score_anomalia': score,
+    }
+
+
+def diagnosticar_arquivo(modelo, caminho, estado_preso):
+    """
+    Diagnóstico de todas as sequências de um arquivo de log. Retorna um
+    dicionário coluna -> lista (serializável em JSON, para o cache).
+    """
+    with tempfile.TemporaryDirectory() as temporario:
+        log = abrir_log(caminho, modelo.observacoes, temporario)
+        partes = [resumir_bloco(modelo, buffer, offsets, estado_preso) for buffer, offsets in log.blocos()]
+        robos = list(log.robos)
+        del log  # libera o memmap antes de apagar o diretório temporário
+
+    colunas = {'arquivo': [os.path.basename(caminho)] * len(robos), 'robo': robos}
+    for chave in COLUNAS[2:]:
+        valores = np.concatenate([parte[chave] for parte in partes]) if partes else np.empty(0)
+        colunas[chave] = valores.tolist()
+    return colunas
+
+
+def _diagnosticar_tarefa(argumentos):
+    # Ponto de entrada dos processos do pool (precisa ser uma função de módulo)
+    return diagnosticar_arquivo(*argumentos)
+
+
+def carregar_cache(caminho_cache, impressao_modelo):
+    """Cache {caminho: {sha256, tamanho, mtime, colunas}}; vazio se o modelo mudou."""
+    if caminho_cache is None or not os.path.exists(caminho_cache):
+        return {}
+    with open(caminho_cache, encoding='utf-8') as arquivo:
+        cache = json.load(arquivo)
+    if cache.get('modelo') != impressao_modelo:
+        return {}
+    return cache.get('arquivos', {})
+
+
+def salvar_cache(caminho_cache, impressao_modelo, arquivos):
+    temporario = caminho_cache + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump({'modelo': impressao_modelo, 'arquivos': arquivos}, arquivo, ensure_ascii=False)
+    os.replace(temporario, caminho_cache)  # nunca deixa um cache pela metade
+
+
+def _entrada_em_dia(entrada, caminho):
+    """
+    Decide se o resultado em cache ainda vale. Tamanho e mtime iguais
+    confirmam sem reler o arquivo; senão compara o sha256 do conteúdo.
+    Retorna (em_dia, sha256).
+    """
+    estado = os.stat(caminho)
+    if entrada is not None and entrada['tamanho'] == estado.st_size and entrada['mtime'] == estado.st_mtime_ns:
+        return True, entrada['sha256']
+    conteudo = hash_arquivo(caminho)
+    return entrada is not None and entrada['sha256'] == conteudo, conteudo
+
+
+def diagnosticar_frota(modelo, caminhos, estado_preso='Preso', n_processos=None,
+                       caminho_cache=None, verbose=True):
+    """
+    Roda o diagnóstico em todos os 'caminhos', pulando os que não mudaram
+    (se 'caminho_cache' for dado). Retorna (colunas, relatorio): colunas é
+    um dicionário nome -> np.ndarray com uma linha por sequência, na ordem
+    dos arquivos; relatorio resume a vazão da execução e lista em 'falhas'
+    ({caminho: mensagem}) os arquivos cujo diagnóstico deu erro.
+    """
+    if isinstance(estado_preso, str):
+        estado_preso = modelo.mapa_estados[estado_preso]
+    impressao = modelo.impressao_digital()
+    cache = carregar_cache(caminho_cache, impressao)
+    inicio = time.perf_counter()
+
+    resultados, pendentes, novo_cache = {}, [], {}
+    for caminho in caminhos:
+        chave = os.path.abspath(caminho)
+        em_dia, conteudo = _entrada_em_dia(cache.get(chave), caminho)
+        estado = os.stat(caminho)
+        novo_cache[chave] = {'sha256': conteudo, 'tamanho': estado.st_size, 'mtime': estado.st_mtime_ns}
+        if em_dia:
+            resultados[chave] = cache[chave]['colunas']
+        else:
+            pendentes.append(chave)
+
+    falhas = {}
+    n_processos = n_processos or os.cpu_count() or 1
+    if n_processos > 1 and len(pendentes) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(n_processos, len(pendentes))) as executor:
+            futuros = {chave: executor.submit(_diagnosticar_tarefa, (modelo, chave, estado_preso))
+                       for chave in pendentes}
+            for chave, futuro in futuros.items():
+                try:
+                    resultados[chave] = futuro.result()
+                except Exception as erro:
+                    falhas[chave] = f"{type(erro).__name__}: {erro}"
+    else:
+        for chave in pendentes:
+            try:
+                resultados[chave] = diagnosticar_arquivo(modelo, chave, estado_preso)
+            except Exception as erro:
+                falhas[chave] = f"{type(erro).__name__}: {erro}"
+
+    # Arquivos com erro ficam fora da saída e do cache (são tentados de novo)
+    for chave in falhas:
+        del novo_cache[chave]
+    processados = [chave for chave in pendentes if chave not in falhas]
+    for chave, entrada in novo_cache.items():
+        entrada['colunas'] = resultados[chave]
+    if caminho_cache is not None:
+        salvar_cache(caminho_cache, impressao, novo_cache)
+
+    duracao = time.perf_counter() - inicio
+    colunas = {nome: np.array([v for chave in novo_cache for v in resultados[chave][nome]])
+               for nome in COLUNAS}
+    observacoes = int(sum(sum(resultados[chave]['n_passos']) for chave in processados))
+    relatorio = {
+        'arquivos': len(novo_cache) + len(falhas), 'processados': len(processados),
+        'pulados': len(novo_cache) - len(processados), 'com_erro': len(falhas),
+        'sequencias': len(colunas['robo']), 'observacoes_processadas': observacoes, 'segundos': duracao,
+        'observacoes_por_segundo': observacoes / duracao if duracao > 0 else float('nan'),
+        'falhas': falhas,
+    }
+    if verbose:
+        print(f"{relatorio['arquivos']} arquivos ({relatorio['processados']} processados, "
+              f"{relatorio['pulados']} sem mudança, {relatorio['com_erro']} com erro) | "
+              f"{relatorio['sequencias']} sequências | {observacoes} observações em {duracao:.2f} s "
+              f"({relatorio['observacoes_por_segundo']:,.0f} obs/s)")
+        for chave, mensagem in falhas.items():
+            print(f"  ERRO em {os.path.basename(chave)}: {mensagem}")
+    return colunas, relatorio
+
+
+def salvar_colunas(caminho, colunas):
+    """
+    Grava a tabela em formato colunar: .parquet (pandas + pyarrow), .csv
+    (pandas) ou .npz (só numpy, uma entrada por coluna).
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.npz':
+        np.savez_compressed(caminho, **colunas)
+        return
+    if extensao not in ('.parquet', '.csv'):
+        raise ValueError(f"Formato de saída não suportado: '{extensao}' (use .parquet, .csv ou .npz)")
+    import pandas as pd  # só necessário para parquet/csv
+    tabela = pd.DataFrame(colunas)
+    if extensao == '.parquet':
+        tabela.to_parquet(caminho, index=False)
+    else:
+        tabela.to_csv(caminho, index=False)
@@ -0,0 +1,185 @@
+# --- EMISSÕES CONTÍNUAS: GAUSSIANAS E MISTURAS DE GAUSSIANAS ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Em vez de limiarizar os sinais brutos (para-choque, corrente do motor,
+# odometria) em 'Normal'/'Colisao'/'EmEspera', cada estado emite um vetor
+# de F sensores com densidade Gaussiana (ou mistura de C Gaussianas).
+# As constantes de cada estado (inversa do Cholesky da covariância, log-det,
+# log-pesos) são calculadas uma vez; log_verossimilhanca(X) devolve a
+# matriz (T, S) inteira numa única chamada vetorizada.
+#
+# Os motores discretos do hmm_nucleo consomem log B[:, obs[t]]. Passando
+# log B = emissoes.T (S, T) e obs = 0..T-1, a coluna t é exatamente a
+# emissão do instante t: viterbi_continuo / forward_backward_continuo
+# reaproveitam os mesmos motores sem duplicar a recursão.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import TAMANHO_BLOCO, forward_backward, log_seguro, viterbi_log
+
+LOG_2PI = np.log(2.0 * np.pi)
+
+
+def _preparar_covariancias(covariancias, formato):
+    """
+    Aceita covariâncias completas (formato + (F, F)) ou diagonais
+    (formato + (F,)), em que formato + (F,) é o shape das médias.
+    Retorna (inversa do Cholesky ou None, 1/variância ou None, log-determinante (formato)).
+    """
+    covariancias = np.asarray(covariancias, dtype=np.float64)
+    F = formato[-1]
+    if covariancias.shape == formato + (F,):
+        try:
+            cholesky = np.linalg.cholesky(covariancias)
+        except np.linalg.LinAlgError:
+            raise ValueError("Covariâncias devem ser simétricas definidas positivas") from None
+        inversa = np.linalg.inv(cholesky)
+        log_det = 2.0 * np.log(np.diagonal(cholesky, axis1=-2, axis2=-1)).sum(axis=-1)
+        return inversa, None, log_det
+    if covariancias.shape != formato:
+        raise ValueError(f"Covariâncias devem ter shape {formato + (F,)} (completas) ou {formato} "
+                         f"(diagonais), recebido {covariancias.shape}")
+    if np.any(covariancias <= 0):
+        raise ValueError("Variâncias devem ser positivas")
+    return None, 1.0 / covariancias, np.log(covariancias).sum(axis=-1)
+
+
+def _distancias(X, medias, inversa, precisao):
+    """Mahalanobis² (T, ...) de cada x_t a cada média (..., F)."""
+    diferenca = X.reshape((len(X),) + (1,) * (medias.ndim - 1) + (X.shape[1],)) - medias
+    if inversa is not None:
+        z = np.einsum('...ij,t...j->t...i', inversa, diferenca, optimize=True)
+        return np.einsum('t...i,t...i->t...', z, z)
+    return np.einsum('t...i,...i->t...', diferenca * diferenca, precisao)
+
+
+def _validar_sinais(X, F):
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1 and F == 1:
+        X = X[:, None]
+    if X.ndim != 2 or X.shape[1] != F:
+        raise ValueError(f"Os sinais devem ter shape (T, {F}), recebido {X.shape}")
+    if len(X) == 0:
+        raise ValueError("A sequência de sinais está vazia")
+    return X
+
+
+class EmissaoGaussiana:
+    """
+    Uma Gaussiana por estado.
+      medias:        (S, F), ou (S,) para um único sinal
+      covariancias:  (S, F, F) completas ou (S, F) diagonais
+    """
+
+    def __init__(self, medias, covariancias):
+        self.medias = np.asarray(medias, dtype=np.float64)
+        if self.medias.ndim == 1:
+            self.medias = self.medias[:, None]
+        self.n_estados, self.n_sinais = self.medias.shape
+        self.covariancias = np.asarray(covariancias, dtype=np.float64)
+        self._inversa, self._precisao, log_det = _preparar_covariancias(self.covariancias, self.medias.shape)
+        self._constante = -0.5 * (self.n_sinais * LOG_2PI + log_det)
+
+    def log_verossimilhanca(self, X, tamanho_bloco=TAMANHO_BLOCO):
+        """log p(x_t | estado s) para todos os pares: matriz (T, S)."""
+        X = _validar_sinais(X, self.n_sinais)
+        saida = np.empty((len(X), self.n_estados))
+        for ini in range(0, len(X), tamanho_bloco):
+            bloco = X[ini:ini + tamanho_bloco]
+            saida[ini:ini + len(bloco)] = self._constante - 0.5 * _distancias(
+                bloco, self.medias, self._inversa, self._precisao)
+        return saida
+
+
+class EmissaoMisturaGaussiana:
+    """
+    Mistura de C Gaussianas por estado.
+      pesos:         (S, C), cada linha soma 1
+      medias:        (S, C, F)
+      covariancias:  (S, C, F, F) completas ou (S, C, F) diagonais
+    """
+
+    def __init__(self, pesos, medias, covariancias):
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        self.medias = np.asarray(medias, dtype=np.float64)
+        if self.medias.ndim != 3 or self.pesos.shape != self.medias.shape[:2]:
+            raise ValueError(f"Shapes inválidos: pesos {self.pesos.shape}, medias {self.medias.shape}")
+        if np.any(self.pesos < 0) or not np.allclose(self.pesos.sum(axis=1), 1.0):
+            raise ValueError("'pesos' deve ser não-negativo e cada linha deve somar 1")
+        self.n_estados, self.n_componentes, self.n_sinais = self.medias.shape
+        self.covariancias = np.asarray(covariancias, dtype=np.float64)
+        self._inversa, self._precisao, log_det = _preparar_covariancias(self.covariancias, self.medias.shape)
+        # log peso + constante normalizadora de cada componente, (S, C)
+        self._constante = log_seguro(self.pesos) - 0.5 * (self.n_sinais * LOG_2PI + log_det)
+
+    def log_verossimilhanca(self, X, tamanho_bloco=TAMANHO_BLOCO):
+        """log p(x_t | estado s) = logsumexp_c [log w_sc + log N(x_t; mu_sc, Sigma_sc)], (T, S)."""
+        X = _validar_sinais(X, self.n_sinais)
+        saida = np.empty((len(X), self.n_estados))
+        # Blocos menores que no caso Gaussiano: o temporário é (bloco, S, C, F)
+        tamanho_bloco = max(1, tamanho_bloco // self.n_componentes)
+        with np.errstate(divide='ignore'):
+            for ini in range(0, len(X), tamanho_bloco):
+                bloco = X[ini:ini + tamanho_bloco]
+                componentes = self._constante - 0.5 * _distancias(bloco, self.medias, self._inversa,
+                                                                  self._precisao)
+                maximo = componentes.max(axis=2, keepdims=True)
+                maximo = np.where(np.isfinite(maximo), maximo, 0.0)
+                saida[ini:ini + len(bloco)] = (np.log(np.exp(componentes - maximo).sum(axis=2))
+                                               + maximo[..., 0])
+        return saida
+
+
+# --- Motores do hmm_nucleo alimentados por uma matriz de emissões (T, S) ---
+
+def viterbi_continuo(log_pi, log_A, log_emissoes, retornar_delta=False):
+    """viterbi_log com log B[s, obs[t]] trocado por log_emissoes[t, s]. Mesmo retorno."""
+    log_emissoes = np.asarray(log_emissoes, dtype=np.float64)
+    return viterbi_log(log_pi, log_A, log_emissoes.T, np.arange(len(log_emissoes)), retornar_delta)
+
+
+def forward_backward_continuo(pi, A, log_emissoes, estados_saida=None):
+    """
+    forward_backward com densidades de emissão em log (T, S). Cada instante
+    é reescalado pelo seu máximo antes de sair do log (densidades podem ser
+    muito maiores ou menores que 1) e a escala volta na log-verossimilhança.
+    """
+    log_emissoes = np.asarray(log_emissoes, dtype=np.float64)
+    escala = log_emissoes.max(axis=1)
+    if not np.all(np.isfinite(escala)):
+        raise ValueError("Há instantes com densidade nula em todos os estados")
+    emissoes = np.exp(log_emissoes - escala[:, None]).T
+    posteriores, log_veross = forward_backward(pi, A, emissoes, np.arange(len(log_emissoes)),
+                                               estados_saida=estados_saida)
+    return posteriores, log_veross + float(escala.sum())
+
+
+class ModeloHMMContinuo:
+    """
+    HMM com estados nomeados, transições (pi, A) e um modelo de emissão
+    contínuo (EmissaoGaussiana ou EmissaoMisturaGaussiana). Recebe sinais
+    brutos X (T, F) no lugar de nomes de observação.
+    """
+
+    def __init__(self, estados, pi, A, emissao):
+        self.estados = [str(e) for e in estados]
+        self.mapa_estados = {estado: i for i, estado in enumerate(self.estados)}
+        self.pi = np.asarray(pi, dtype=np.float64)
+        self.A = np.asarray(A, dtype=np.float64)
+        S = len(self.estados)
+        if self.pi.shape != (S,) or self.A.shape != (S, S) or emissao.n_estados != S:
+            raise ValueError(f"Shapes inválidos para {S} estados: pi {self.pi.shape}, A {self.A.shape}, "
+                             f"emissão com {emissao.n_estados} estados")
+        self.emissao = emissao
+        self.log_pi, self.log_A = log_seguro(self.pi), log_seguro(self.A)
+
+    def viterbi(self, X):
+        """Sequência de estados mais provável (nomes) e sua log-densidade conjunta."""
+        caminho, log_prob, _ = viterbi_continuo(self.log_pi, self.log_A, self.emissao.log_verossimilhanca(X))
+        return [self.estados[i] for i in caminho], log_prob
+
+    def posteriores(self, X, estados_saida=None):
+        """P(estado_t | todos os sinais) e a log-verossimilhança (densidade) da sequência."""
+        return forward_backward_continuo(self.pi, self.A, self.emissao.log_verossimilhanca(X), estados_saida)
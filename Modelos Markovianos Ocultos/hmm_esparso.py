@@ -0,0 +1,128 @@
+# --- HMM COM TRANSIÇÕES ESPARSAS (MUITOS ESTADOS) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Em modelos estendidos (cômodo x atividade) há centenas de estados, mas
+# cada estado só é alcançável a partir de poucos outros — a própria A do
+# RoboHMM já tem zeros estruturais (Preso -> Base, Base -> Preso). Aqui
+# cada estado guarda a lista dos seus predecessores (estilo CSR), e cada
+# passo do Viterbi/forward custa O(nnz) em vez de O(S^2). A escolha entre
+# o motor denso (hmm_nucleo) e o esparso é feita pela densidade de A
+# (ModeloHMM.definir_parametros). Só o Viterbi e o forward de
+# verossimilhança têm versão esparsa; o forward-backward segue denso.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import TAMANHO_BLOCO, menor_dtype_inteiro, validar_observacoes
+
+# Abaixo desta densidade (nnz / S^2) e a partir deste número de estados o
+# motor esparso vence o denso (ver bench-esparso.py). Em modelos pequenos
+# o custo fixo por operação NumPy domina e o denso continua melhor.
+LIMIAR_DENSIDADE = 0.3
+MIN_ESTADOS_ESPARSO = 48
+
+
+class TransicoesCSR:
+    """
+    Matriz de transição guardada por coluna de destino: os predecessores
+    do estado j são origem[indptr[j]:indptr[j+1]] (em ordem crescente, como
+    o argmax denso) com as probabilidades correspondentes em 'valor'.
+    """
+
+    def __init__(self, A):
+        A = np.asarray(A, dtype=np.float64)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError(f"A deve ser quadrada, recebido shape {A.shape}")
+        self.n_estados = A.shape[0]
+        destino, origem = np.nonzero(A.T)
+        self.origem = origem.astype(np.intp)
+        self.destino = destino.astype(np.intp)
+        self.valor = A[origem, destino]
+        self.log_valor = np.log(self.valor)
+        contagens = np.bincount(destino, minlength=self.n_estados)
+        self.indptr = np.concatenate(([0], np.cumsum(contagens)))
+        self.nnz = len(self.origem)
+        self.densidade = self.nnz / self.n_estados ** 2
+
+        # Estados sem nenhum predecessor ficam de fora das reduções segmentadas
+        self.com_predecessor = contagens > 0
+        self.inicio_segmentos = self.indptr[:-1][self.com_predecessor]
+        self.tamanho_segmentos = contagens[self.com_predecessor]
+        self._posicoes = np.arange(self.nnz)
+
+
+def escolher_motor(A):
+    """Devolve 'esparso' ou 'denso' a partir da densidade e do tamanho de A."""
+    A = np.asarray(A)
+    densidade = np.count_nonzero(A) / A.size
+    if A.shape[0] >= MIN_ESTADOS_ESPARSO and densidade <= LIMIAR_DENSIDADE:
+        return 'esparso'
+    return 'denso'
+
+
+def viterbi_esparso(log_pi, csr, log_B, obs, retornar_delta=False, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Viterbi em log-espaço com transições CSR. Mesma interface e mesmo
+    desempate (menor índice de predecessor) de hmm_nucleo.viterbi_log.
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    T = len(obs)
+    S = csr.n_estados
+
+    psi = np.zeros((T, S), dtype=menor_dtype_inteiro(S))
+    delta_completo = np.empty((T, S)) if retornar_delta else None
+    alcancaveis = csr.com_predecessor
+    inicios, tamanhos, posicoes = csr.inicio_segmentos, csr.tamanho_segmentos, csr._posicoes
+
+    # --- PASSO 1: Inicialização ---
+    delta = log_pi + log_B_T[obs[0]]
+    if retornar_delta:
+        delta_completo[0] = delta
+
+    # --- PASSO 2: Recursão em O(nnz) por passo ---
+    novo = np.full(S, -np.inf)
+    for ini in range(1, T, tamanho_bloco):
+        emissoes = log_B_T[obs[ini:ini + tamanho_bloco]]
+        for k in range(len(emissoes)):
+            candidatos = delta[csr.origem] + csr.log_valor
+            maximos = np.maximum.reduceat(candidatos, inicios)
+            # Primeira posição de cada segmento que atinge o máximo (= argmax denso)
+            empate = np.where(candidatos == np.repeat(maximos, tamanhos), posicoes, csr.nnz)
+            psi[ini + k, alcancaveis] = csr.origem[np.minimum.reduceat(empate, inicios)]
+            novo[alcancaveis] = maximos
+            delta = novo + emissoes[k]
+            if retornar_delta:
+                delta_completo[ini + k] = delta
+
+    # --- PASSO 3 e 4: Terminação e backtracking ---
+    caminho = np.empty(T, dtype=np.intp)
+    caminho[T-1] = np.argmax(delta)
+    log_prob = float(delta[caminho[T-1]])
+    for t in range(T-2, -1, -1):
+        caminho[t] = psi[t+1, caminho[t+1]]
+    return caminho, log_prob, delta_completo
+
+
+def forward_esparso(pi, csr, B, obs):
+    """
+    Forward escalonado com transições CSR (produto vetor-matriz via bincount).
+    Retorna (log P(O), distribuição filtrada final), como hmm_nucleo.forward.
+    """
+    B_T = np.ascontiguousarray(np.asarray(B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, B_T.shape[0])
+    S = csr.n_estados
+    log_veross = 0.0
+    alpha = np.asarray(pi, dtype=np.float64) * B_T[obs[0]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for t in range(len(obs)):
+            if t > 0:
+                alpha = np.bincount(csr.destino, weights=alpha[csr.origem] * csr.valor, minlength=S)
+                alpha *= B_T[obs[t]]
+            c = alpha.sum()
+            alpha /= c
+            log_veross += np.log(c)
+    return float(log_veross), alpha
+
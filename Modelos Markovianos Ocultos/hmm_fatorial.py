@@ -0,0 +1,277 @@
+# --- HMM FATORIAL: VÁRIOS ROBÔS NO MESMO AMBIENTE ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# K robôs na mesma casa: o estado conjunto é (x_1, ..., x_K), cada x_k com
+# S_k estados. Cada robô evolui pela sua própria matriz A_k, então a
+# transição conjunta é o produto de Kronecker A_1 ⊗ ... ⊗ A_K, e os robôs
+# se acoplam pelas emissões: cada um emite o seu log e um fator de
+# interação par-a-par phi[x_k, x_l] pesa combinações conjuntas (ex.: uma
+# única base de carga -> dois robôs em 'Base' ao mesmo tempo é
+# improvável; um robô preso bloqueia o outro).
+#
+# A matriz S^K × S^K nunca é montada. delta/alpha são tensores (S_1, ...,
+# S_K) e cada passo de tempo aplica A_k a um eixo por vez (contração por
+# fator), custo O(K · S^(K+1)) em vez de O(S^(2K)). No Viterbi cada
+# contração guarda o seu próprio backpointer (um eixo), e o backtracking
+# desfaz as contrações na ordem inversa.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import log_seguro, menor_dtype_inteiro, validar_observacoes
+
+# Elementos (passos · S^K) do tensor de emissões montado de uma vez
+ELEMENTOS_POR_BLOCO = 1 << 20
+
+
+def _validar(log_pis, log_As, log_Bs, obs):
+    """Confere shapes por robô e devolve obs como (K, T) de índices."""
+    K = len(log_pis)
+    if not (len(log_As) == len(log_Bs) == K) or K == 0:
+        raise ValueError("pis, As e Bs devem ter um item por robô (K >= 1)")
+    obs = np.asarray(obs)
+    if obs.ndim != 2 or len(obs) != K:
+        raise ValueError(f"'obs' deve ter shape (K={K}, T), recebido {obs.shape}")
+    for k in range(K):
+        S = len(log_pis[k])
+        if log_As[k].shape != (S, S) or log_Bs[k].shape[0] != S:
+            raise ValueError(f"Robô {k}: shapes inválidos pi {log_pis[k].shape}, A {log_As[k].shape}, "
+                             f"B {log_Bs[k].shape}")
+    return np.stack([validar_observacoes(obs[k], log_Bs[k].shape[1]) for k in range(K)])
+
+
+def _no_eixo(vetor, eixo, n_eixos):
+    """Vetor (S,) com shape de broadcast sobre o eixo 'eixo' de um tensor com n_eixos eixos."""
+    forma = [1] * n_eixos
+    forma[eixo] = len(vetor)
+    return vetor.reshape(forma)
+
+
+def log_pi_conjunto(log_pis):
+    """log pi do estado conjunto = Σ_k log pi_k[x_k], tensor (S_1, ..., S_K)."""
+    K = len(log_pis)
+    termo = np.zeros(tuple(len(p) for p in log_pis))
+    for k, log_pi in enumerate(log_pis):
+        termo = termo + _no_eixo(log_pi, k, K)
+    return termo
+
+
+def tensor_interacao(log_interacao, formato):
+    """
+    Soma sobre todos os pares k < l de log_interacao[x_k, x_l] como um
+    tensor 'formato' = (S,)*K (robôs intercambiáveis, mesmo conjunto de estados).
+    """
+    K = len(formato)
+    termo = np.zeros(formato)
+    for k in range(K):
+        for l in range(k + 1, K):
+            forma = [1] * K
+            forma[k], forma[l] = formato[k], formato[l]
+            termo = termo + log_interacao.reshape(forma)
+    return termo
+
+
+def emissoes_conjuntas(log_Bs, obs, t_ini, t_fim, termo_interacao=None):
+    """
+    log p(o_t | x_t) para t em [t_ini, t_fim): tensor (n, S_1, ..., S_K)
+    = Σ_k log B_k[x_k, o_k,t] (+ o termo de interação, igual em todo t).
+    """
+    K = len(log_Bs)
+    n = t_fim - t_ini
+    saida = np.zeros((n,) + tuple(len(log_B) for log_B in log_Bs))
+    for k, log_B in enumerate(log_Bs):
+        # log_B[:, obs].T é (n, S_k): o tempo fica no eixo 0 e S_k vai para o eixo k+1
+        forma = [n] + [1] * K
+        forma[k + 1] = len(log_B)
+        saida += log_B[:, obs[k, t_ini:t_fim]].T.reshape(forma)
+    if termo_interacao is not None:
+        saida += termo_interacao
+    return saida
+
+
+def _blocos(T, formato, elementos_por_bloco):
+    passos = max(1, elementos_por_bloco // int(np.prod(formato)))
+    return [(ini, min(ini + passos, T)) for ini in range(0, T, passos)]
+
+
+def _contrair_max(delta, log_A, eixo):
+    """max_{x_k} delta[..., x_k, ...] + log_A[x_k, y_k] -> (tensor com y_k no eixo, argmax)."""
+    candidatos = np.moveaxis(delta, eixo, -1)[..., :, None] + log_A
+    psi = candidatos.argmax(axis=-2)
+    return np.moveaxis(candidatos.max(axis=-2), -1, eixo), np.moveaxis(psi, -1, eixo)
+
+
+def _contrair_soma(alpha, A, eixo):
+    """Σ_{x_k} alpha[..., x_k, ...] · A[x_k, y_k] com y_k no mesmo eixo."""
+    return np.moveaxis(np.tensordot(alpha, A, axes=([eixo], [0])), -1, eixo)
+
+
+def viterbi_fatorial(log_pis, log_As, log_Bs, obs, log_interacao=None,
+                     elementos_por_bloco=ELEMENTOS_POR_BLOCO):
+    """
+    Estado conjunto mais provável. obs: (K, T). Retorna (caminhos (K, T),
+    log_prob) -- log_prob inclui o fator de interação (potencial não
+    normalizado) quando dado.
+    """
+    log_pis = [np.asarray(p, dtype=np.float64) for p in log_pis]
+    log_As = [np.asarray(A, dtype=np.float64) for A in log_As]
+    log_Bs = [np.asarray(B, dtype=np.float64) for B in log_Bs]
+    obs = _validar(log_pis, log_As, log_Bs, obs)
+    K, T = obs.shape
+    formato = tuple(len(p) for p in log_pis)
+    termo = None if log_interacao is None else tensor_interacao(np.asarray(log_interacao, np.float64), formato)
+
+    # psi[k][t-1] = backpointer da contração do eixo k no passo t
+    psi = [np.empty((T - 1,) + formato, dtype=menor_dtype_inteiro(formato[k])) for k in range(K)]
+    delta = None
+    for ini, fim in _blocos(T, formato, elementos_por_bloco):
+        emissoes = emissoes_conjuntas(log_Bs, obs, ini, fim, termo)
+        for t in range(ini, fim):
+            if t == 0:
+                delta = log_pi_conjunto(log_pis) + emissoes[0]
+                continue
+            for k in range(K):
+                delta, psi[k][t - 1] = _contrair_max(delta, log_As[k], k)
+            delta = delta + emissoes[t - ini]
+
+    caminhos = np.empty((K, T), dtype=np.intp)
+    estado = list(np.unravel_index(np.argmax(delta), formato))
+    caminhos[:, T - 1] = estado
+    for t in range(T - 1, 0, -1):
+        # Desfaz as contrações da última para a primeira: o eixo k volta ao estado anterior
+        for k in range(K - 1, -1, -1):
+            estado[k] = psi[k][t - 1][tuple(estado)]
+        caminhos[:, t - 1] = estado
+    return caminhos, float(delta.max())
+
+
+def forward_backward_fatorial(pis, As, Bs, obs, interacao=None, elementos_por_bloco=ELEMENTOS_POR_BLOCO):
+    """
+    Marginais por robô P(x_k,t | todos os logs), (K, T, S), e a
+    log-verossimilhança conjunta. 'interacao' (S, S) é o fator par-a-par em
+    probabilidade; com ele a log-verossimilhança é a do modelo não
+    normalizado (as marginais não dependem da normalização).
+    Guarda os alphas reescalados (T · S^K floats).
+    """
+    pis = [np.asarray(p, dtype=np.float64) for p in pis]
+    As = [np.asarray(A, dtype=np.float64) for A in As]
+    log_Bs = [log_seguro(np.asarray(B, dtype=np.float64)) for B in Bs]
+    obs = _validar(pis, As, log_Bs, obs)
+    K, T = obs.shape
+    formato = tuple(len(p) for p in pis)
+    termo = None if interacao is None else tensor_interacao(log_seguro(np.asarray(interacao, np.float64)),
+                                                           formato)
+    blocos = _blocos(T, formato, elementos_por_bloco)
+    pi_conjunto = np.exp(log_pi_conjunto([log_seguro(p) for p in pis]))
+
+    def emissoes_bloco(ini, fim):
+        # Cada instante é reescalado pelo seu máximo antes de sair do log
+        log_e = emissoes_conjuntas(log_Bs, obs, ini, fim, termo)
+        escala = log_e.reshape(fim - ini, -1).max(axis=1)
+        if not np.all(np.isfinite(escala)):
+            raise ValueError("Há instantes com probabilidade nula em todos os estados conjuntos")
+        return np.exp(log_e - escala.reshape((-1,) + (1,) * K)), escala
+
+    # --- Forward (alphas normalizados a cada passo) ---
+    alphas = np.empty((T,) + formato)
+    log_veross = 0.0
+    alpha = None
+    for ini, fim in blocos:
+        emissoes, escala = emissoes_bloco(ini, fim)
+        log_veross += float(escala.sum())
+        for t in range(ini, fim):
+            if t == 0:
+                alpha = pi_conjunto * emissoes[0]
+            else:
+                for k in range(K):
+                    alpha = _contrair_soma(alpha, As[k], k)
+                alpha = alpha * emissoes[t - ini]
+            c = alpha.sum()
+            if c <= 0:
+                raise ValueError(f"Sequência impossível para o modelo (probabilidade nula em t={t})")
+            alpha = alpha / c
+            log_veross += float(np.log(c))
+            alphas[t] = alpha
+
+    # --- Backward: beta_t = Σ_y A(x, y) e_{t+1}(y) beta_{t+1}(y), contraindo A_k^T por eixo ---
+    marginais = np.zeros((K, T, max(formato)))
+    beta = np.ones(formato)
+    eixos = tuple(range(K))
+    for ini, fim in reversed(blocos):
+        emissoes, _ = emissoes_bloco(ini, fim)
+        for t in range(fim - 1, ini - 1, -1):
+            if t < T - 1:
+                beta = beta_seguinte * emissoes_seguinte
+                for k in range(K):
+                    beta = _contrair_soma(beta, As[k].T, k)
+                beta = beta / beta.sum()
+            gama = alphas[t] * beta
+            gama = gama / gama.sum()
+            for k in range(K):
+                marginais[k, t, :formato[k]] = gama.sum(axis=eixos[:k] + eixos[k + 1:])
+            beta_seguinte, emissoes_seguinte = beta, emissoes[t - ini]
+    return marginais, log_veross
+
+
+class ModeloFatorial:
+    """
+    K robôs com o mesmo HMM ('modelo', um ModeloHMM: nomes, pi, A, B e a
+    codificação) e um fator de interação par-a-par (S, S) entre os estados
+    de cada dupla. viterbi/posteriores recebem uma lista com a sequência
+    de logs (nomes) de cada robô.
+    """
+
+    def __init__(self, modelo, n_robos, interacao=None):
+        self.modelo = modelo
+        self.n_robos = int(n_robos)
+        S = modelo.n_estados
+        self.interacao = np.ones((S, S)) if interacao is None else np.asarray(interacao, dtype=np.float64)
+        if self.interacao.shape != (S, S) or np.any(self.interacao < 0):
+            raise ValueError(f"'interacao' deve ser ({S}, {S}) e não-negativa, recebido {self.interacao.shape}")
+        self.log_interacao = log_seguro(self.interacao)
+
+    @property
+    def estados(self):
+        return self.modelo.estados
+
+    @property
+    def mapa_estados(self):
+        return self.modelo.mapa_estados
+
+    @classmethod
+    def de_modelo_hmm(cls, modelo, n_robos, interacao=None):
+        """
+        Fatorial com n_robos cópias do HMM 'modelo' (ex.: o RoboHMM).
+        'interacao' = {(estado_a, estado_b): fator}: multiplica a
+        plausibilidade de uma dupla estar em (estado_a, estado_b) no mesmo
+        instante (simétrico; pares omitidos valem 1).
+        """
+        fatores = np.ones((modelo.n_estados, modelo.n_estados))
+        for (a, b), fator in (interacao or {}).items():
+            i, j = modelo.mapa_estados[a], modelo.mapa_estados[b]
+            fatores[i, j] = fatores[j, i] = fator
+        return cls(modelo, n_robos, fatores)
+
+    def codificar(self, logs_robos):
+        """Um log (nomes) por robô -> array (K, T) de índices."""
+        if len(logs_robos) != self.n_robos:
+            raise ValueError(f"Esperado um log por robô ({self.n_robos}), recebido {len(logs_robos)}")
+        if len({len(log) for log in logs_robos}) > 1:
+            raise ValueError("Os logs dos robôs devem ter o mesmo comprimento")
+        return np.array([self.modelo.codificar(log) for log in logs_robos])
+
+    def viterbi_indices(self, obs):
+        K, m = self.n_robos, self.modelo
+        return viterbi_fatorial([m.log_pi] * K, [m.log_A] * K, [m.log_B] * K, obs, self.log_interacao)
+
+    def viterbi(self, logs_robos):
+        """Diagnóstico conjunto: lista (por robô) de nomes de estados, e a log-prob."""
+        caminhos, log_prob = self.viterbi_indices(self.codificar(logs_robos))
+        return [self.modelo.nomes_estados(caminho) for caminho in caminhos], log_prob
+
+    def posteriores(self, logs_robos):
+        """P(estado do robô k em t | logs de todos os robôs), (K, T, S), e a log-verossimilhança."""
+        K, m = self.n_robos, self.modelo
+        return forward_backward_fatorial([m.pi] * K, [m.A] * K, [m.B] * K,
+                                         self.codificar(logs_robos), self.interacao)
@@ -0,0 +1,165 @@
+# --- VITERBI INCREMENTAL E RETOMÁVEL (LOGS ENVIADOS EM PARTES) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Os robôs enviam o log aos poucos. Em vez de rodar o Viterbi de novo
+# desde t=0 a cada envio, o decodificador guarda só a última coluna de
+# delta e a cauda de backpointers ainda não resolvida: anexar n
+# observações custa O(n·S²). Os instantes em que todos os caminhos
+# sobreviventes já se fundiram não mudam mais e são entregues como
+# definitivos; a cauda é compactada logo em seguida. Entre um envio e
+# outro o estado cabe em alguns KB (serializar / retomar).
+# -----------------------------------------------------------------
+
+import hashlib
+import io
+
+import numpy as np
+
+from hmm_nucleo import _recursao_viterbi, log_seguro, menor_dtype_inteiro, validar_observacoes
+from hmm_online import ponto_de_convergencia
+
+
+def impressao_parametros(pi, A, B):
+    """sha256 (hex) de (pi, A, B): o estado salvo só vale para o mesmo modelo."""
+    resumo = hashlib.sha256()
+    for matriz in (pi, A, B):
+        resumo.update(np.ascontiguousarray(matriz, dtype=np.float64).tobytes())
+    return resumo.hexdigest()
+
+
+class DecodificadorIncremental:
+    """
+    Viterbi exato retomável. anexar(obs) devolve (inicio, estados): os
+    instantes inicio..inicio+len(estados)-1 cujo estado ficou definitivo
+    com este envio. Concatenando todas as saídas e a de finalizar() obtém-se
+    o mesmo caminho do viterbi_log sobre o log inteiro.
+
+    Se 'atraso_max' for dado, a cauda nunca passa desse tamanho: o
+    instante mais antigo é decidido à força pelo melhor caminho atual
+    (como o Viterbi com atraso fixo do hmm_online), trocando exatidão por
+    memória limitada em modelos cujos caminhos demoram a se fundir.
+    """
+
+    def __init__(self, pi, A, B, atraso_max=None):
+        self.pi = np.asarray(pi, dtype=np.float64)
+        self.A = np.asarray(A, dtype=np.float64)
+        self.B = np.asarray(B, dtype=np.float64)
+        self.log_pi = log_seguro(self.pi)
+        self.log_A = log_seguro(self.A)
+        self.log_B_T = np.ascontiguousarray(log_seguro(self.B).T)
+        self.n_estados = len(self.pi)
+        self.atraso_max = atraso_max
+        self._dtype_psi = menor_dtype_inteiro(self.n_estados)
+
+        self.t = 0                  # observações consumidas
+        self.t_decidido = 0         # primeiro instante ainda provisório
+        self.delta = None           # log-delta do instante t-1 (valores absolutos)
+        self.finalizado = False
+        # Cauda: linha k = backpointers do passo t_decidido + 1 + k
+        self._cauda = np.empty((0, self.n_estados), dtype=self._dtype_psi)
+        # Sobreviventes por instante provisório (ver ponto_de_convergencia); não
+        # vai para serializar(), é recalculado no primeiro envio após retomar
+        self._sobreviventes = []
+
+    @property
+    def log_prob(self):
+        """Log-probabilidade do melhor caminho até agora."""
+        return float(self.delta.max()) if self.delta is not None else 0.0
+
+    def _linha(self, u):
+        return self._cauda[u - self.t_decidido - 1]
+
+    def _rastrear(self, estado, de_u):
+        """Estados t_decidido..de_u seguindo a cauda a partir de 'estado' em de_u."""
+        estados = np.empty(de_u - self.t_decidido + 1, dtype=np.intp)
+        estados[-1] = estado
+        for u in range(de_u, self.t_decidido, -1):
+            estado = self._linha(u)[estado]
+            estados[u - 1 - self.t_decidido] = estado
+        return estados
+
+    def _decidir(self, estados):
+        """Marca 'estados' como definitivos e descarta a cauda correspondente."""
+        inicio = self.t_decidido
+        self.t_decidido += len(estados)
+        self._cauda = self._cauda[len(estados):].copy()
+        del self._sobreviventes[:len(estados)]
+        return inicio, estados
+
+    def anexar(self, obs):
+        """Consome um novo trecho do log (índices inteiros) e devolve (inicio, estados definitivos)."""
+        if self.finalizado:
+            raise ValueError("Decodificador já finalizado: crie outro para um novo log")
+        if len(obs) == 0:
+            # Envio vazio (ex.: arquivo sem linhas novas): nada muda
+            return self.t_decidido, np.empty(0, dtype=np.intp)
+        obs = validar_observacoes(obs, self.log_B_T.shape[0])
+        n = len(obs)
+        inicio_novos = 0
+        if self.t == 0:
+            self.delta = self.log_pi + self.log_B_T[obs[0]]
+            inicio_novos = 1
+
+        # --- Recursão só sobre as observações novas ---
+        novos = np.empty((n - inicio_novos, self.n_estados), dtype=self._dtype_psi)
+        self.delta = _recursao_viterbi(self.delta, self.log_A, self.log_B_T, obs,
+                                       inicio_novos, n, novos, inicio_novos)
+        self._cauda = np.concatenate((self._cauda, novos))
+        self.t += n
+
+        # --- Instantes definitivos: fusão dos sobreviventes ---
+        inicio, decididos = self.t_decidido, []
+        fusao = ponto_de_convergencia(self._linha, (self.t_decidido, self.t - 1), self._sobreviventes)
+        if fusao is not None:
+            u, estado = fusao
+            decididos.append(self._decidir(self._rastrear(estado, u))[1])
+        if self.atraso_max is not None and len(self._cauda) > self.atraso_max:
+            excesso = len(self._cauda) - self.atraso_max
+            caminho = self._rastrear(int(self.delta.argmax()), self.t - 1)
+            decididos.append(self._decidir(caminho[:excesso])[1])
+        estados = np.concatenate(decididos) if decididos else np.empty(0, dtype=np.intp)
+        return inicio, estados
+
+    def caminho_provisorio(self):
+        """Melhor caminho atual para os instantes ainda não definitivos (pode mudar)."""
+        if self.t == self.t_decidido:
+            return np.empty(0, dtype=np.intp)
+        return self._rastrear(int(self.delta.argmax()), self.t - 1)
+
+    def finalizar(self):
+        """Fim do log: decide os instantes pendentes. Retorna (inicio, estados)."""
+        inicio = self.t_decidido
+        estados = self.caminho_provisorio()
+        if len(estados):
+            self._decidir(estados)
+        self.finalizado = True
+        return inicio, estados
+
+    # --- Persistência entre envios ---
+
+    def serializar(self):
+        """Estado atual em bytes (NPZ compactado): delta, cauda e contadores."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, t=self.t, t_decidido=self.t_decidido, finalizado=self.finalizado,
+            delta=self.delta if self.delta is not None else np.empty(0), cauda=self._cauda,
+            atraso_max=-1 if self.atraso_max is None else self.atraso_max,
+            modelo=impressao_parametros(self.pi, self.A, self.B),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def retomar(cls, dados, pi, A, B):
+        """Recria o decodificador a partir de serializar(), conferindo que o modelo é o mesmo."""
+        with np.load(io.BytesIO(dados)) as estado:
+            if str(estado['modelo']) != impressao_parametros(pi, A, B):
+                raise ValueError("O estado salvo foi gerado com outro modelo (pi, A, B diferentes)")
+            atraso_max = int(estado['atraso_max'])
+            decodificador = cls(pi, A, B, atraso_max=None if atraso_max < 0 else atraso_max)
+            decodificador.t = int(estado['t'])
+            decodificador.t_decidido = int(estado['t_decidido'])
+            decodificador.finalizado = bool(estado['finalizado'])
+            decodificador.delta = estado['delta'] if decodificador.t > 0 else None
+            decodificador._cauda = estado['cauda'].astype(decodificador._dtype_psi)
+        return decodificador
@@ -0,0 +1,75 @@
+# --- VITERBI DOS K MELHORES CAMINHOS (LIST VITERBI) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Em vez de um sobrevivente por estado, guarda os K melhores caminhos que
+# terminam em cada estado: delta (S, K) e backpointers (T, S, K), em que
+# cada backpointer codifica (estado anterior, posto anterior) como
+# estado * K + posto. Cada passo escolhe os K maiores entre os S·K
+# candidatos de cada estado com argpartition, então o custo cresce
+# linearmente em K: O(T·S²·K).
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import menor_dtype_inteiro, validar_observacoes
+
+
+def viterbi_k_melhores(log_pi, log_A, log_B, obs, K):
+    """
+    Os K caminhos de estados mais prováveis (distintos) para a sequência.
+
+    Parâmetros em log, como em hmm_nucleo.viterbi_log. Retorna
+    (caminhos (K', T), log_probs (K',)) em ordem decrescente, com K' <= K
+    quando há menos de K caminhos possíveis. O primeiro tem a mesma
+    log-probabilidade do caminho de viterbi_log.
+    """
+    if K < 1:
+        raise ValueError("'K' deve ser pelo menos 1")
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    T = len(obs)
+    S = len(log_pi)
+
+    psi = np.zeros((T, S, K), dtype=menor_dtype_inteiro(S * K))
+    candidatos = np.empty((S, K, S))
+    colunas = np.arange(S)
+
+    # --- Inicialização: um único caminho por estado, demais postos em -inf ---
+    delta = np.full((S, K), -np.inf)
+    delta[:, 0] = log_pi + log_B_T[obs[0]]
+
+    # --- Recursão: top-K dos S·K candidatos de cada estado de destino ---
+    for t in range(1, T):
+        # candidatos[i, k, j] = delta[i, k] + log A[i, j]
+        np.add(delta[:, :, None], log_A[:, None, :], out=candidatos)
+        plano = candidatos.reshape(S * K, S)
+        melhores = np.argpartition(plano, S * K - K, axis=0)[-K:]
+        valores = plano[melhores, colunas]
+        ordem = np.argsort(-valores, axis=0, kind='stable')
+        melhores = np.take_along_axis(melhores, ordem, axis=0)
+        psi[t] = melhores.T
+        delta = np.take_along_axis(valores, ordem, axis=0).T + log_B_T[obs[t]][:, None]
+
+    # --- Terminação: K melhores entre todos os (estado, posto) finais ---
+    finais = delta.ravel()
+    n = min(K, np.count_nonzero(np.isfinite(finais)))
+    topo = np.argsort(-finais, kind='stable')[:n]
+    log_probs = finais[topo]
+
+    # --- Backtracking dos n caminhos em paralelo ---
+    caminhos = np.empty((n, T), dtype=np.intp)
+    estados, postos = topo // K, topo % K
+    caminhos[:, T-1] = estados
+    for t in range(T - 1, 0, -1):
+        anterior = psi[t, estados, postos].astype(np.intp)
+        estados, postos = anterior // K, anterior % K
+        caminhos[:, t-1] = estados
+    return caminhos, log_probs
+
+
+def confianca_caminhos(log_probs, log_verossimilhanca):
+    """P(caminho | observações) de cada caminho, dado log P(O) do forward."""
+    return np.exp(np.asarray(log_probs) - log_verossimilhanca)
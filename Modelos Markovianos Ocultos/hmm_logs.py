@@ -0,0 +1,266 @@
+# --- FORMATO BINÁRIO COMPACTO PARA LOGS DA FROTA ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Logs de texto/CSV ('Normal', 'Colisao', ...) são convertidos uma única vez
+# para um arquivo .hmmlog com as observações já codificadas em uint8, no
+# mesmo layout ragged (buffer + offsets CSR) das rotinas *_lote. Abrir o
+# arquivo só mapeia a memória (np.memmap): nada é lido nem copiado até os
+# decodificadores tocarem nas posições, então a abertura leva milissegundos
+# qualquer que seja o tamanho da frota.
+#
+# Layout (little-endian):
+#   [0, 64)        cabeçalho: MAGICO, versão, n. de observações, n. de
+#                  sequências, posição dos offsets, posição e tamanho dos metadados
+#   [64, 64+n)     observações codificadas (uint8, uma por byte)
+#   alinhado a 8   offsets int64 (n_sequencias + 1)
+#   final          metadados JSON: tabela de símbolos e id do robô de cada sequência
+# -----------------------------------------------------------------
+
+import csv
+import json
+import os
+import struct
+
+import numpy as np
+
+from hmm_nucleo import OBSERVACOES_POR_BLOCO
+
+MAGICO = b'HMMLOG\x00\x01'
+VERSAO = 1
+TAMANHO_CABECALHO = 64
+# magico, versao, n_observacoes, n_sequencias, pos_offsets, pos_meta, tam_meta
+_FORMATO_CABECALHO = '<8sQQQQQQ'
+
+# Linhas lidas do texto/CSV antes de codificar e gravar em disco
+LINHAS_POR_LOTE = 1 << 16
+
+
+class EscritorLog:
+    """
+    Grava um .hmmlog em streaming: cada sequência é anexada assim que chega
+    (sem guardar a frota na memória). Os offsets e os metadados vão para o
+    fim do arquivo em fechar(), que também preenche o cabeçalho.
+
+        with EscritorLog('frota.hmmlog', robo.observacoes) as escritor:
+            escritor.adicionar('robo-07', indices)
+    """
+
+    def __init__(self, caminho, observacoes):
+        self.observacoes = [str(o) for o in observacoes]
+        if len(self.observacoes) > 256:
+            raise ValueError(f"O formato usa uint8: no máximo 256 observações, recebido {len(self.observacoes)}")
+        self.mapa_obs = {obs: i for i, obs in enumerate(self.observacoes)}
+        self.caminho = caminho
+        self.robos = []
+        self._offsets = [0]
+        self._aberta = None       # robô da sequência em andamento (adicionar_parcial)
+        self._tamanho_aberta = 0
+        self._arquivo = open(caminho, 'wb')
+        self._arquivo.write(b'\x00' * TAMANHO_CABECALHO)
+
+    def codificar(self, nomes):
+        """Lista de nomes de observação -> array uint8 de índices."""
+        try:
+            return np.fromiter((self.mapa_obs[o] for o in nomes), dtype=np.uint8, count=len(nomes))
+        except KeyError as erro:
+            raise ValueError(f"Observação desconhecida {erro} (esperado uma de {self.observacoes})") from None
+
+    def adicionar(self, robo, obs):
+        """Anexa uma sequência completa (índices inteiros) do robô 'robo'."""
+        self.adicionar_parcial(robo, obs)
+        self.encerrar_sequencia()
+
+    def adicionar_parcial(self, robo, obs):
+        """
+        Anexa um pedaço da sequência do robô 'robo'; pedaços seguidos do mesmo
+        robô formam uma única sequência até encerrar_sequencia() (ou até
+        chegar um pedaço de outro robô).
+        """
+        robo = str(robo)
+        if self._aberta is not None and self._aberta != robo:
+            self.encerrar_sequencia()
+        obs = np.asarray(obs)
+        if len(obs) and (obs.min() < 0 or obs.max() >= len(self.observacoes)):
+            raise ValueError(f"Índice de observação fora do intervalo [0, {len(self.observacoes)})")
+        self._arquivo.write(obs.astype(np.uint8, copy=False).tobytes())
+        self._aberta = robo
+        self._tamanho_aberta += len(obs)
+
+    def encerrar_sequencia(self):
+        """Fecha a sequência em andamento (se houver)."""
+        if self._aberta is not None:
+            self.robos.append(self._aberta)
+            self._offsets.append(self._offsets[-1] + self._tamanho_aberta)
+            self._aberta = None
+            self._tamanho_aberta = 0
+
+    def fechar(self):
+        """Grava offsets, metadados e cabeçalho. Retorna o caminho do arquivo."""
+        if self._arquivo.closed:
+            return self.caminho
+        self.encerrar_sequencia()
+        n_observacoes = self._offsets[-1]
+        pos_offsets = TAMANHO_CABECALHO + n_observacoes
+        pos_offsets += -pos_offsets % 8
+        self._arquivo.write(b'\x00' * (pos_offsets - TAMANHO_CABECALHO - n_observacoes))
+        self._arquivo.write(np.asarray(self._offsets, dtype='<i8').tobytes())
+
+        meta = json.dumps({'observacoes': self.observacoes, 'robos': self.robos},
+                          ensure_ascii=False).encode('utf-8')
+        pos_meta = pos_offsets + 8 * len(self._offsets)
+        self._arquivo.write(meta)
+
+        self._arquivo.seek(0)
+        self._arquivo.write(struct.pack(_FORMATO_CABECALHO, MAGICO, VERSAO, n_observacoes,
+                                        len(self.robos), pos_offsets, pos_meta, len(meta)))
+        self._arquivo.close()
+        return self.caminho
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastreio):
+        if tipo is None:
+            self.fechar()
+        else:
+            # Conversão interrompida: não deixa um arquivo sem cabeçalho válido para trás
+            self._arquivo.close()
+            os.remove(self.caminho)
+
+
+class LogFrota:
+    """
+    Leitura de um .hmmlog por mapeamento de memória (zero cópia):
+      dados   -> np.memmap uint8 com todas as observações concatenadas
+      offsets -> np.memmap int64 (N+1,), a sequência i é dados[offsets[i]:offsets[i+1]]
+      robos   -> id do robô de cada sequência
+
+    'dados' e 'offsets' podem ir direto para viterbi_lote /
+    forward_backward_lote (offsets=...); blocos() fatia a frota para o
+    treino em streaming sem copiar as observações.
+    """
+
+    def __init__(self, caminho, observacoes=None):
+        with open(caminho, 'rb') as arquivo:
+            cabecalho = arquivo.read(TAMANHO_CABECALHO)
+            if len(cabecalho) < TAMANHO_CABECALHO or cabecalho[:len(MAGICO)] != MAGICO:
+                raise ValueError(f"'{caminho}' não é um arquivo .hmmlog")
+            (_, versao, n_observacoes, n_sequencias, pos_offsets, pos_meta,
+             tam_meta) = struct.unpack_from(_FORMATO_CABECALHO, cabecalho)
+            if versao != VERSAO:
+                raise ValueError(f"Versão {versao} do .hmmlog não suportada (esperado {VERSAO})")
+            arquivo.seek(pos_meta)
+            meta = json.loads(arquivo.read(tam_meta).decode('utf-8'))
+
+        self.caminho = caminho
+        self.observacoes = meta['observacoes']
+        self.robos = meta['robos']
+        # np.memmap não aceita shape vazio: log sem observações vira um array comum
+        if n_observacoes > 0:
+            self.dados = np.memmap(caminho, dtype=np.uint8, mode='r',
+                                   offset=TAMANHO_CABECALHO, shape=(n_observacoes,))
+        else:
+            self.dados = np.empty(0, dtype=np.uint8)
+        self.offsets = np.memmap(caminho, dtype='<i8', mode='r', offset=pos_offsets,
+                                 shape=(n_sequencias + 1,))
+        if observacoes is not None:
+            self.verificar_observacoes(observacoes)
+
+    def verificar_observacoes(self, observacoes):
+        """Garante que a tabela de símbolos do arquivo é a mesma do modelo."""
+        observacoes = [str(o) for o in observacoes]
+        if observacoes != self.observacoes:
+            raise ValueError(f"Tabela de símbolos do log {self.observacoes} difere da do modelo {observacoes}")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def n_observacoes(self):
+        return len(self.dados)
+
+    def sequencia(self, i):
+        """Visão (sem cópia) da i-ésima sequência."""
+        return self.dados[self.offsets[i]:self.offsets[i + 1]]
+
+    def sequencias_do_robo(self, robo):
+        """Índices das sequências (sessões) do robô 'robo'."""
+        return [i for i, r in enumerate(self.robos) if r == str(robo)]
+
+    def blocos(self, observacoes_por_bloco=OBSERVACOES_POR_BLOCO):
+        """
+        Gera (buffer, offsets) com ~observacoes_por_bloco observações cada:
+        buffer é uma visão do memmap e offsets começa em 0, no formato
+        esperado por hmm_treino e pelas rotinas *_lote.
+        """
+        N = len(self)
+        i = 0
+        while i < N:
+            # Última sequência que ainda cabe no bloco (sempre pelo menos uma)
+            limite = self.offsets[i] + observacoes_por_bloco
+            j = max(i + 1, int(np.searchsorted(self.offsets, limite, side='right')) - 1)
+            j = min(j, N)
+            offsets = np.asarray(self.offsets[i:j + 1], dtype=np.intp)
+            yield self.dados[offsets[0]:offsets[-1]], offsets - offsets[0]
+            i = j
+
+
+def _gravar_linhas(escritor, robos, nomes):
+    # Quebra o lote de linhas em trechos consecutivos do mesmo robô
+    obs = escritor.codificar(nomes)
+    quebras = [k for k in range(1, len(robos)) if robos[k] != robos[k - 1]]
+    for inicio, fim in zip([0] + quebras, quebras + [len(robos)]):
+        escritor.adicionar_parcial(robos[inicio], obs[inicio:fim])
+
+
+def converter_csv(caminho_csv, destino, observacoes, coluna_robo='robo', coluna_obs='observacao',
+                  delimitador=','):
+    """
+    Converte um CSV com uma linha por observação (colunas 'coluna_robo' e
+    'coluna_obs', demais colunas ignoradas) em um .hmmlog, em streaming.
+    Linhas consecutivas do mesmo robô formam uma sequência; se o robô
+    reaparecer mais adiante, o novo trecho vira outra sequência (sessão).
+    Retorna um LogFrota aberto sobre o arquivo gerado.
+    """
+    with open(caminho_csv, newline='', encoding='utf-8') as entrada, \
+            EscritorLog(destino, observacoes) as escritor:
+        leitor = csv.reader(entrada, delimiter=delimitador)
+        cabecalho = next(leitor, None)
+        if cabecalho is None or coluna_robo not in cabecalho or coluna_obs not in cabecalho:
+            raise ValueError(f"O CSV deve ter as colunas '{coluna_robo}' e '{coluna_obs}', recebido {cabecalho}")
+        i_robo, i_obs = cabecalho.index(coluna_robo), cabecalho.index(coluna_obs)
+
+        robos, nomes = [], []
+        for linha in leitor:
+            if not linha:
+                continue
+            robos.append(linha[i_robo])
+            nomes.append(linha[i_obs].strip())
+            if len(nomes) >= LINHAS_POR_LOTE:
+                _gravar_linhas(escritor, robos, nomes)
+                robos, nomes = [], []
+        if nomes:
+            _gravar_linhas(escritor, robos, nomes)
+    return LogFrota(destino)
+
+
+def converter_textos(caminhos, destino, observacoes):
+    """
+    Converte arquivos de texto (um por robô, observações separadas por
+    espaço ou quebra de linha) em um .hmmlog. O id do robô é o nome do
+    arquivo sem extensão. Retorna um LogFrota aberto sobre o arquivo gerado.
+    """
+    with EscritorLog(destino, observacoes) as escritor:
+        for caminho in caminhos:
+            robo = os.path.splitext(os.path.basename(caminho))[0]
+            with open(caminho, encoding='utf-8') as entrada:
+                nomes = []
+                for linha in entrada:
+                    nomes.extend(linha.split())
+                    if len(nomes) >= LINHAS_POR_LOTE:
+                        escritor.adicionar_parcial(robo, escritor.codificar(nomes))
+                        nomes = []
+                escritor.adicionar_parcial(robo, escritor.codificar(nomes))
+            escritor.encerrar_sequencia()
+    return LogFrota(destino)
@@ -0,0 +1,283 @@
+# --- MODELO HMM GENÉRICO E CONFIGURÁVEL ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Um HMM discreto descrito por arquivo (JSON ou NPZ): nomes dos estados e
+# das observações, pi, A e B. Os mapas nome -> índice e as matrizes em log
+# são calculados uma única vez no construtor, então os caminhos quentes
+# (Viterbi, forward-backward, treino) só trabalham com índices inteiros.
+# O RoboHMM passa a ser apenas uma configuração (robo_hmm.json).
+# Os módulos de recursos (cache, logs, treino, online, K-melhores...)
+# são importados dentro dos métodos que os usam: quem só decodifica não
+# paga a importação deles na partida.
+# -----------------------------------------------------------------
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from hmm_esparso import TransicoesCSR, escolher_motor, forward_esparso, viterbi_esparso
+from hmm_nucleo import (OBSERVACOES_POR_BLOCO, forward, forward_backward, forward_backward_lote, log_seguro,
+                        viterbi_checkpoint, viterbi_log, viterbi_lote, viterbi_memmap)
+
+# Configuração do robô aspirador (Limpando/Preso/Base x Normal/Colisao/EmEspera)
+CAMINHO_ROBO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'robo_hmm.json')
+
+CHAVES_MODELO = ('estados', 'observacoes', 'pi', 'A', 'B')
+
+
+def ler_configuracao(caminho):
+    """
+    Lê um modelo salvo em JSON ou NPZ (mesmo formato do hmm_treino.salvar_modelo)
+    e devolve um dicionário com as chaves de CHAVES_MODELO.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.json':
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+    elif extensao == '.npz':
+        with np.load(caminho) as arquivo:
+            dados = {chave: arquivo[chave] for chave in arquivo.files}
+        dados['estados'] = [str(e) for e in dados['estados']]
+        dados['observacoes'] = [str(o) for o in dados['observacoes']]
+    else:
+        raise ValueError(f"Formato de modelo não suportado: '{extensao}' (use .json ou .npz)")
+
+    faltando = [chave for chave in CHAVES_MODELO if chave not in dados]
+    if faltando:
+        raise ValueError(f"Arquivo de modelo '{caminho}' sem as chaves: {faltando}")
+    return {chave: dados[chave] for chave in CHAVES_MODELO}
+
+
+class ModeloHMM:
+    """
+    HMM discreto genérico. Os métodos aceitam sequências de nomes de
+    observação (strings) e devolvem nomes de estados; as versões *_lote
+    trabalham direto com arrays de índices (ver hmm_nucleo).
+    """
+
+    def __init__(self, estados, observacoes, pi, A, B):
+        self.estados = [str(e) for e in estados]
+        self.observacoes = [str(o) for o in observacoes]
+        self.n_estados = len(self.estados)
+        self.n_observacoes = len(self.observacoes)
+
+        # Mapas nome -> índice, montados uma vez só
+        self.mapa_estados = {estado: i for i, estado in enumerate(self.estados)}
+        self.mapa_obs = {obs: i for i, obs in enumerate(self.observacoes)}
+
+        self.definir_parametros(pi, A, B)
+
+    def definir_parametros(self, pi, A, B):
+        """Valida e instala novos (pi, A, B), recalculando as versões em log."""
+        pi = np.asarray(pi, dtype=np.float64)
+        A = np.asarray(A, dtype=np.float64)
+        B = np.asarray(B, dtype=np.float64)
+        S, M = self.n_estados, self.n_observacoes
+        if pi.shape != (S,) or A.shape != (S, S) or B.shape != (S, M):
+            raise ValueError(f"Shapes inválidos: pi {pi.shape}, A {A.shape}, B {B.shape} "
+                             f"para {S} estados e {M} observações")
+        for nome, matriz in (('pi', pi), ('A', A), ('B', B)):
+            if np.any(matriz < 0) or not np.allclose(matriz.sum(axis=-1), 1.0):
+                raise ValueError(f"'{nome}' deve ser não-negativa e cada linha deve somar 1")
+
+        self.pi, self.A, self.B = pi, A, B
+        self.log_pi = log_seguro(pi)
+        self.log_A = log_seguro(A)
+        self.log_B = log_seguro(B)
+        # Estado que melhor explica cada observação isolada (diagnóstico ingênuo)
+        self._estado_ingenuo = np.argmax(B, axis=0)
+        # Motor do Viterbi (e do forward do k_melhores) escolhido pela densidade de A (ver hmm_esparso)
+        self.motor = escolher_motor(A)
+        self._csr = TransicoesCSR(A) if self.motor == 'esparso' else None
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Cria o modelo a partir de um arquivo .json ou .npz."""
+        return cls(**ler_configuracao(caminho))
+
+    def salvar(self, caminho):
+        """Salva o modelo em .json (legível) ou .npz (compacto)."""
+        if caminho.lower().endswith('.json'):
+            dados = {
+                'estados': self.estados, 'observacoes': self.observacoes,
+                'pi': self.pi.tolist(), 'A': self.A.tolist(), 'B': self.B.tolist(),
+            }
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+        else:
+            from hmm_treino import salvar_modelo
+            salvar_modelo(caminho, self.pi, self.A, self.B, self.estados, self.observacoes)
+
+    def impressao_digital(self):
+        """
+        Hash (hex) dos nomes e dos parâmetros: muda sempre que o modelo muda,
+        então serve de chave para caches de resultados.
+        """
+        resumo = hashlib.sha256(json.dumps([self.estados, self.observacoes]).encode('utf-8'))
+        for matriz in (self.pi, self.A, self.B):
+            resumo.update(np.ascontiguousarray(matriz).tobytes())
+        return resumo.hexdigest()
+
+    # --- Conversão nomes <-> índices ---
+
+    def codificar(self, sequencia_obs):
+        """Sequência de nomes de observação -> array de índices (uint8 quando couber)."""
+        dtype = np.uint8 if self.n_observacoes <= 256 else np.intp
+        try:
+            return np.fromiter((self.mapa_obs[o] for o in sequencia_obs), dtype=dtype,
+                               count=len(sequencia_obs))
+        except KeyError as erro:
+            raise ValueError(f"Observação desconhecida {erro} (esperado uma de {self.observacoes})") from None
+
+    def nomes_estados(self, indices):
+        """Array de índices de estado -> lista de nomes."""
+        return [self.estados[i] for i in indices]
+
+    # --- Inferência ---
+
+    def diagnostico_ingenuo(self, sequencia_obs):
+        """
+        Baseline: Ignora TUDO, olha só P(obs|estado)
+        (Isso é errado em geral!)
+        """
+        return self.nomes_estados(self._estado_ingenuo[self.codificar(sequencia_obs)])
+
+    def viterbi(self, sequencia_obs):
+        """
+        Algoritmo de Viterbi em log-espaço: sequência de estados mais provável
+        (nomes) e a trellis log(delta) de shape (T, S).
+        """
+        caminho, _, log_delta = self._viterbi(self.codificar(sequencia_obs), retornar_delta=True)
+        return self.nomes_estados(caminho), log_delta
+
+    def viterbi_indices(self, obs, memoria='completa'):
+        """
+        Viterbi direto sobre índices: (caminho (T,), log-probabilidade do caminho).
+        memoria='checkpoint' ou 'memmap' limita o pico de memória em logs muito
+        longos (ver hmm_nucleo.viterbi_checkpoint / viterbi_memmap).
+        """
+        if memoria == 'checkpoint':
+            return viterbi_checkpoint(self.log_pi, self.log_A, self.log_B, obs)
+        if memoria == 'memmap':
+            return viterbi_memmap(self.log_pi, self.log_A, self.log_B, obs)
+        if memoria != 'completa':
+            raise ValueError(f"memoria deve ser 'completa', 'checkpoint' ou 'memmap', recebido '{memoria}'")
+        caminho, log_prob, _ = self._viterbi(obs)
+        return caminho, log_prob
+
+    def _viterbi(self, obs, retornar_delta=False):
+        if self.motor == 'esparso':
+            return viterbi_esparso(self.log_pi, self._csr, self.log_B, obs, retornar_delta)
+        return viterbi_log(self.log_pi, self.log_A, self.log_B, obs, retornar_delta)
+
+    def k_melhores(self, sequencia_obs, K=5):
+        """
+        Os K diagnósticos (caminhos) mais prováveis: lista de
+        (nomes dos estados, log-probabilidade, P(caminho | logs)).
+        Lista vazia se a sequência é impossível para o modelo (P(logs) = 0).
+        """
+        from hmm_kmelhores import confianca_caminhos, viterbi_k_melhores
+
+        obs = self.codificar(sequencia_obs)
+        if self.motor == 'esparso':
+            log_veross, _ = forward_esparso(self.pi, self._csr, self.B, obs)
+        else:
+            log_veross, _ = forward(self.pi, self.A, self.B, obs)
+        if not np.isfinite(log_veross):
+            return []
+        caminhos, log_probs = viterbi_k_melhores(self.log_pi, self.log_A, self.log_B, obs, K)
+        confiancas = confianca_caminhos(log_probs, log_veross)
+        return [(self.nomes_estados(caminho), float(lp), float(c))
+                for caminho, lp, c in zip(caminhos, log_probs, confiancas)]
+
+    def viterbi_lote(self, obs, comprimentos=None, offsets=None):
+        """Viterbi em lote sobre índices (ver hmm_nucleo.viterbi_lote)."""
+        return viterbi_lote(self.log_pi, self.log_A, self.log_B, obs,
+                            comprimentos=comprimentos, offsets=offsets)
+
+    def posteriores(self, sequencia_obs, estados_saida=None):
+        """
+        Forward-backward: P(estado_t | todos os logs) em cada instante e a
+        log-verossimilhança da sequência (útil como score de anomalia).
+        """
+        return forward_backward(self.pi, self.A, self.B, self.codificar(sequencia_obs),
+                                estados_saida=estados_saida)
+
+    def posteriores_lote(self, obs, comprimentos=None, offsets=None, estados_saida=None):
+        """Forward-backward em lote sobre índices (ver hmm_nucleo.forward_backward_lote)."""
+        return forward_backward_lote(self.pi, self.A, self.B, obs, comprimentos=comprimentos,
+                                     offsets=offsets, estados_saida=estados_saida)
+
+    def decodificador_online(self, atraso_max=50, estado_alerta=None, limiar_filtro=None):
+        """
+        Decodificador para logs que chegam aos poucos (ver hmm_online).
+        'estado_alerta' pode ser o nome do estado (ex.: 'Preso').
+        """
+        from hmm_online import DecodificadorOnline
+
+        if isinstance(estado_alerta, str):
+            estado_alerta = self.mapa_estados[estado_alerta]
+        return DecodificadorOnline(self.pi, self.A, self.B, atraso_max=atraso_max,
+                                   estado_alerta=estado_alerta, limiar_filtro=limiar_filtro)
+
+    def cache_viterbi(self, limite_bytes=None, motor='padrao'):
+        """
+        Viterbi memoizado por janela de observações, com LRU e orçamento em
+        bytes (None = hmm_cache.LIMITE_BYTES); motor='runs' para logs com
+        corridas longas.
+        """
+        from hmm_cache import LIMITE_BYTES, CacheViterbi
+
+        if limite_bytes is None:
+            limite_bytes = LIMITE_BYTES
+        return CacheViterbi(self, limite_bytes=limite_bytes, motor=motor)
+
+    def decodificador_runs(self):
+        """Viterbi por potências (max, +) para logs em corridas (ver hmm_cache)."""
+        from hmm_cache import DecodificadorRuns
+
+        return DecodificadorRuns(self.log_pi, self.log_A, self.log_B)
+
+    def abrir_log(self, caminho):
+        """Abre um .hmmlog (ver hmm_logs) conferindo a tabela de símbolos."""
+        from hmm_logs import LogFrota
+
+        return LogFrota(caminho, observacoes=self.observacoes)
+
+    def decodificador_incremental(self, estado_salvo=None, atraso_max=None):
+        """
+        Viterbi retomável para logs enviados em partes (ver hmm_incremental);
+        'estado_salvo' são os bytes de um DecodificadorIncremental.serializar().
+        """
+        from hmm_incremental import DecodificadorIncremental
+
+        if estado_salvo is not None:
+            return DecodificadorIncremental.retomar(estado_salvo, self.pi, self.A, self.B)
+        return DecodificadorIncremental(self.pi, self.A, self.B, atraso_max=atraso_max)
+
+    def treinar(self, logs, caminho_saida=None, **opcoes):
+        """
+        Ajusta pi, A e B por Baum-Welch a partir de logs sem rótulo
+        (lista de listas de nomes, ou um LogFrota), partindo dos parâmetros atuais.
+        Opções extras vão para hmm_treino.treinar_baum_welch.
+        """
+        from hmm_logs import LogFrota
+        from hmm_treino import salvar_modelo, treinar_baum_welch
+
+        if isinstance(logs, LogFrota):
+            logs.verificar_observacoes(self.observacoes)
+            por_bloco = opcoes.pop('observacoes_por_bloco', OBSERVACOES_POR_BLOCO)
+
+            def fonte():
+                # Relê o memmap a cada iteração, bloco a bloco
+                return logs.blocos(por_bloco)
+        else:
+            fonte = [self.codificar(log) for log in logs]
+        pi, A, B, historico = treinar_baum_welch(fonte, self.pi, self.A, self.B, **opcoes)
+        self.definir_parametros(pi, A, B)
+        if caminho_saida is not None:
+            salvar_modelo(caminho_saida, self.pi, self.A, self.B, self.estados, self.observacoes, historico)
+        return historico
@@ -0,0 +1,497 @@
+# --- NÚCLEO NUMÉRICO DO HMM (somente NumPy) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Rotinas de inferência usadas pelo RoboHMM. O Viterbi trabalha em
+# espaço logarítmico (somas no lugar de produtos), então não sofre
+# underflow mesmo em logs com milhões de passos, e cada passo de tempo
+# é uma única operação (S, S) vetorizada sobre todos os estados.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+# Quantidade de passos cujas emissões log B[:, obs[t]] são montadas de uma vez.
+# Limita a memória temporária em sequências muito longas (10^7 passos).
+TAMANHO_BLOCO = 65536
+
+# Observações (somando todas as sequências) por bloco ragged lido de uma
+# vez: blocos do passo E do hmm_treino e LogFrota.blocos do hmm_logs.
+OBSERVACOES_POR_BLOCO = 1_000_000
+
+
+def log_seguro(x):
+    """Logaritmo natural que devolve -inf para probabilidades nulas, sem avisos."""
+    with np.errstate(divide='ignore'):
+        return np.log(np.asarray(x, dtype=np.float64))
+
+
+def normalizar_log(log_matriz):
+    """
+    Converte uma matriz de log-probabilidades (T, S) em probabilidades
+    normalizadas por linha (cada passo de tempo soma 1).
+    """
+    log_matriz = np.asarray(log_matriz, dtype=np.float64)
+    maximo = np.max(log_matriz, axis=-1, keepdims=True)
+    maximo = np.where(np.isfinite(maximo), maximo, 0.0)
+    prob = np.exp(log_matriz - maximo)
+    return prob / np.sum(prob, axis=-1, keepdims=True)
+
+
+def menor_dtype_inteiro(n_valores):
+    """Menor dtype inteiro sem sinal capaz de guardar os índices 0..n_valores-1."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_valores - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+def validar_observacoes(obs, n_observacoes):
+    """Converte a sequência para um array 1-D de índices e verifica os limites."""
+    obs = np.asarray(obs)
+    if obs.ndim != 1:
+        raise ValueError(f"A sequência de observações deve ser 1-D, recebido shape {obs.shape}")
+    if len(obs) == 0:
+        raise ValueError("A sequência de observações está vazia")
+    if not np.issubdtype(obs.dtype, np.integer):
+        raise ValueError(f"As observações devem ser índices inteiros, recebido dtype {obs.dtype}")
+    if obs.min() < 0 or obs.max() >= n_observacoes:
+        raise ValueError(f"Índice de observação fora do intervalo [0, {n_observacoes})")
+    return obs
+
+
+def _recursao_viterbi(delta, log_A, log_B_T, obs, t_ini, t_fim, psi=None, psi_base=0,
+                      delta_saida=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Executa os passos t_ini..t_fim-1 (t_ini >= 1) da recursão do Viterbi a
+    partir de 'delta' (instante t_ini-1) e devolve o delta de t_fim-1.
+    Emissões montadas em blocos; backpointers do passo t vão para
+    psi[t - psi_base] quando psi é dado.
+    """
+    S = len(delta)
+    candidatos = np.empty((S, S))
+    for ini in range(t_ini, t_fim, tamanho_bloco):
+        emissoes = log_B_T[obs[ini:min(ini + tamanho_bloco, t_fim)]]
+        for k in range(len(emissoes)):
+            # candidatos[i, j] = delta[i] + log A[i, j] para todos os pares (i, j)
+            np.add(delta[:, None], log_A, out=candidatos)
+            if psi is not None:
+                psi[ini + k - psi_base] = candidatos.argmax(axis=0)
+            delta = candidatos.max(axis=0)
+            delta += emissoes[k]
+            if delta_saida is not None:
+                delta_saida[ini + k] = delta
+    return delta
+
+
+def _backtracking(psi, psi_base, caminho, t_ini, t_fim):
+    """Preenche caminho[t_ini:t_fim] a partir de caminho[t_fim] seguindo psi."""
+    estado = int(caminho[t_fim])
+    for t in range(t_fim, t_ini, -1):
+        estado = psi[t - psi_base, estado]
+        caminho[t-1] = estado
+
+
+def viterbi_log(log_pi, log_A, log_B, obs, retornar_delta=False, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Algoritmo de Viterbi em espaço logarítmico.
+
+    Recebe os parâmetros já em log (log_pi: (S,), log_A: (S, S), log_B: (S, M))
+    e a sequência de observações como índices inteiros (T,).
+    Retorna (caminho, log_prob, delta): o caminho de estados mais provável
+    (T,), a log-probabilidade conjunta desse caminho e a trellis log-delta
+    (T, S), esta última apenas quando retornar_delta=True (senão None).
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+
+    T = len(obs)
+    S = len(log_pi)
+
+    # Backpointers no menor inteiro que comporta S estados (uint8 para o RoboHMM)
+    psi = np.zeros((T, S), dtype=menor_dtype_inteiro(S))
+    delta_completo = np.empty((T, S)) if retornar_delta else None
+
+    # --- PASSO 1: Inicialização (t=0) ---
+    delta = log_pi + log_B_T[obs[0]]
+    if retornar_delta:
+        delta_completo[0] = delta
+
+    # --- PASSO 2: Recursão (t=1 a T-1) ---
+    delta = _recursao_viterbi(delta, log_A, log_B_T, obs, 1, T, psi, 0, delta_completo, tamanho_bloco)
+
+    # --- PASSO 3: Terminação ---
+    caminho = np.empty(T, dtype=np.intp)
+    caminho[T-1] = np.argmax(delta)
+    log_prob = float(delta[caminho[T-1]])
+
+    # --- PASSO 4: Backtracking ---
+    _backtracking(psi, 0, caminho, 0, T-1)
+
+    return caminho, log_prob, delta_completo
+
+
+def viterbi_checkpoint(log_pi, log_A, log_B, obs, passo=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Viterbi com memória limitada para logs muito longos.
+
+    Em vez da tabela psi (T, S), guarda só o delta a cada 'passo' instantes
+    (padrão: ~sqrt(T)). No backtracking, cada segmento é recalculado a partir
+    do seu checkpoint — uma segunda passada forward no total — e só os
+    backpointers desse segmento ficam na memória. Pico de memória
+    O(sqrt(T) * S) além do próprio caminho, que sai no menor dtype possível.
+    Retorna (caminho, log_prob), com o mesmo resultado de viterbi_log.
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    T = len(obs)
+    S = len(log_pi)
+    if passo is None:
+        passo = max(1, int(np.ceil(np.sqrt(T))))
+
+    # --- PASSO 1: Forward guardando apenas os checkpoints de delta ---
+    checkpoints = {0: log_pi + log_B_T[obs[0]]}
+    delta = checkpoints[0]
+    for t0 in range(0, T - 1, passo):
+        t1 = min(t0 + passo, T - 1)
+        delta = _recursao_viterbi(delta, log_A, log_B_T, obs, t0 + 1, t1 + 1, tamanho_bloco=tamanho_bloco)
+        if t1 < T - 1:
+            checkpoints[t1] = delta
+
+    # --- PASSO 2: Terminação ---
+    caminho = np.empty(T, dtype=menor_dtype_inteiro(S))
+    caminho[T-1] = np.argmax(delta)
+    log_prob = float(delta[caminho[T-1]])
+
+    # --- PASSO 3: Backtracking por segmentos, do fim para o começo ---
+    # O segmento que começa em t0 recalcula psi[t0+1..t1] e devolve caminho[t0..t1-1]
+    psi = np.empty((passo, S), dtype=menor_dtype_inteiro(S))
+    for t0 in sorted(checkpoints, reverse=True):
+        t1 = min(t0 + passo, T - 1)
+        _recursao_viterbi(checkpoints.pop(t0), log_A, log_B_T, obs, t0 + 1, t1 + 1,
+                          psi, t0 + 1, tamanho_bloco=tamanho_bloco)
+        _backtracking(psi, t0 + 1, caminho, t0, t1)
+    return caminho, log_prob
+
+
+def viterbi_memmap(log_pi, log_A, log_B, obs, diretorio=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Viterbi com os backpointers despejados em um arquivo temporário
+    (np.memmap) em vez da RAM: uma única passada forward, sem recomputação,
+    e o sistema operacional pagina a tabela psi conforme o backtracking
+    anda. 'diretorio' escolhe onde o arquivo é criado (padrão: o do sistema).
+    Retorna (caminho, log_prob), com o mesmo resultado de viterbi_log.
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    T = len(obs)
+    S = len(log_pi)
+
+    import tempfile  # só este motor usa arquivo; fora do caminho de importação do núcleo
+
+    with tempfile.TemporaryFile(dir=diretorio) as arquivo:
+        psi = np.memmap(arquivo, dtype=menor_dtype_inteiro(S), mode='w+', shape=(T, S))
+        delta = log_pi + log_B_T[obs[0]]
+        delta = _recursao_viterbi(delta, log_A, log_B_T, obs, 1, T, psi, 0, tamanho_bloco=tamanho_bloco)
+
+        caminho = np.empty(T, dtype=menor_dtype_inteiro(S))
+        caminho[T-1] = np.argmax(delta)
+        log_prob = float(delta[caminho[T-1]])
+        _backtracking(psi, 0, caminho, 0, T-1)
+        del psi
+    return caminho, log_prob
+
+
+def menor_dtype_com_sinal(n_valores):
+    """Menor dtype inteiro com sinal para 0..n_valores-1 mais o marcador -1 (int8 para o RoboHMM)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_valores - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def preparar_lote(obs, comprimentos=None, offsets=None, n_observacoes=None):
+    """
+    Normaliza as duas formas de lote aceitas pelas rotinas *_lote:
+      - obs (N, T) preenchido à direita + comprimentos (N,);
+      - obs 1-D concatenado (ragged) + offsets (N+1,) no estilo CSR,
+        em que a sequência i ocupa obs[offsets[i]:offsets[i+1]].
+    Retorna (buffer 1-D, inicios (N,), comprimentos (N,)) sem copiar obs
+    sempre que ele já for contíguo (inclusive np.memmap). Se n_observacoes
+    for informado, verifica os índices apenas nas posições válidas.
+    """
+    obs = np.asarray(obs)
+    if (comprimentos is None) == (offsets is None):
+        raise ValueError("Informe exatamente um entre 'comprimentos' (lote preenchido) e 'offsets' (lote ragged)")
+    if not np.issubdtype(obs.dtype, np.integer):
+        raise ValueError(f"As observações devem ser índices inteiros, recebido dtype {obs.dtype}")
+
+    if comprimentos is not None:
+        if obs.ndim != 2:
+            raise ValueError(f"Lote preenchido deve ter shape (N, T), recebido {obs.shape}")
+        N, T = obs.shape
+        comprimentos = np.asarray(comprimentos, dtype=np.intp)
+        if comprimentos.shape != (N,):
+            raise ValueError(f"'comprimentos' deve ter shape ({N},), recebido {comprimentos.shape}")
+        if np.any(comprimentos < 0) or np.any(comprimentos > T):
+            raise ValueError(f"Comprimentos devem estar em [0, {T}]")
+        validos = obs[np.arange(T) < comprimentos[:, None]] if n_observacoes is not None else None
+        buffer = obs.reshape(-1)
+        inicios = np.arange(N, dtype=np.intp) * T
+    else:
+        if obs.ndim != 1:
+            raise ValueError(f"Lote ragged deve ser 1-D, recebido shape {obs.shape}")
+        offsets = np.asarray(offsets, dtype=np.intp)
+        if offsets.ndim != 1 or len(offsets) < 1:
+            raise ValueError("'offsets' deve ser 1-D com N+1 posições")
+        comprimentos = np.diff(offsets)
+        if np.any(comprimentos < 0) or offsets[0] < 0 or offsets[-1] > len(obs):
+            raise ValueError("'offsets' deve ser não-decrescente e caber no buffer")
+        # Com offsets CSR as sequências cobrem exatamente obs[offsets[0]:offsets[-1]]
+        validos = obs[offsets[0]:offsets[-1]]
+        buffer = obs
+        inicios = offsets[:-1]
+
+    if n_observacoes is not None and len(validos) > 0:
+        if validos.min() < 0 or validos.max() >= n_observacoes:
+            raise ValueError(f"Índice de observação fora do intervalo [0, {n_observacoes})")
+    return buffer, inicios, comprimentos
+
+
+def _ordenar_lote(comprimentos):
+    """
+    Ordena as sequências por comprimento decrescente. Assim, no passo t as
+    sequências ainda ativas formam um prefixo [0:ativos[t]] e cada passo do
+    laço de tempo opera sobre uma fatia contígua, sem máscaras.
+    """
+    ordem = np.argsort(-comprimentos, kind='stable')
+    comprimentos_ord = comprimentos[ordem]
+    T_max = int(comprimentos_ord[0]) if len(ordem) else 0
+    ativos = np.searchsorted(-comprimentos_ord, -np.arange(T_max + 1), side='left')
+    return ordem, T_max, ativos
+
+
+def viterbi_lote(log_pi, log_A, log_B, obs, comprimentos=None, offsets=None):
+    """
+    Viterbi em log-espaço para um lote de sequências, em uma única passada
+    vetorizada sobre o tempo (cada passo é um max/argmax (k, S, S) sobre
+    as k sequências ainda ativas).
+
+    Aceita um lote preenchido (N, T) + comprimentos ou um buffer concatenado
+    + offsets (ver preparar_lote). Retorna (caminhos, log_probs):
+      - caminhos no menor dtype com sinal (int8 até 127 estados), com o mesmo
+        layout da entrada — (N, T) com -1 no preenchimento, ou 1-D alinhado
+        ao buffer ragged;
+      - log_probs (N,) com a log-probabilidade do melhor caminho
+        (-inf para sequências vazias).
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    formato = np.shape(obs)
+    buffer, inicios, comprimentos = preparar_lote(obs, comprimentos, offsets, log_B_T.shape[0])
+
+    N = len(comprimentos)
+    S = len(log_pi)
+    ordem, T_max, ativos = _ordenar_lote(comprimentos)
+    inicios_ord = inicios[ordem]
+
+    caminhos = np.full(len(buffer), -1, dtype=menor_dtype_com_sinal(S))
+    log_probs_ord = np.full(N, -np.inf)
+
+    if T_max > 0:
+        # Backpointers compactados: no passo t só há linhas para as ativos[t] sequências ativas
+        base = np.concatenate(([0], np.cumsum(ativos[1:T_max])))
+        psi = np.empty((base[-1], S), dtype=menor_dtype_inteiro(S))
+        candidatos = np.empty((ativos[0], S, S))
+
+        # --- PASSO 1: Inicialização (t=0); sequências vazias ficam em -inf ---
+        delta = np.full((N, S), -np.inf)
+        delta[:ativos[0]] = log_pi + log_B_T[buffer[inicios_ord[:ativos[0]]]]
+
+        # --- PASSO 2: Recursão, um único passo vetorizado por instante ---
+        for t in range(1, T_max):
+            k = ativos[t]
+            cand = candidatos[:k]
+            np.add(delta[:k, :, None], log_A, out=cand)
+            psi[base[t-1]:base[t]] = cand.argmax(axis=1)
+            delta[:k] = cand.max(axis=1) + log_B_T[buffer[inicios_ord[:k] + t]]
+
+        # --- PASSO 3: Terminação ---
+        estado_final = delta.argmax(axis=1)
+        log_probs_ord[:] = delta[np.arange(len(delta)), estado_final]
+
+        # --- PASSO 4: Backtracking vetorizado ---
+        estado = np.empty(ativos[0], dtype=np.intp)
+        for t in range(T_max - 1, -1, -1):
+            k, k_seguinte = ativos[t], ativos[t+1]
+            # Sequências que terminam em t começam o backtracking pelo estado final
+            estado[k_seguinte:k] = estado_final[k_seguinte:k]
+            caminhos[inicios_ord[:k] + t] = estado[:k]
+            if t > 0:
+                estado[:k] = psi[base[t-1] + np.arange(k), estado[:k]]
+
+    log_probs = np.empty(N)
+    log_probs[ordem] = log_probs_ord
+    if len(formato) == 2:
+        caminhos = caminhos.reshape(formato)
+    return caminhos, log_probs
+
+
+def forward_backward_lote(pi, A, B, obs, comprimentos=None, offsets=None,
+                          estados_saida=None, passo_checkpoint=None, estatisticas=None):
+    """
+    Forward-backward escalonado (Rabiner) para um lote de sequências,
+    vetorizado sobre estados e sobre as sequências ativas em cada passo.
+
+    Recebe os parâmetros em probabilidade linear (pi, A, B) e o lote nas
+    mesmas formas de viterbi_lote. Cada alpha_t é normalizado pelo fator
+    c_t, então log P(O) = sum(log c_t) não sofre underflow.
+
+    Para não guardar a tabela (T, S) inteira do forward, só os alphas de
+    cada passo_checkpoint instantes são mantidos (padrão: ~sqrt(T_max)); na
+    passada backward cada segmento é recalculado a partir do seu checkpoint.
+
+    estados_saida escolhe as colunas devolvidas: None (todos os estados),
+    um índice (ex.: 1 = Preso, devolve só essa coluna) ou uma lista
+    (lista vazia evita alocar a saída, útil no treinamento).
+
+    Se 'estatisticas' for um dicionário com os arrays 'inicial' (S,),
+    'transicoes' (S, S) e 'emissoes' (S, M), as contagens esperadas do
+    passo E do Baum-Welch são somadas neles (ver hmm_treino).
+    Retorna (posteriores, log_verossimilhancas):
+      - posteriores P(estado_t | O) com o layout da entrada — (N, T, ...)
+        com NaN no preenchimento, ou (len(buffer), ...) alinhado ao ragged;
+      - log_verossimilhancas (N,) com log P(O) (0.0 para sequências vazias,
+        -inf se alguma observação for impossível no modelo).
+    """
+    pi = np.asarray(pi, dtype=np.float64)
+    A = np.asarray(A, dtype=np.float64)
+    B_T = np.ascontiguousarray(np.asarray(B, dtype=np.float64).T)
+    formato = np.shape(obs)
+    buffer, inicios, comprimentos = preparar_lote(obs, comprimentos, offsets, B_T.shape[0])
+
+    N = len(comprimentos)
+    S = len(pi)
+    colunas = np.arange(S) if estados_saida is None else np.atleast_1d(np.asarray(estados_saida, dtype=np.intp))
+    ordem, T_max, ativos = _ordenar_lote(comprimentos)
+    inicios_ord = inicios[ordem]
+
+    posteriores = np.full((len(buffer), len(colunas)), np.nan)
+    log_veross_ord = np.zeros(N)
+
+    if T_max > 0:
+        if passo_checkpoint is None:
+            passo_checkpoint = max(1, int(np.ceil(np.sqrt(T_max))))
+        ativos = ativos.tolist()
+        # Fatores de escala c_t guardados de forma compacta (uma linha por sequência ativa)
+        base = np.concatenate(([0], np.cumsum(ativos[:T_max]))).tolist()
+        escalas = np.empty(base[-1])
+        checkpoints = {}
+
+        def passo_forward(alpha, t):
+            k = ativos[t]
+            if t == 0:
+                alpha[:k] = pi * B_T[buffer[inicios_ord[:k]]]
+            else:
+                alpha[:k] = (alpha[:k] @ A) * B_T[buffer[inicios_ord[:k] + t]]
+            c = escalas[base[t]:base[t+1]]
+            alpha[:k].sum(axis=1, out=c)
+            alpha[:k] /= c[:, None]
+
+        # Observações impossíveis (c_t = 0) viram -inf/NaN sem avisos a cada passo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # --- PASSO 1: Forward, guardando apenas os checkpoints ---
+            alpha = np.zeros((N, S))
+            for t in range(T_max):
+                passo_forward(alpha, t)
+                if t % passo_checkpoint == 0:
+                    checkpoints[t] = alpha[:ativos[t]].copy()
+
+            # log P(O) = soma dos log c_t de cada sequência (escalas estão agrupadas por passo)
+            linha_ord = np.concatenate([np.arange(k) for k in ativos[:T_max]])
+            log_veross_ord = np.bincount(linha_ord, weights=np.log(escalas), minlength=N)
+
+            # --- PASSO 2: Backward por segmentos, recalculando o forward de cada um ---
+            beta = np.ones((N, S))
+            A_T = np.ascontiguousarray(A.T)
+            if estatisticas is not None:
+                # xi acumulado sem o fator A; multiplicado uma única vez no final
+                xi_sem_A = np.zeros((S, S))
+                emissoes_T = np.zeros((B_T.shape[0], S))
+            for t0 in range((T_max - 1) // passo_checkpoint * passo_checkpoint, -1, -passo_checkpoint):
+                t1 = min(t0 + passo_checkpoint, T_max)
+                alphas_segmento = [checkpoints.pop(t0)]
+                alpha[:ativos[t0]] = alphas_segmento[0]
+                for t in range(t0 + 1, t1):
+                    passo_forward(alpha, t)
+                    alphas_segmento.append(alpha[:ativos[t]].copy())
+
+                for t in range(t1 - 1, t0 - 1, -1):
+                    k, k_seguinte = ativos[t], ativos[t+1]
+                    alpha_t = alphas_segmento[t - t0]
+                    if k_seguinte > 0:
+                        # beta_t = A (B[:, o_t+1] * beta_t+1) / c_t+1
+                        pesos = B_T[buffer[inicios_ord[:k_seguinte] + t + 1]]
+                        pesos *= beta[:k_seguinte]
+                        pesos /= escalas[base[t+1]:base[t+2], None]
+                        if estatisticas is not None:
+                            xi_sem_A += alpha_t[:k_seguinte].T @ pesos
+                        np.matmul(pesos, A_T, out=beta[:k_seguinte])
+                    # Sequências que terminam em t começam com beta = 1
+                    beta[k_seguinte:k] = 1.0
+                    gamma = alpha_t * beta[:k]
+                    posteriores[inicios_ord[:k] + t] = gamma[:, colunas]
+                    if estatisticas is not None:
+                        np.add.at(emissoes_T, buffer[inicios_ord[:k] + t], gamma)
+                        if t == 0:
+                            estatisticas['inicial'] += gamma.sum(axis=0)
+
+            if estatisticas is not None:
+                estatisticas['transicoes'] += xi_sem_A * A
+                estatisticas['emissoes'] += emissoes_T.T
+
+    log_verossimilhancas = np.empty(N)
+    log_verossimilhancas[ordem] = log_veross_ord
+    if len(formato) == 2:
+        posteriores = posteriores.reshape(formato + (len(colunas),))
+    if estados_saida is not None and np.ndim(estados_saida) == 0:
+        posteriores = posteriores[..., 0]
+    return posteriores, log_verossimilhancas
+
+
+def forward_backward(pi, A, B, obs, estados_saida=None, passo_checkpoint=None):
+    """
+    Forward-backward de uma única sequência (ver forward_backward_lote).
+    Retorna (posteriores (T, ...), log P(O)).
+    """
+    obs = validar_observacoes(obs, np.shape(B)[1])
+    posteriores, log_veross = forward_backward_lote(pi, A, B, obs, offsets=[0, len(obs)],
+                                                    estados_saida=estados_saida,
+                                                    passo_checkpoint=passo_checkpoint)
+    return posteriores, float(log_veross[0])
+
+
+def forward(pi, A, B, obs):
+    """
+    Forward escalonado de uma sequência, sem guardar a tabela alpha.
+    Retorna (log P(O), distribuição filtrada final P(estado_T-1 | O)).
+    """
+    A = np.asarray(A, dtype=np.float64)
+    B_T = np.ascontiguousarray(np.asarray(B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, B_T.shape[0])
+    log_veross = 0.0
+    alpha = np.asarray(pi, dtype=np.float64) * B_T[obs[0]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for t in range(len(obs)):
+            if t > 0:
+                alpha = (alpha @ A) * B_T[obs[t]]
+            c = alpha.sum()
+            alpha /= c
+            log_veross += np.log(c)
+    return float(log_veross), alpha
@@ -0,0 +1,200 @@
+# --- HMM ONLINE: FILTRAGEM E VITERBI COM ATRASO FIXO ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Diagnóstico do robô enquanto os logs chegam, sem esperar a sequência
+# completa. Guarda só O(S) de estado mais uma janela circular de
+# backpointers com no máximo 'atraso_max' passos, então a memória é
+# limitada mesmo para telemetria que nunca termina.
+# -----------------------------------------------------------------
+
+from collections import namedtuple
+
+import numpy as np
+
+from hmm_nucleo import log_seguro, menor_dtype_inteiro
+
+# Resultado de um processamento (passo único ou bloco):
+#   filtrado    -> P(estado_t | obs_0..t) para cada passo consumido, shape (n, S)
+#   tempos      -> instantes cuja decisão de Viterbi ficou definitiva
+#   estados     -> estado decidido em cada um desses instantes
+#   alertas     -> lista de (t_inicio_episodio, t_emissao) para o estado de alerta
+ResultadoOnline = namedtuple('ResultadoOnline', ['filtrado', 'tempos', 'estados', 'alertas'])
+
+
+def ponto_de_convergencia(psi_janela, limite, sobreviventes=None):
+    """
+    Procura, voltando a partir do último passo, o instante mais recente em
+    que os caminhos sobreviventes de todos os estados se fundem.
+
+    psi_janela(u) devolve a linha de backpointers do passo u; a busca vai
+    de 'limite[1]' até 'limite[0]' + 1. Retorna (u_fusao, estado) — todos
+    os caminhos passam por 'estado' no instante u_fusao — ou None.
+
+    'sobreviventes' (opcional) é uma lista mantida pelo chamador entre as
+    chamadas: o item i guarda os estados por onde os caminhos passam no
+    instante limite[0] + i, e o chamador remove do início os itens dos
+    instantes que decidir. Esses conjuntos só encolhem com novos passos,
+    então a busca para no primeiro instante cujo conjunto não mudou (dali
+    para trás já não havia fusão): O(S) amortizado por passo em vez de
+    O(atraso · S).
+    """
+    inicio, fim = limite
+    if sobreviventes is not None and len(sobreviventes) < fim - inicio:
+        sobreviventes.extend([None] * (fim - inicio - len(sobreviventes)))
+    conjunto = None
+    for u in range(fim, inicio, -1):
+        linha = psi_janela(u)
+        conjunto = np.unique(linha if conjunto is None else linha[conjunto])
+        if sobreviventes is not None:
+            anterior = sobreviventes[u - 1 - inicio]
+            if anterior is not None and len(anterior) == len(conjunto):
+                return None
+            sobreviventes[u - 1 - inicio] = conjunto
+        if len(conjunto) == 1:
+            return u - 1, int(conjunto[0])
+    return None
+
+
+class DecodificadorOnline:
+    """
+    Consome observações uma a uma (ou em blocos) e produz:
+      - a distribuição filtrada P(estado_t | obs_0..t) imediatamente;
+      - a decisão de Viterbi de cada instante assim que os caminhos
+        sobreviventes convergem, ou à força após 'atraso_max' passos
+        (Viterbi com atraso fixo, usando o melhor estado atual);
+      - um alerta quando um episódio do estado de alerta (ex.: 'Preso')
+        começa, com latência de no máximo 'atraso_max' passos. Se
+        'limiar_filtro' for dado, também alerta na hora em que
+        P(alerta | obs_0..t) passa do limiar.
+    """
+
+    def __init__(self, pi, A, B, atraso_max=50, estado_alerta=None, limiar_filtro=None):
+        if atraso_max < 1:
+            raise ValueError("'atraso_max' deve ser pelo menos 1")
+        self.pi = np.asarray(pi, dtype=np.float64)
+        self.A = np.asarray(A, dtype=np.float64)
+        self.B_T = np.ascontiguousarray(np.asarray(B, dtype=np.float64).T)
+        self.log_pi = log_seguro(self.pi)
+        self.log_A = log_seguro(self.A)
+        self.log_B_T = log_seguro(self.B_T)
+        self.n_estados = len(self.pi)
+        self.atraso_max = atraso_max
+        self.estado_alerta = estado_alerta
+        self.limiar_filtro = limiar_filtro
+
+        # Janela circular de backpointers: passo u fica na linha u % atraso_max
+        self._psi = np.zeros((atraso_max, self.n_estados), dtype=menor_dtype_inteiro(self.n_estados))
+        self._candidatos = np.empty((self.n_estados, self.n_estados))
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Volta ao estado inicial (nenhuma observação consumida)."""
+        self.t = 0                  # número de observações consumidas
+        self.t_decidido = 0         # primeiro instante ainda sem decisão definitiva
+        self.alpha = None           # distribuição filtrada atual (S,)
+        self.delta = None           # log-delta de Viterbi, renormalizado (max = 0)
+        self.log_verossimilhanca = 0.0
+        self._ultimo_decidido = None
+        self._filtro_em_alerta = False
+        self._sobreviventes = []    # ver ponto_de_convergencia
+
+    def _linha_psi(self, u):
+        return self._psi[u % self.atraso_max]
+
+    def _rastrear(self, estado, de_u, ate_u):
+        """Estados de ate_u..de_u seguindo os backpointers a partir de 'estado' em de_u."""
+        estados = np.empty(de_u - ate_u + 1, dtype=np.intp)
+        estados[-1] = estado
+        for u in range(de_u, ate_u, -1):
+            estado = self._linha_psi(u)[estado]
+            estados[u - 1 - ate_u] = estado
+        return estados
+
+    def _registrar_decisoes(self, estados, tempos, decididos, alertas):
+        inicio = self.t_decidido
+        tempos.append(np.arange(inicio, inicio + len(estados)))
+        decididos.append(estados)
+        if self.estado_alerta is not None:
+            anterior = np.concatenate(([-1 if self._ultimo_decidido is None else self._ultimo_decidido],
+                                       estados[:-1]))
+            for k in np.flatnonzero((estados == self.estado_alerta) & (anterior != self.estado_alerta)):
+                alertas.append((inicio + int(k), self.t - 1))
+        self._ultimo_decidido = int(estados[-1])
+        self.t_decidido += len(estados)
+        del self._sobreviventes[:len(estados)]
+
+    def _passo(self, obs, filtrados, tempos, decididos, alertas):
+        t = self.t
+        # --- Filtragem (forward escalonado) ---
+        if t == 0:
+            alpha = self.pi * self.B_T[obs]
+        else:
+            alpha = (self.alpha @ self.A) * self.B_T[obs]
+        c = alpha.sum()
+        if c <= 0:
+            raise ValueError(f"Observação {obs} impossível no instante {t} para o modelo atual")
+        self.alpha = alpha / c
+        self.log_verossimilhanca += np.log(c)
+        filtrados.append(self.alpha)
+
+        # --- Viterbi incremental em log, com a janela de backpointers ---
+        if t == 0:
+            delta = self.log_pi + self.log_B_T[obs]
+        else:
+            np.add(self.delta[:, None], self.log_A, out=self._candidatos)
+            self._psi[t % self.atraso_max] = self._candidatos.argmax(axis=0)
+            delta = self._candidatos.max(axis=0) + self.log_B_T[obs]
+        self.delta = delta - delta.max()
+        self.t = t + 1
+
+        # --- Decisão: convergência dos sobreviventes ou atraso máximo atingido ---
+        if t > self.t_decidido:
+            fusao = ponto_de_convergencia(self._linha_psi, (self.t_decidido, t), self._sobreviventes)
+            if fusao is not None:
+                u, estado = fusao
+                self._registrar_decisoes(self._rastrear(estado, u, self.t_decidido),
+                                         tempos, decididos, alertas)
+        if t - self.t_decidido + 1 >= self.atraso_max:
+            # Atraso fixo: decide o instante mais antigo pelo melhor caminho atual
+            caminho = self._rastrear(int(self.delta.argmax()), t, self.t_decidido)
+            self._registrar_decisoes(caminho[:1], tempos, decididos, alertas)
+
+        # --- Alerta imediato pela distribuição filtrada ---
+        if self.limiar_filtro is not None and self.estado_alerta is not None:
+            em_alerta = self.alpha[self.estado_alerta] >= self.limiar_filtro
+            if em_alerta and not self._filtro_em_alerta:
+                alertas.append((t, t))
+            self._filtro_em_alerta = em_alerta
+
+    def _resultado(self, filtrados, tempos, decididos, alertas):
+        return ResultadoOnline(
+            filtrado=np.array(filtrados).reshape(-1, self.n_estados),
+            tempos=np.concatenate(tempos) if tempos else np.empty(0, dtype=np.intp),
+            estados=np.concatenate(decididos) if decididos else np.empty(0, dtype=np.intp),
+            alertas=alertas,
+        )
+
+    def atualizar(self, obs):
+        """Consome uma observação (índice inteiro) e devolve um ResultadoOnline."""
+        return self.processar([obs])
+
+    def processar(self, bloco_obs):
+        """Consome um bloco de observações (índices inteiros) e devolve um ResultadoOnline."""
+        filtrados, tempos, decididos, alertas = [], [], [], []
+        for obs in np.asarray(bloco_obs, dtype=np.intp):
+            if obs < 0 or obs >= self.B_T.shape[0]:
+                raise ValueError(f"Índice de observação fora do intervalo [0, {self.B_T.shape[0]})")
+            self._passo(obs, filtrados, tempos, decididos, alertas)
+        return self._resultado(filtrados, tempos, decididos, alertas)
+
+    def finalizar(self):
+        """
+        Fim do fluxo: decide os instantes pendentes pelo melhor caminho atual.
+        Depois disso o decodificador pode continuar a receber observações.
+        """
+        filtrados, tempos, decididos, alertas = [], [], [], []
+        if self.t > self.t_decidido:
+            caminho = self._rastrear(int(self.delta.argmax()), self.t - 1, self.t_decidido)
+            self._registrar_decisoes(caminho, tempos, decididos, alertas)
+        return self._resultado(filtrados, tempos, decididos, alertas)
@@ -0,0 +1,269 @@
+# --- RELATÓRIOS E GRÁFICOS DO HMM (CAMADA OPCIONAL) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Explicações didáticas, tabela comparativa e figuras do RoboHMM, fora do
+# caminho de inferência. pandas, matplotlib e seaborn só são importados
+# dentro das funções que os usam, então quem só decodifica (jobs em lote,
+# scripts de benchmark) importa apenas NumPy. Para logs longos a trellis
+# é reduzida a no máximo 'max_colunas' colunas antes de desenhar, e os
+# valores só são escritos nas células quando a sequência é curta.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import normalizar_log
+
+# Colunas da trellis desenhadas no heatmap, limite para anotar cada célula
+# e quantos rótulos de tempo aparecem no eixo quando a trellis é reduzida
+MAX_COLUNAS = 200
+ANOTAR_ATE = 30
+ROTULOS_REDUZIDOS = 10
+
+
+def _pyplot():
+    """Importa matplotlib (backend sem janela) e seaborn só quando há figura a gerar."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+
+def reduzir_trellis(matriz, max_colunas=MAX_COLUNAS):
+    """
+    Reduz uma matriz (T, S) a no máximo max_colunas linhas fazendo a média
+    de blocos consecutivos de instantes. Retorna (matriz reduzida,
+    instante inicial de cada bloco).
+    """
+    matriz = np.asarray(matriz)
+    T = len(matriz)
+    if T <= max_colunas:
+        return matriz, np.arange(T)
+    inicios = np.linspace(0, T, max_colunas, endpoint=False).astype(np.intp)
+    somas = np.add.reduceat(matriz, inicios, axis=0)
+    tamanhos = np.diff(np.append(inicios, T))
+    return somas / tamanhos[:, None], inicios
+
+
+def _rotulos_tempo(obs_seq, inicios, reduzido):
+    # Sequência curta: a própria observação; reduzida: o instante inicial de alguns blocos
+    if not reduzido:
+        return [obs_seq[i] for i in inicios]
+    passo = max(1, len(inicios) // ROTULOS_REDUZIDOS)
+    return [f"t={i}" if k % passo == 0 else '' for k, i in enumerate(inicios)]
+
+
+def _fracoes(nomes, mapa, max_colunas):
+    """Fração de cada categoria (estado ou observação) por bloco de tempo, (blocos, K)."""
+    indices = np.fromiter((mapa[n] for n in nomes), dtype=np.intp, count=len(nomes))
+    return reduzir_trellis(np.eye(len(mapa))[indices], max_colunas)
+
+
+# --- Explicações em texto ---
+
+def explicar_logica(modelo, sequencia_obs):
+    """
+    Explicação didática: Por que cada observação leva a qual conclusão
+    """
+    print("\n" + "="*80)
+    print("EXPLICAÇÃO DIDÁTICA: Por que o HMM escolhe cada estado")
+    print("="*80)
+
+    for t, obs in enumerate(sequencia_obs):
+        obs_idx = modelo.mapa_obs[obs]
+        print(f"\nTempo {t}: Observação = '{obs}'")
+        print("-" * 60)
+        print("Probabilidade dessa observação vir de cada estado:")
+
+        # P(obs | estado) = B[estado, obs_idx]
+        for s, estado in enumerate(modelo.estados):
+            prob = modelo.B[s, obs_idx]
+            print(f"  P('{obs}' | {estado:10s}) = {prob:.2f}")
+
+        # Qual estado mais provavelmente gerou essa obs (sem contexto)?
+        estado_melhor_sem_contexto = modelo.estados[np.argmax(modelo.B[:, obs_idx])]
+        print(f"→ Sem contexto, '{obs}' vem melhor de: {estado_melhor_sem_contexto}")
+
+
+def explicar_transicoes(modelo, viterbi_seq, ingenuo_seq, obs_seq):
+    """
+    Explica POR QUÊ o HMM diverge do ingênuo
+    """
+    print("\n" + "="*80)
+    print("EXPLICAÇÃO: Por quê HMM e Ingênuo diferem?")
+    print("="*80)
+
+    for t in range(1, len(obs_seq)):
+        est_vit_ant = viterbi_seq[t-1]
+        est_vit_agr = viterbi_seq[t]
+        est_ing_agr = ingenuo_seq[t]
+        obs_atual = obs_seq[t]
+
+        if est_vit_agr != est_ing_agr:
+            print(f"\nTempo {t}: '{obs_atual}'")
+            print(f"  Ingênuo escolheria: {est_ing_agr}")
+            print(f"  HMM escolhe:        {est_vit_agr}")
+            print(f"  Contexto: Robô estava em '{est_vit_ant}' no tempo anterior")
+
+            # Verificar probabilidade de transição
+            idx_ant = modelo.mapa_estados[est_vit_ant]
+            idx_novo_hmm = modelo.mapa_estados[est_vit_agr]
+            idx_novo_ing = modelo.mapa_estados[est_ing_agr]
+
+            prob_transicao_hmm = modelo.A[idx_ant, idx_novo_hmm]
+            prob_transicao_ing = modelo.A[idx_ant, idx_novo_ing]
+
+            print(f"  Prob transição para {est_vit_agr}: {prob_transicao_hmm:.2f}")
+            print(f"  Prob transição para {est_ing_agr}: {prob_transicao_ing:.2f}")
+            print(f"  → HMM leva em conta que {est_vit_agr} é mais provável dado o histórico")
+
+
+def explicar_alternativas(modelo, obs_seq, K=3):
+    """
+    Mostra os K diagnósticos mais prováveis (não só o melhor), com a
+    confiança P(caminho | logs) de cada um
+    """
+    print("\n" + "="*80)
+    print(f"DIAGNÓSTICOS ALTERNATIVOS: os {K} caminhos mais prováveis")
+    print("="*80)
+
+    alternativas = modelo.k_melhores(obs_seq, K)
+    if not alternativas:
+        print("\nNenhum caminho: sequência impossível para o modelo")
+        return
+    melhor = alternativas[0][0]
+    for posto, (caminho, log_prob, confianca) in enumerate(alternativas, start=1):
+        diferencas = [t for t in range(len(caminho)) if caminho[t] != melhor[t]]
+        print(f"\n#{posto}: {caminho}")
+        print(f"  log P = {log_prob:.3f} | confiança = {confianca:.1%}")
+        if diferencas:
+            print(f"  Difere do melhor nos tempos {diferencas}")
+
+
+def tabela_comparativa(obs_seq, ingenuo_seq, viterbi_seq):
+    """DataFrame com observação, diagnóstico ingênuo e do HMM em cada instante."""
+    import pandas as pd
+    return pd.DataFrame({
+        'Tempo': range(len(obs_seq)),
+        'Observação': obs_seq,
+        'Diagnóstico Ingênuo': ingenuo_seq,
+        'Diagnóstico HMM': viterbi_seq,
+        'Acorta?': ['Diferente' if ingenuo_seq[i] != viterbi_seq[i] else 'Igual'
+                    for i in range(len(obs_seq))],
+    })
+
+
+# --- Figuras ---
+
+def visualizar_trellis(modelo, obs_seq, delta, arquivo='viterbi_robo.png', max_colunas=MAX_COLUNAS):
+    """
+    Heatmap da trellis de Viterbi (log-delta normalizado por passo de
+    tempo, sem underflow em logs longos), com estados no eixo Y e tempo
+    no eixo X.
+    """
+    plt, sns = _pyplot()
+    trellis, inicios = reduzir_trellis(normalizar_log(delta), max_colunas)
+    reduzido = len(inicios) < len(delta)
+
+    plt.figure(figsize=(10, 6))
+    sns.heatmap(trellis.T, annot=len(trellis) <= ANOTAR_ATE, fmt=".1e", cmap="YlGnBu",
+                xticklabels=_rotulos_tempo(obs_seq, inicios, reduzido), yticklabels=modelo.estados)
+    plt.title('Probabilidades do Algoritmo de Viterbi (Trellis)')
+    plt.xlabel('Sequência de Observações (Tempo)')
+    plt.ylabel('Estados Ocultos')
+
+    plt.tight_layout()
+    plt.savefig(arquivo)
+    plt.close()
+    print(f"\nGráfico salvo como '{arquivo}'")
+
+
+def visualizar_completo(modelo, obs_seq, viterbi_seq, ingenuo_seq, delta,
+                        arquivo='analise_hmm_completa.png', max_colunas=MAX_COLUNAS):
+    """Visualização melhorada com anotações"""
+    plt, sns = _pyplot()
+    fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+    T = len(obs_seq)
+
+    # Plot 1: Heatmap Viterbi (log-delta normalizado por passo de tempo)
+    trellis, inicios = reduzir_trellis(normalizar_log(delta), max_colunas)
+    reduzido = len(inicios) < T
+    sns.heatmap(trellis.T, annot=len(trellis) <= ANOTAR_ATE, fmt=".2e", cmap="YlGnBu", ax=axes[0],
+                xticklabels=_rotulos_tempo(obs_seq, inicios, reduzido), yticklabels=modelo.estados,
+                cbar_kws={'label': 'Probabilidade'})
+    axes[0].set_title('1. TRELLIS DE VITERBI: Confiança em cada estado ao longo do tempo',
+                      fontweight='bold', fontsize=12)
+    axes[0].set_ylabel('Estados Ocultos')
+
+    if reduzido:
+        _comparacao_reduzida(axes, modelo, obs_seq, viterbi_seq, ingenuo_seq, max_colunas)
+    else:
+        _comparacao_detalhada(axes, modelo, obs_seq, viterbi_seq, ingenuo_seq)
+
+    plt.tight_layout()
+    plt.savefig(arquivo, dpi=150)
+    plt.close(fig)
+    print(f"\nGráfico salvo como '{arquivo}'")
+
+
+def _comparacao_detalhada(axes, modelo, obs_seq, viterbi_seq, ingenuo_seq):
+    """Painéis 2 e 3 para sequências curtas: um ponto/barra por instante."""
+    tempo = range(len(obs_seq))
+
+    # Plot 2: Comparação de caminhos
+    y_viterbi = [modelo.mapa_estados[s] for s in viterbi_seq]
+    y_ingenuo = [modelo.mapa_estados[s] for s in ingenuo_seq]
+
+    axes[1].plot(tempo, y_viterbi, 'o-', label='HMM (Viterbi) - COM histórico',
+                 color='green', linewidth=2.5, markersize=8)
+    axes[1].plot(tempo, y_ingenuo, 'x--', label='Ingênuo - SEM histórico',
+                 color='red', linewidth=2, markersize=8)
+
+    axes[1].set_yticks(range(len(modelo.estados)))
+    axes[1].set_yticklabels(modelo.estados)
+    axes[1].set_xticks(range(len(obs_seq)))
+    axes[1].set_xticklabels(obs_seq)
+    axes[1].set_title('2. COMPARAÇÃO: HMM vs Ingênuo', fontweight='bold', fontsize=12)
+    axes[1].legend(loc='upper left', fontsize=10)
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_ylabel('Estado Inferido')
+
+    # Plot 3: Observações como referência
+    obs_idx = [modelo.mapa_obs[o] for o in obs_seq]
+    colors = ['green' if o == 0 else 'orange' if o == 1 else 'blue' for o in obs_idx]
+    axes[2].bar(tempo, obs_idx, color=colors, alpha=0.6, edgecolor='black', linewidth=1.5)
+    axes[2].set_yticks(range(len(modelo.observacoes)))
+    axes[2].set_yticklabels(modelo.observacoes)
+    axes[2].set_xticks(range(len(obs_seq)))
+    axes[2].set_xticklabels(obs_seq)
+    axes[2].set_title('3. OBSERVAÇÕES RUIDOSAS (Ground truth = desconhecido)',
+                      fontweight='bold', fontsize=12)
+    axes[2].set_ylabel('Tipo de Observação')
+    axes[2].grid(True, alpha=0.3, axis='y')
+
+
+def _comparacao_reduzida(axes, modelo, obs_seq, viterbi_seq, ingenuo_seq, max_colunas):
+    """Painéis 2 e 3 para logs longos: frações por bloco de tempo em vez de um ponto por instante."""
+    fracao_viterbi, inicios = _fracoes(viterbi_seq, modelo.mapa_estados, max_colunas)
+    fracao_ingenuo, _ = _fracoes(ingenuo_seq, modelo.mapa_estados, max_colunas)
+    fracao_obs, _ = _fracoes(obs_seq, modelo.mapa_obs, max_colunas)
+
+    # Plot 2: fração do bloco em cada estado, HMM (cheio) vs ingênuo (tracejado)
+    for s, estado in enumerate(modelo.estados):
+        linha, = axes[1].plot(inicios, fracao_viterbi[:, s], '-', linewidth=2, label=f'{estado} (HMM)')
+        axes[1].plot(inicios, fracao_ingenuo[:, s], '--', color=linha.get_color(), alpha=0.7,
+                     label=f'{estado} (Ingênuo)')
+    axes[1].set_title('2. COMPARAÇÃO: HMM vs Ingênuo (fração do bloco em cada estado)',
+                      fontweight='bold', fontsize=12)
+    axes[1].legend(loc='upper left', fontsize=8, ncol=len(modelo.estados))
+    axes[1].grid(True, alpha=0.3)
+    axes[1].set_ylabel('Fração do tempo')
+
+    # Plot 3: composição das observações em cada bloco
+    axes[2].stackplot(inicios, fracao_obs.T, labels=modelo.observacoes, alpha=0.6)
+    axes[2].set_title('3. OBSERVAÇÕES RUIDOSAS (fração por bloco de tempo)',
+                      fontweight='bold', fontsize=12)
+    axes[2].legend(loc='upper left', fontsize=8, ncol=len(modelo.observacoes))
+    axes[2].set_ylabel('Fração das observações')
+    axes[2].set_xlabel('Tempo (início do bloco)')
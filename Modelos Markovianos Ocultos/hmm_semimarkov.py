@@ -0,0 +1,290 @@
+# --- HMM SEMI-MARKOVIANO (DURAÇÃO EXPLÍCITA) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# No HMM a autotransição A[s, s] força durações geométricas (ex.: Preso
+# com 0.60 -> episódios de 1 passo são os mais prováveis). Aqui cada
+# estado tem uma distribuição de duração própria p_s(d), d = 1..D, e o
+# modelo sorteia segmentos (estado, duração); A só escolhe o próximo
+# estado (diagonal normalmente zero).
+#
+# Viterbi segmental e forward-backward em log-espaço com custo
+# O(T·S·(D + S)): a emissão de um segmento [u, t] é C[t+1] - C[u], com C a
+# soma acumulada de log B[s, obs], então cada passo é uma única operação
+# (D, S) vetorizada, sem recalcular produtos de emissão.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from hmm_nucleo import log_seguro, menor_dtype_inteiro, validar_observacoes
+
+
+# --- Distribuições de duração (vetores (D,) que somam 1) ---
+
+def duracao_geometrica(p_ficar, D):
+    """Duração do HMM comum: P(d) ∝ p_ficar^(d-1) (1 - p_ficar), truncada em D."""
+    d = np.arange(D)
+    pmf = p_ficar ** d * (1.0 - p_ficar)
+    if pmf.sum() <= 0:
+        # p_ficar = 1: o estado nunca sai sozinho, toda a massa vai para o limite D
+        pmf[-1] = 1.0
+    return pmf / pmf.sum()
+
+
+def duracao_poisson(media, D):
+    """Duração 1 + Poisson(media - 1), truncada em D (pico perto da média)."""
+    lam = max(media - 1.0, 1e-12)
+    k = np.arange(D)
+    log_fatorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, D)))))
+    log_pmf = k * np.log(lam) - lam - log_fatorial
+    pmf = np.exp(log_pmf - log_pmf.max())
+    return pmf / pmf.sum()
+
+
+def duracoes_de_hmm(A, D):
+    """
+    Converte as transições de um HMM comum em (duracoes (S, D), A sem
+    diagonal): durações geométricas pela autotransição e saídas
+    renormalizadas. Com D grande e censura no final, o semi-Markov
+    resultante dá as mesmas probabilidades que o HMM original.
+    """
+    A = np.asarray(A, dtype=np.float64)
+    ficar = np.diag(A)
+    duracoes = np.array([duracao_geometrica(p, D) for p in ficar])
+    saida = A * (1.0 - np.eye(len(A)))
+    totais = saida.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        saida = np.where(totais > 0, saida / totais, 0.0)
+    return duracoes, saida
+
+
+# --- Tabelas auxiliares ---
+
+def _logsumexp(x, axis=0):
+    maximo = x.max(axis=axis, keepdims=True)
+    maximo = np.where(np.isfinite(maximo), maximo, 0.0)
+    return np.log(np.exp(x - maximo).sum(axis=axis)) + np.squeeze(maximo, axis=axis)
+
+
+def _tabelas_duracao(log_duracoes):
+    """(log p(d), log P(duração >= d)), ambas (D, S), a partir de log p (S, D)."""
+    log_duracoes = np.asarray(log_duracoes, dtype=np.float64)
+    log_sobrevivencia = np.logaddexp.accumulate(log_duracoes[:, ::-1], axis=1)[:, ::-1]
+    return np.ascontiguousarray(log_duracoes.T), np.ascontiguousarray(log_sobrevivencia.T)
+
+
+def _emissoes_acumuladas(log_B_T, obs):
+    """
+    C (T+1, S) com C[t] = soma de log B[s, obs[0..t-1]], trocando -inf por 0,
+    e as posições das emissões impossíveis, que a soma não representa:
+      ultimo[t, s]  -> último u <= t com B[s, obs[u]] = 0 (ou -1)
+      proximo[u, s] -> primeiro t >= u com B[s, obs[t]] = 0 (ou T)
+    Um segmento [u, t] de s é possível se ultimo[t, s] < u (ou t < proximo[u, s]).
+    """
+    T = len(obs)
+    emissoes = log_B_T[obs]
+    impossivel = np.isneginf(emissoes)
+    C = np.zeros((T + 1, emissoes.shape[1]))
+    np.cumsum(np.where(impossivel, 0.0, emissoes), axis=0, out=C[1:])
+    indices = np.arange(T)[:, None]
+    ultimo = np.maximum.accumulate(np.where(impossivel, indices, -1), axis=0)
+    proximo = np.minimum.accumulate(np.where(impossivel, indices, T)[::-1], axis=0)[::-1]
+    return C, ultimo, proximo
+
+
+# --- Inferência ---
+
+def viterbi_semimarkov(log_pi, log_A, log_B, log_duracoes, obs, censurado=True):
+    """
+    Viterbi segmental: melhor segmentação (estado, início, duração) da sequência.
+
+    Parâmetros em log: log_pi (S,), log_A (S, S), log_B (S, M) e
+    log_duracoes (S, D) com log p_s(d) para d = 1..D. Com censurado=True o
+    último segmento pode continuar depois do fim do log (usa P(duração >= d)
+    em vez de p(d)), o que é o caso de um robô ainda preso quando o log acaba.
+
+    Retorna (caminho (T,), log_prob, segmentos), em que segmentos é um
+    array (K, 3) com [estado, inicio, duracao] de cada segmento em ordem.
+    """
+    log_pi = np.asarray(log_pi, dtype=np.float64)
+    log_A = np.asarray(log_A, dtype=np.float64)
+    log_B_T = np.ascontiguousarray(np.asarray(log_B, dtype=np.float64).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    log_dur, log_sobr = _tabelas_duracao(log_duracoes)
+    D, S = log_dur.shape
+    T = len(obs)
+    C, ultimo, _ = _emissoes_acumuladas(log_B_T, obs)
+
+    # Tabelas invertidas: linha k corresponde à duração D - k, então os
+    # inícios u = lo..t de um segmento que termina em t casam com uma fatia contígua
+    dur_inv, sobr_inv = log_dur[::-1], log_sobr[::-1]
+
+    # W[u] = (melhor log-prob de entrar em s no instante u) - C[u]
+    W = np.empty((T, S))
+    W[0] = log_pi
+    duracao = np.empty((T, S), dtype=menor_dtype_inteiro(D + 1))
+    entrada = np.empty((T, S), dtype=menor_dtype_inteiro(S))
+    colunas = np.arange(S)
+
+    with np.errstate(invalid='ignore'):
+        for t in range(T):
+            lo = max(0, t - D + 1)
+            tabela = sobr_inv if (censurado and t == T - 1) else dur_inv
+            candidatos = W[lo:t+1] + tabela[D - (t + 1 - lo):]
+            if ultimo[t].max() >= lo:
+                candidatos[np.arange(lo, t + 1)[:, None] <= ultimo[t]] = -np.inf
+            k = candidatos.argmax(axis=0)
+            fim = candidatos[k, colunas] + C[t+1]
+            duracao[t] = t - lo - k + 1
+            if t + 1 < T:
+                transicao = fim[:, None] + log_A
+                entrada[t+1] = transicao.argmax(axis=0)
+                W[t+1] = transicao.max(axis=0) - C[t+1]
+
+    # --- Backtracking por segmentos ---
+    estado = int(np.argmax(fim))
+    log_prob = float(fim[estado])
+    caminho = np.empty(T, dtype=np.intp)
+    segmentos = []
+    t = T - 1
+    while t >= 0:
+        d = int(duracao[t, estado])
+        inicio = t - d + 1
+        caminho[inicio:t+1] = estado
+        segmentos.append((estado, inicio, d))
+        if inicio > 0:
+            estado = int(entrada[inicio, estado])
+        t = inicio - 1
+    return caminho, log_prob, np.array(segmentos[::-1], dtype=np.intp).reshape(-1, 3)
+
+
+def forward_backward_semimarkov(pi, A, B, duracoes, obs, censurado=True):
+    """
+    Forward-backward do semi-Markov em log-espaço.
+
+    Recebe os parâmetros em probabilidade linear (pi, A, B, duracoes (S, D))
+    e devolve (posteriores (T, S), log_verossimilhanca). A posterior de s
+    em t é a probabilidade de algum segmento de s cobrir t, obtida das
+    probabilidades de início e fim de segmento por soma acumulada.
+    """
+    log_pi, log_A = log_seguro(pi), log_seguro(A)
+    log_B_T = np.ascontiguousarray(log_seguro(B).T)
+    obs = validar_observacoes(obs, log_B_T.shape[0])
+    log_dur, log_sobr = _tabelas_duracao(log_seguro(duracoes))
+    D, S = log_dur.shape
+    T = len(obs)
+    C, ultimo, proximo = _emissoes_acumuladas(log_B_T, obs)
+    dur_inv, sobr_inv = log_dur[::-1], log_sobr[::-1]
+
+    entra = np.empty((T, S))   # log P(obs_0..u-1, segmento de s começa em u)
+    sai = np.empty((T, S))     # log P(obs_0..t, segmento de s termina em t)
+    entra[0] = log_pi
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # --- Forward ---
+        W = np.empty((T, S))
+        W[0] = log_pi
+        for t in range(T):
+            lo = max(0, t - D + 1)
+            tabela = sobr_inv if (censurado and t == T - 1) else dur_inv
+            candidatos = W[lo:t+1] + tabela[D - (t + 1 - lo):]
+            if ultimo[t].max() >= lo:
+                candidatos[np.arange(lo, t + 1)[:, None] <= ultimo[t]] = -np.inf
+            sai[t] = _logsumexp(candidatos) + C[t+1]
+            if t + 1 < T:
+                entra[t+1] = _logsumexp(sai[t][:, None] + log_A)
+                W[t+1] = entra[t+1] - C[t+1]
+        log_veross = float(_logsumexp(sai[T-1]))
+
+        # --- Backward ---
+        # Z[t] = C[t+1] + log P(obs_t+1.. | segmento termina em t)
+        beta_entra = np.empty((T, S))
+        beta_sai = np.empty((T, S))
+        beta_sai[T-1] = 0.0
+        Z = np.empty((T, S))
+        Z[T-1] = C[T]
+        for u in range(T - 1, -1, -1):
+            hi = min(u + D, T)
+            candidatos = Z[u:hi] + log_dur[:hi-u]
+            if censurado and hi == T:
+                candidatos[-1] = Z[T-1] + log_sobr[T-1-u]
+            if proximo[u].min() < hi:
+                candidatos[np.arange(u, hi)[:, None] >= proximo[u]] = -np.inf
+            beta_entra[u] = _logsumexp(candidatos) - C[u]
+            if u > 0:
+                beta_sai[u-1] = _logsumexp(log_A + beta_entra[u], axis=1)
+                Z[u-1] = C[u] + beta_sai[u-1]
+
+        # --- Ocupação: inícios até t menos fins antes de t ---
+        inicio = np.exp(entra + beta_entra - log_veross)
+        fim = np.exp(sai + beta_sai - log_veross)
+    posteriores = np.cumsum(inicio, axis=0)
+    posteriores[1:] -= np.cumsum(fim, axis=0)[:-1]
+    return np.clip(posteriores, 0.0, 1.0), log_veross
+
+
+class ModeloSemiMarkov:
+    """
+    Semi-Markov sobre um ModeloHMM: nomes, pi, B e a codificação das
+    observações vêm do 'modelo'; aqui ficam só a matriz de troca de
+    segmento A (diagonal normalmente zero; padrão: a do modelo sem a
+    diagonal, ver duracoes_de_hmm), as durações e a censura do último
+    segmento. de_modelo_hmm() troca as durações geométricas dos estados
+    escolhidos (ex.: Preso).
+    """
+
+    def __init__(self, modelo, duracoes, A=None, censurado=True):
+        self.modelo = modelo
+        S = modelo.n_estados
+        self.A = duracoes_de_hmm(modelo.A, 1)[1] if A is None else np.asarray(A, dtype=np.float64)
+        if self.A.shape != (S, S):
+            raise ValueError(f"'A' deve ter shape ({S}, {S}), recebido {self.A.shape}")
+        self.duracoes = np.asarray(duracoes, dtype=np.float64)
+        if self.duracoes.ndim != 2 or self.duracoes.shape[0] != S:
+            raise ValueError(f"'duracoes' deve ter shape ({S}, D), recebido {self.duracoes.shape}")
+        if np.any(self.duracoes < 0) or not np.allclose(self.duracoes.sum(axis=1), 1.0):
+            raise ValueError("Cada linha de 'duracoes' deve ser não-negativa e somar 1")
+        self.censurado = censurado
+        self.log_A = log_seguro(self.A)
+        self.log_duracoes = log_seguro(self.duracoes)
+
+    @property
+    def estados(self):
+        return self.modelo.estados
+
+    @property
+    def mapa_estados(self):
+        return self.modelo.mapa_estados
+
+    @property
+    def duracao_maxima(self):
+        return self.duracoes.shape[1]
+
+    @classmethod
+    def de_modelo_hmm(cls, modelo, D, duracoes=None, censurado=True):
+        """
+        Semi-Markov equivalente ao HMM 'modelo' com limite de duração D;
+        'duracoes' ({nome_do_estado: pmf (D,)}) substitui as geométricas.
+        """
+        tabela, A = duracoes_de_hmm(modelo.A, D)
+        for nome, pmf in (duracoes or {}).items():
+            tabela[modelo.mapa_estados[nome]] = pmf
+        return cls(modelo, tabela, A, censurado)
+
+    def codificar(self, sequencia_obs):
+        return self.modelo.codificar(sequencia_obs)
+
+    def viterbi(self, sequencia_obs):
+        """Segmentação mais provável: (nomes por instante, [(estado, inicio, duracao), ...])."""
+        caminho, _, segmentos = self.viterbi_indices(self.codificar(sequencia_obs))
+        return (self.modelo.nomes_estados(caminho),
+                [(self.estados[s], int(u), int(d)) for s, u, d in segmentos])
+
+    def viterbi_indices(self, obs):
+        return viterbi_semimarkov(self.modelo.log_pi, self.log_A, self.modelo.log_B, self.log_duracoes,
+                                  obs, self.censurado)
+
+    def posteriores(self, sequencia_obs):
+        """P(estado_t | todos os logs) (T, S) e a log-verossimilhança."""
+        return forward_backward_semimarkov(self.modelo.pi, self.A, self.modelo.B, self.duracoes,
+                                           self.codificar(sequencia_obs), self.censurado)
@@ -0,0 +1,182 @@
+# --- TREINAMENTO BAUM-WELCH (EM) DO HMM A PARTIR DOS LOGS DA FROTA ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Aprende pi, A e B a partir de logs sem rótulo. O passo E roda em blocos
+# de sequências (streaming), distribuídos entre processos; cada bloco
+# devolve apenas as contagens esperadas (estatísticas suficientes), que
+# são somadas antes do passo M. Memória por processo ~ um bloco.
+# -----------------------------------------------------------------
+
+import os
+
+import numpy as np
+
+from hmm_nucleo import OBSERVACOES_POR_BLOCO, forward_backward_lote
+
+
+def estatisticas_vazias(n_estados, n_observacoes):
+    """Acumuladores zerados do passo E."""
+    return {
+        'inicial': np.zeros(n_estados),
+        'transicoes': np.zeros((n_estados, n_estados)),
+        'emissoes': np.zeros((n_estados, n_observacoes)),
+        'log_verossimilhanca': 0.0,
+        'n_sequencias': 0,
+    }
+
+
+def somar_estatisticas(total, parcial):
+    """Soma 'parcial' em 'total' (in-place) e devolve 'total'."""
+    for chave, valor in parcial.items():
+        total[chave] = total[chave] + valor
+    return total
+
+
+def estatisticas_bloco(pi, A, B, buffer, offsets):
+    """
+    Passo E de um bloco ragged (buffer concatenado + offsets CSR):
+    contagens esperadas e a log-verossimilhança do bloco.
+    """
+    estat = estatisticas_vazias(len(pi), np.shape(B)[1])
+    _, log_veross = forward_backward_lote(pi, A, B, buffer, offsets=offsets,
+                                          estados_saida=[], estatisticas=estat)
+    estat['log_verossimilhanca'] = float(log_veross.sum())
+    estat['n_sequencias'] = len(offsets) - 1
+    return estat
+
+
+def _estatisticas_bloco_tarefa(argumentos):
+    # Ponto de entrada dos processos do pool (precisa ser uma função de módulo)
+    return estatisticas_bloco(*argumentos)
+
+
+def fatiar_sequencias(sequencias, observacoes_por_bloco=OBSERVACOES_POR_BLOCO):
+    """
+    Agrupa uma lista (ou qualquer iterável) de sequências 1-D de índices
+    em blocos (buffer, offsets) com ~observacoes_por_bloco observações.
+    """
+    bloco, tamanho = [], 0
+    for seq in sequencias:
+        seq = np.asarray(seq)
+        bloco.append(seq)
+        tamanho += len(seq)
+        if tamanho >= observacoes_por_bloco:
+            yield _juntar(bloco)
+            bloco, tamanho = [], 0
+    if bloco:
+        yield _juntar(bloco)
+
+
+def _juntar(sequencias):
+    offsets = np.zeros(len(sequencias) + 1, dtype=np.intp)
+    np.cumsum([len(s) for s in sequencias], out=offsets[1:])
+    return np.concatenate(sequencias), offsets
+
+
+def passo_e(fonte_blocos, pi, A, B, executor=None, max_pendentes=None):
+    """
+    Soma as estatísticas de todos os blocos. Com 'executor', os blocos são
+    enviados ao pool à medida que são lidos, com no máximo 'max_pendentes'
+    em voo, para não carregar a frota inteira na memória.
+    """
+    total = estatisticas_vazias(len(pi), np.shape(B)[1])
+    if executor is None:
+        for buffer, offsets in fonte_blocos:
+            somar_estatisticas(total, estatisticas_bloco(pi, A, B, buffer, offsets))
+        return total
+
+    pendentes = []
+    for buffer, offsets in fonte_blocos:
+        pendentes.append(executor.submit(_estatisticas_bloco_tarefa, (pi, A, B, buffer, offsets)))
+        if len(pendentes) >= max_pendentes:
+            somar_estatisticas(total, pendentes.pop(0).result())
+    for futuro in pendentes:
+        somar_estatisticas(total, futuro.result())
+    return total
+
+
+def passo_m(estat, pi_anterior, A_anterior, B_anterior, pseudocontagem=0.0):
+    """
+    Reestima (pi, A, B) a partir das contagens esperadas. A pseudocontagem
+    (suavização de Dirichlet) só é somada onde o parâmetro anterior é
+    positivo, preservando os zeros estruturais (ex.: Preso -> Base).
+    pi passa pela mesma normalização que as linhas de A e B; linhas com
+    total zero (sem contagens nem pseudocontagem) mantêm os valores anteriores.
+    """
+    def normalizar(contagens, anterior):
+        contagens = contagens + pseudocontagem * (anterior > 0)
+        totais = contagens.sum(axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            novo = contagens / totais
+        return np.where(totais > 0, novo, anterior)
+
+    pi = normalizar(estat['inicial'], pi_anterior)
+    A = normalizar(estat['transicoes'], A_anterior)
+    B = normalizar(estat['emissoes'], B_anterior)
+    return pi, A, B
+
+
+def treinar_baum_welch(fonte, pi, A, B, max_iter=100, tol=1e-6, n_processos=None,
+                       observacoes_por_bloco=OBSERVACOES_POR_BLOCO, pseudocontagem=0.0,
+                       verbose=True):
+    """
+    Baum-Welch (EM) com passo E em blocos e em paralelo.
+
+    fonte: lista de sequências 1-D de índices de observação, ou uma função
+           sem argumentos que devolve um iterável novo de blocos
+           (buffer, offsets) a cada chamada — a frota é relida a cada iteração.
+    pi, A, B: ponto de partida (warm start), ex.: as matrizes do RoboHMM.
+    tol: para quando a melhora relativa da log-verossimilhança fica abaixo de tol.
+    n_processos: tamanho do pool (None = os.cpu_count(); 1 = sem pool).
+
+    Retorna (pi, A, B, historico), em que historico lista a log-verossimilhança
+    de cada iteração (calculada com os parâmetros de entrada dessa iteração).
+    """
+    pi = np.asarray(pi, dtype=np.float64)
+    A = np.asarray(A, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    if callable(fonte):
+        gerar_blocos = fonte
+    else:
+        def gerar_blocos():
+            return fatiar_sequencias(fonte, observacoes_por_bloco)
+
+    n_processos = n_processos or os.cpu_count() or 1
+    executor = None
+    if n_processos > 1:
+        # Import tardio: o pool de processos só custa na partida de quem treina em paralelo
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=n_processos)
+    historico = []
+    try:
+        for iteracao in range(max_iter):
+            estat = passo_e(gerar_blocos(), pi, A, B, executor, max_pendentes=2 * n_processos)
+            log_veross = estat['log_verossimilhanca']
+            historico.append(log_veross)
+            if verbose:
+                print(f"Iteração {iteracao:3d}: log-verossimilhança = {log_veross:.4f} "
+                      f"({estat['n_sequencias']} sequências)")
+
+            if not np.isfinite(log_veross):
+                raise ValueError("Log-verossimilhança infinita: há observações impossíveis para o modelo inicial")
+            pi, A, B = passo_m(estat, pi, A, B, pseudocontagem)
+
+            if len(historico) > 1:
+                melhora = (historico[-1] - historico[-2]) / max(1.0, abs(historico[-2]))
+                if melhora < tol:
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return pi, A, B, historico
+
+
+def salvar_modelo(caminho, pi, A, B, estados, observacoes, historico=None):
+    """Salva o modelo ajustado em NPZ (pi, A, B e os nomes de estados/observações)."""
+    np.savez_compressed(
+        caminho, pi=pi, A=A, B=B,
+        estados=np.array(estados), observacoes=np.array(observacoes),
+        historico=np.array(historico if historico is not None else [], dtype=np.float64),
+    )
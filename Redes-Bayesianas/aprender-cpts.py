@@ -0,0 +1,112 @@
+# --- APRENDIZADO DAS CPTs A PARTIR DE REGISTROS DE PEDIDOS/AVALIAÇÕES ---
+# Mantém a estrutura de uma rede (.bif ou snapshot .npz) e reaprende as
+# CPTs por contagem (bn_aprendizado), em blocos e em paralelo. Sem dados
+# reais à mão, --sintetico N amostra N registros da própria rede (com
+# valores ausentes) e mostra o erro das CPTs aprendidas.
+#
+# Uso:  python aprender-cpts.py --csv registros.csv --saida modelo_aprendido.bif
+#       python aprender-cpts.py --dados pasta_com_npy --saida modelo_aprendido.npz --bdeu 10
+#       python aprender-cpts.py --sintetico 10000000 [--processos 4]
+# -----------------------------------------------------------------
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from bn_aprendizado import LINHAS_POR_BLOCO, aprender_cpts, blocos_csv, ler_colunas
+from bn_lote import AUSENTE
+from bn_snapshot import carregar_snapshot, salvar_snapshot
+from bn_xmlbif import escrever_xmlbif, ler_xmlbif
+
+MODELO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modelo_robos_final.bif')
+
+
+def amostrar(rede, n, rng, fracao_ausente=0.0):
+    """n registros por amostragem ancestral: {variável: índices int8}, com uma fração de ausentes."""
+    colunas = {}
+    for v in rede.variaveis:
+        probabilidades = rede.cpt(v)[tuple(colunas[p] for p in rede.pais[v])]
+        acumuladas = np.cumsum(probabilidades, axis=-1)
+        sorteio = rng.random((n, 1)) * acumuladas[..., -1:]
+        colunas[v] = np.minimum((sorteio >= acumuladas).sum(axis=-1), rede.cardinalidade(v) - 1).astype(np.int8)
+    if fracao_ausente:
+        # Ausentes só na saída: a amostragem dos filhos usa o valor verdadeiro
+        colunas = {v: np.where(rng.random(n) < fracao_ausente, AUSENTE, c).astype(np.int8)
+                   for v, c in colunas.items()}
+    return colunas
+
+
+def gerar_dados_sinteticos(rede, n, pasta, rng, fracao_ausente, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Grava n registros amostrados da rede como <variável>.npy em 'pasta', bloco a bloco."""
+    arquivos = {v: np.lib.format.open_memmap(os.path.join(pasta, f'{v}.npy'), mode='w+', dtype=np.int8, shape=(n,))
+                for v in rede.variaveis}
+    for inicio in range(0, n, linhas_por_bloco):
+        bloco = amostrar(rede, min(linhas_por_bloco, n - inicio), rng, fracao_ausente)
+        for v, coluna in bloco.items():
+            arquivos[v][inicio:inicio + len(coluna)] = coluna
+    for arquivo in arquivos.values():
+        arquivo.flush()
+
+
+def ler_modelo(caminho):
+    """(rede, propriedades do XMLBIF) de um .bif ou snapshot .npz."""
+    if caminho.lower().endswith('.npz'):
+        rede, _, propriedades = carregar_snapshot(caminho, com_propriedades=True)
+        return rede, propriedades
+    return ler_xmlbif(caminho, com_propriedades=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Aprende as CPTs da rede a partir de registros')
+    fonte = parser.add_mutually_exclusive_group(required=True)
+    fonte.add_argument('--csv', help='CSV com uma coluna por variável (nomes dos estados; vazio = ausente)')
+    fonte.add_argument('--dados', help='pasta com <variável>.npy de índices (-1 = ausente)')
+    fonte.add_argument('--sintetico', type=int, metavar='N', help='amostra N registros da própria rede')
+    parser.add_argument('--modelo', default=MODELO_PADRAO, help='estrutura (e CPTs de partida): .bif ou .npz')
+    parser.add_argument('--saida', help='onde gravar a rede aprendida (.bif ou .npz)')
+    parser.add_argument('--pseudocontagem', type=float, default=0.0, help='Dirichlet uniforme por célula')
+    parser.add_argument('--bdeu', type=float, metavar='ESS', help='priori BDeu com este tamanho de amostra equivalente')
+    parser.add_argument('--processos', type=int, default=None, help='tamanho do pool (padrão: nº de CPUs)')
+    parser.add_argument('--linhas-por-bloco', type=int, default=LINHAS_POR_BLOCO)
+    parser.add_argument('--ausentes', type=float, default=0.05, help='com --sintetico: fração de valores ausentes')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rede, propriedades = ler_modelo(args.modelo)
+    pasta_temporaria = None
+    if args.sintetico:
+        pasta_temporaria = tempfile.TemporaryDirectory(prefix='registros-')
+        inicio = time.perf_counter()
+        gerar_dados_sinteticos(rede, args.sintetico, pasta_temporaria.name, np.random.default_rng(args.semente),
+                               args.ausentes, args.linhas_por_bloco)
+        print(f"{args.sintetico} registros sintéticos gerados em {time.perf_counter() - inicio:.1f}s")
+        fonte = ler_colunas(pasta_temporaria.name)
+    elif args.dados:
+        fonte = ler_colunas(args.dados)
+    else:
+        fonte = blocos_csv(args.csv, rede, args.linhas_por_bloco)
+
+    inicio = time.perf_counter()
+    aprendida, contagens, linhas = aprender_cpts(fonte, rede, args.pseudocontagem, args.bdeu,
+                                                 n_processos=args.processos,
+                                                 linhas_por_bloco=args.linhas_por_bloco)
+    duracao = time.perf_counter() - inicio
+    print(f"{linhas} registros contados em {duracao:.2f}s ({linhas / duracao:,.0f} registros/s)")
+
+    print(f"\n{'variável':<22} | {'contagens':>10} | {'maior |Δ| vs modelo de partida':>30}")
+    print("-" * 70)
+    for v in rede.variaveis:
+        diferenca = float(np.abs(aprendida.cpt(v) - rede.cpt(v)).max())
+        print(f"{v:<22} | {int(contagens[v].sum()):>10} | {diferenca:30.4f}")
+
+    if args.saida:
+        if args.saida.lower().endswith('.npz'):
+            salvar_snapshot(args.saida, aprendida, propriedades=propriedades)
+        else:
+            escrever_xmlbif(aprendida, args.saida, propriedades)
+        print(f"\nRede aprendida salva em {args.saida}")
+    if pasta_temporaria is not None:
+        pasta_temporaria.cleanup()
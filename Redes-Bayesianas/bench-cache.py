@@ -0,0 +1,92 @@
+# --- BENCHMARK: CACHE DE CONSULTAS POR EVIDÊNCIA ---
+# Tráfego simulado do site: cada visita consulta P(Satisfacao_Final | e)
+# para uma de poucas centenas de configurações de evidência (popularidade
+# ~ Zipf). Compara o VariableElimination do pgmpy com o CacheConsultas
+# (motores pgmpy e numpy) e mostra a invalidação seletiva ao trocar CPTs.
+#
+# Uso:  python bench-cache.py [--visitas 5000] [--configuracoes 300] [--limite-kb 64]
+# -----------------------------------------------------------------
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import time
+
+import numpy as np
+
+from bn_cache import CacheConsultas
+
+ALVO = 'Satisfacao_Final'
+
+
+def carregar_v4():
+    """Importa o bn-satisfacaov4 (nome com hífen) e monta o modelo sem os prints."""
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bn-satisfacaov4.py')
+    spec = importlib.util.spec_from_file_location('bn_satisfacaov4', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(modulo)
+        return modulo.criar_modelo_decisao_refatorado()
+
+
+def trafego(rede, n_visitas, n_configuracoes, rng):
+    """Evidências das visitas: n_configuracoes distintas (subconjuntos das raízes), sorteadas por Zipf."""
+    configuracoes = []
+    for _ in range(n_configuracoes):
+        informadas = [v for v in rede.raizes if rng.random() < 0.7]
+        configuracoes.append({v: rede.estados[v][rng.integers(rede.cardinalidade(v))] for v in informadas})
+    populares = np.minimum(rng.zipf(1.2, n_visitas), n_configuracoes) - 1
+    return [configuracoes[i] for i in populares]
+
+
+def medir(inferencia, visitas):
+    inicio = time.perf_counter()
+    for evidencia in visitas:
+        inferencia.query([ALVO], evidence=evidencia, show_progress=False)
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do cache de consultas')
+    parser.add_argument('--visitas', type=int, default=5000)
+    parser.add_argument('--configuracoes', type=int, default=300)
+    parser.add_argument('--limite-kb', type=float, default=64.0, help='orçamento do cache')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    from pgmpy.inference import VariableElimination
+
+    rng = np.random.default_rng(args.semente)
+    modelo = carregar_v4()
+    limite = int(args.limite_kb * 1024)
+    caches = {motor: CacheConsultas.de_pgmpy(modelo, limite_bytes=limite, motor=motor)
+              for motor in ('pgmpy', 'numpy')}
+    rede = caches['numpy'].rede
+    visitas = trafego(rede, args.visitas, args.configuracoes, rng)
+    print(f"{args.visitas} visitas, {len({tuple(sorted(e.items())) for e in visitas})} configurações distintas, "
+          f"orçamento {args.limite_kb:.0f} KB\n")
+
+    t_ve = medir(VariableElimination(modelo), visitas)
+    print(f"  VariableElimination (sem cache): {t_ve:.3f}s")
+    for motor, cache in caches.items():
+        t = medir(cache, visitas)
+        est = cache.estatisticas()
+        print(f"  cache + motor {motor:<5}: {t:.3f}s ({t_ve / t:.1f}x) | acertos {est['taxa_acerto']:.1%}, "
+              f"{est['entradas']} entradas, {est['bytes'] / 1024:.1f} KB, {est['despejos']} despejos")
+
+    # --- Invalidação seletiva: consultas de dois alvos, depois troca de CPTs ---
+    cache = caches['numpy']
+    cache.limpar()
+    for evidencia in visitas[:500]:
+        cache.consultar([ALVO], evidencia)
+        cache.consultar(['Qualidade_Limpeza'], evidencia)
+    print("\nTroca de CPTs (entradas descartadas / restantes):")
+    # Navegacao é raiz: entradas que a observam não dependem da priori dela e ficam
+    for variavel in (ALVO, 'Navegacao'):
+        antes = cache.invalidacoes
+        cpt = cache.rede.cpt(variavel)
+        cache.rede.definir_cpt(variavel, 0.5 * cpt + 0.5 / cpt.shape[-1])
+        cache.sincronizar()
+        print(f"  {variavel:<17}: {cache.invalidacoes - antes:>4} / {cache.estatisticas()['entradas']}")
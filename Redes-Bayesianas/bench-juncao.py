@@ -0,0 +1,100 @@
+# --- BENCHMARK: ÁRVORE DE JUNÇÃO x UMA ELIMINAÇÃO POR VARIÁVEL ---
+# Posteriores de Qualidade_Limpeza, Risco_Problema, Satisfacao_Uso,
+# Satisfacao_PosVenda e Satisfacao_Final para uma sequência de
+# evidências em que cada passo troca uma única variável (um usuário
+# mexendo nos filtros do site). Compara:
+#   - pgmpy VariableElimination: uma query por variável;
+#   - ArvoreJuncao recalibrando do zero a cada evidência;
+#   - ArvoreJuncao incremental (só as mensagens afetadas).
+#
+# Uso:  python bench-juncao.py [--passos 300]
+# -----------------------------------------------------------------
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import time
+
+import numpy as np
+
+from bn_juncao import ArvoreJuncao
+from bn_rede import RedeDiscreta
+
+ALVOS = ['Qualidade_Limpeza', 'Risco_Problema', 'Satisfacao_Uso', 'Satisfacao_PosVenda', 'Satisfacao_Final']
+
+
+def carregar_v4():
+    """Importa o bn-satisfacaov4 (nome com hífen) e monta o modelo sem os prints."""
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bn-satisfacaov4.py')
+    spec = importlib.util.spec_from_file_location('bn_satisfacaov4', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(modulo)
+        return modulo.criar_modelo_decisao_refatorado()
+
+
+def sequencia_de_filtros(rede, passos, rng):
+    """Evidências sucessivas nas raízes; cada passo troca (ou retira) uma variável."""
+    evidencia = {}
+    sequencia = []
+    for _ in range(passos):
+        v = rede.raizes[rng.integers(len(rede.raizes))]
+        if v in evidencia and rng.random() < 0.2:
+            del evidencia[v]
+        else:
+            evidencia[v] = rede.estados[v][rng.integers(rede.cardinalidade(v))]
+        sequencia.append(dict(evidencia))
+    return sequencia
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark da árvore de junção')
+    parser.add_argument('--passos', type=int, default=300)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    from pgmpy.inference import VariableElimination
+
+    modelo = carregar_v4()
+    rede = RedeDiscreta.de_pgmpy(modelo)
+    sequencia = sequencia_de_filtros(rede, args.passos, np.random.default_rng(args.semente))
+
+    inicio = time.perf_counter()
+    arvore = ArvoreJuncao(rede)
+    t_compilar = time.perf_counter() - inicio
+    print(f"Árvore de junção: {len(arvore.cliques)} cliques, compilada em {t_compilar * 1000:.2f} ms")
+    for i, clique in enumerate(arvore.cliques):
+        print(f"  C{i}: {', '.join(clique)}")
+
+    inferencia = VariableElimination(modelo)
+    inicio = time.perf_counter()
+    via_ve = []
+    for evidencia in sequencia:
+        via_ve.append({v: inferencia.query([v], evidence=evidencia or None, show_progress=False).values
+                       for v in ALVOS})
+    t_ve = time.perf_counter() - inicio
+
+    do_zero = ArvoreJuncao(rede)
+    inicio = time.perf_counter()
+    for evidencia in sequencia:
+        do_zero.definir_evidencia(evidencia)
+        do_zero.descartar_mensagens()
+        do_zero.marginais(ALVOS)
+    t_zero = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    via_arvore = []
+    for evidencia in sequencia:
+        arvore.definir_evidencia(evidencia)
+        via_arvore.append(arvore.marginais(ALVOS))
+    t_incremental = time.perf_counter() - inicio
+
+    diferenca = max(float(np.abs(a[v] - b[v]).max()) for a, b in zip(via_ve, via_arvore) for v in ALVOS)
+    n_arestas = 2 * (len(arvore.cliques) - 1)
+    print(f"\n{args.passos} evidências x {len(ALVOS)} posteriores (maior diferença {diferenca:.1e}):")
+    print(f"  VariableElimination, uma query por variável: {t_ve:.3f}s")
+    print(f"  árvore recalibrada do zero:                  {t_zero:.3f}s ({t_ve / t_zero:.0f}x)")
+    print(f"  árvore incremental:                          {t_incremental:.3f}s ({t_ve / t_incremental:.0f}x), "
+          f"{arvore.mensagens_calculadas / args.passos:.1f} de {n_arestas} mensagens por passo")
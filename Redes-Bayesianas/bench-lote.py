@@ -0,0 +1,93 @@
+# --- BENCHMARK: CONSULTAS EM LOTE (CATÁLOGO DE ANÚNCIOS) ---
+# Gera um catálogo sintético de N anúncios com as raízes do
+# bn-satisfacaov4 (algumas colunas com valores ausentes) e mede quantos
+# anúncios por segundo a ConsultaLote ranqueia por P(Satisfacao_Final =
+# Alta), contra um laço de inferencia.query do pgmpy numa amostra.
+#
+# Uso:  python bench-lote.py [--max 1000000] [--amostra 200] [--ausentes 0.1]
+# -----------------------------------------------------------------
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import time
+
+import numpy as np
+
+from bn_lote import AUSENTE, ConsultaLote
+from bn_rede import RedeDiscreta
+
+ALVO = 'Satisfacao_Final'
+
+
+def carregar_v4():
+    """Importa o bn-satisfacaov4 (nome com hífen) e monta o modelo sem os prints."""
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bn-satisfacaov4.py')
+    spec = importlib.util.spec_from_file_location('bn_satisfacaov4', caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(modulo)
+        return modulo.criar_modelo_decisao_refatorado()
+
+
+def catalogo(rede, n, fracao_ausente, rng):
+    """Colunas {raiz: índices int8} com uma fração de valores ausentes (-1)."""
+    colunas = {}
+    for v in rede.raizes:
+        coluna = rng.integers(0, rede.cardinalidade(v), n).astype(np.int8)
+        coluna[rng.random(n) < fracao_ausente] = AUSENTE
+        colunas[v] = coluna
+    return colunas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark das consultas em lote')
+    parser.add_argument('--max', type=int, default=10**6, help='maior catálogo')
+    parser.add_argument('--amostra', type=int, default=200, help='consultas pgmpy na linha de base')
+    parser.add_argument('--ausentes', type=float, default=0.1, help='fração de valores ausentes')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    from pgmpy.inference import VariableElimination
+
+    rng = np.random.default_rng(args.semente)
+    modelo = carregar_v4()
+    rede = RedeDiscreta.de_pgmpy(modelo)
+    inferencia = VariableElimination(modelo)
+
+    # --- Linha de base: uma inferencia.query por anúncio ---
+    amostra = catalogo(rede, args.amostra, args.ausentes, rng)
+    inicio = time.perf_counter()
+    referencia = np.empty(args.amostra)
+    for i in range(args.amostra):
+        evidencia = {v: rede.estados[v][c[i]] for v, c in amostra.items() if c[i] != AUSENTE}
+        resultado = inferencia.query(variables=[ALVO], evidence=evidencia, show_progress=False)
+        referencia[i] = resultado.values[resultado.state_names[ALVO].index('Alta')]
+    por_seg_ve = args.amostra / (time.perf_counter() - inicio)
+
+    lote = ConsultaLote(rede, ALVO)
+    confere = np.allclose(lote.probabilidades(amostra, 'Alta'), referencia)
+    print(f"pgmpy VE, {args.amostra} anúncios: {por_seg_ve:,.0f} anúncios/s "
+          f"(lote confere: {'sim' if confere else 'NÃO'})\n")
+
+    print(f"{'N':>9} | {'lote (frio)':>11} | {'lote (quente)':>13} | {'anúncios/s':>12} | {'vs VE':>8}")
+    print("-" * 66)
+    n = 1000
+    while n <= args.max:
+        colunas = catalogo(rede, n, args.ausentes, rng)
+        lote = ConsultaLote(rede, ALVO)  # frio: compila as tabelas de cada padrão
+        inicio = time.perf_counter()
+        lote.probabilidades(colunas, 'Alta')
+        frio = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        lote.probabilidades(colunas, 'Alta')
+        quente = time.perf_counter() - inicio
+        print(f"{n:>9} | {frio:10.3f}s | {quente:12.3f}s | {n / quente:12,.0f} | {n / quente / por_seg_ve:7.0f}x")
+        n *= 10
+
+    print("\nTop 5 do último catálogo por P(Satisfacao_Final = Alta):")
+    for indice, p in lote.ranking(colunas, 'Alta', k=5):
+        descricao = ', '.join(f"{v}={rede.estados[v][c[indice]]}" for v, c in colunas.items() if c[indice] != AUSENTE)
+        print(f"  #{indice}: {p:.4f}  ({descricao})")
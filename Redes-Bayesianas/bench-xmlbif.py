@@ -0,0 +1,97 @@
+# --- BENCHMARK: XMLBIF EM FLUXO x pgmpy ---
+# Redes sintéticas de 10, 1.000 e 10.000 nós (até 3 pais entre os nós
+# anteriores, 2 a 4 estados, CPTs ~ Dirichlet). Mede escrita e leitura
+# com o bn_xmlbif e com XMLBIFWriter/XMLBIFReader do pgmpy, e o pico de
+# memória das duas leituras (tracemalloc, numa passada separada).
+#
+# Uso:  python bench-xmlbif.py [--nos 10 1000 10000] [--max-pgmpy 10000]
+# -----------------------------------------------------------------
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from bn_rede import RedeDiscreta
+from bn_xmlbif import escrever_xmlbif, ler_xmlbif
+
+
+def rede_sintetica(n_nos, rng, max_pais=3):
+    """RedeDiscreta aleatória com n_nos variáveis (pais sempre entre os nós anteriores)."""
+    estados, pais, cpts = {}, {}, {}
+    for i in range(n_nos):
+        v = f'X{i}'
+        estados[v] = [f's{k}' for k in range(rng.integers(2, 5))]
+        candidatos = range(max(0, i - 50), i)  # pais próximos: cliques pequenos como numa rede real
+        pais[v] = [f'X{j}' for j in rng.choice(candidatos, size=min(len(candidatos), rng.integers(0, max_pais + 1)),
+                                               replace=False)] if i else []
+        formato = [len(estados[p]) for p in pais[v]] + [len(estados[v])]
+        cpts[v] = rng.dirichlet(np.ones(formato[-1]), size=formato[:-1] or None).reshape(formato)
+    return RedeDiscreta(estados, pais, cpts)
+
+
+def mesma_rede(a, b):
+    """Mesmos estados, pais e CPTs (a ordem topológica pode diferir entre leitores)."""
+    return (a.estados == b.estados and a.pais == b.pais
+            and all(np.array_equal(a.cpt(v), b.cpt(v)) for v in a.variaveis))
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+def pico_memoria(funcao):
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def ler_pgmpy(caminho):
+    from pgmpy.readwrite import XMLBIFReader
+    return XMLBIFReader(caminho).get_model()
+
+
+def escrever_pgmpy(modelo, caminho):
+    from pgmpy.readwrite import XMLBIFWriter
+    XMLBIFWriter(model=modelo).write_xmlbif(filename=caminho)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark do XMLBIF em fluxo')
+    parser.add_argument('--nos', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--max-pgmpy', type=int, default=10000, help='maior rede medida também com o pgmpy')
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    pasta = tempfile.mkdtemp(prefix='bench-xmlbif-')
+    print(f"{'nós':>6} | {'arquivo':>9} | {'motor':>8} | {'escrita':>8} | {'leitura':>8} | {'pico leitura':>12} | "
+          f"{'confere':>7}")
+    print("-" * 78)
+    for n in args.nos:
+        rede = rede_sintetica(n, rng)
+        caminho = os.path.join(pasta, f'rede_{n}.bif')
+        t_escrita, _ = cronometrar(lambda: escrever_xmlbif(rede, caminho))
+        t_leitura, lida = cronometrar(lambda: ler_xmlbif(caminho))
+        pico = pico_memoria(lambda: ler_xmlbif(caminho))
+        confere = 'sim' if mesma_rede(lida, rede) else 'NÃO'
+        tamanho = f"{os.path.getsize(caminho) / 2**20:.2f} MB"
+        print(f"{n:>6} | {tamanho:>9} | {'fluxo':>8} | {t_escrita:7.3f}s | {t_leitura:7.3f}s | "
+              f"{pico / 2**20:9.1f} MB | {confere:>7}")
+
+        if n <= args.max_pgmpy:
+            modelo = rede.para_pgmpy()
+            caminho_pgmpy = os.path.join(pasta, f'rede_{n}_pgmpy.bif')
+            t_escrita, _ = cronometrar(lambda: escrever_pgmpy(modelo, caminho_pgmpy))
+            t_leitura, lido = cronometrar(lambda: ler_pgmpy(caminho_pgmpy))
+            pico = pico_memoria(lambda: ler_pgmpy(caminho_pgmpy))
+            confere = 'sim' if mesma_rede(RedeDiscreta.de_pgmpy(lido), rede) else 'NÃO'
+            print(f"{'':>6} | {'':>9} | {'pgmpy':>8} | {t_escrita:7.3f}s | {t_leitura:7.3f}s | "
+                  f"{pico / 2**20:9.1f} MB | {confere:>7}")
@@ -6,16 +6,16 @@
 # um fator que influencia o 'Risco_Problema'.
 # -----------------------------------------------------------------
 
+import itertools
 import os
+import time
 import traceback
 
 print("DEBUG: Iniciando importações...")
 try:
     from pgmpy.models import DiscreteBayesianNetwork as BayesianNetwork
     from pgmpy.factors.discrete import TabularCPD
-    from pgmpy.inference import VariableElimination
-    from pgmpy.readwrite import XMLBIFWriter
-    print("DEBUG: Importações do 'pgmpy' (core e XMLBIFWriter) OK.")
+    print("DEBUG: Importações do 'pgmpy' (core) OK.")
 except ImportError as e:
     print("="*50); print("!!! ERRO CRÍTICO: Falha ao importar o 'pgmpy'. !!!"); print(f"Detalhe do Erro: {e}"); print("="*50)
     traceback.print_exc()
@@ -25,6 +25,12 @@ except Exception as e:
     traceback.print_exc()
     exit()
 
+from bn_cache import CacheConsultas
+from bn_compilado import TabelaPosterior
+from bn_rede import RedeDiscreta
+from bn_snapshot import salvar_snapshot
+from bn_xmlbif import escrever_xmlbif, ler_xmlbif
+
 def criar_modelo_decisao_refatorado():
     """
     Cria e retorna o modelo da Rede Bayesiana (refatorado) para a
@@ -294,21 +300,54 @@ def realizar_inferencias_fixas(inferencia):
     
     print(f"\nDecisão (Baseline): O modelo {resultados_ordenados[0][0]} oferece a maior probabilidade de satisfação.")
 
+def comparar_tabela_compilada(modelo):
+    """
+    Compila P(Satisfacao_Final | 7 raízes) para as 576 combinações de uma
+    vez e confere cada uma contra um VariableElimination puro (sem o cache
+    de consultas, para o tempo ser o do pgmpy e as estatísticas do cache
+    refletirem só as consultas da demonstração).
+    """
+    from pgmpy.inference import VariableElimination
+
+    print("\n" + "="*50)
+    print("6. Tabela Compilada (todas as combinações das raízes)")
+    print("="*50)
+
+    rede = RedeDiscreta.de_pgmpy(modelo)
+    tabela = TabelaPosterior(rede, 'Satisfacao_Final')
+    inicio = time.perf_counter()
+    tabela.compilar()
+    t_compilar = time.perf_counter() - inicio
+    print(f"Raízes: {tabela.evidencias}")
+    print(f"Tabela {tabela.tabela.shape} compilada em {t_compilar*1000:.2f} ms")
+
+    combinacoes = [dict(zip(tabela.evidencias, estados))
+                   for estados in itertools.product(*(rede.estados[v] for v in tabela.evidencias))]
+    inferencia = VariableElimination(modelo)
+    inicio = time.perf_counter()
+    via_ve = [inferencia.query(['Satisfacao_Final'], evidence=ev, show_progress=False).values
+              for ev in combinacoes]
+    t_ve = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    via_tabela = [tabela.consultar(ev) for ev in combinacoes]
+    t_tabela = time.perf_counter() - inicio
+
+    diferenca = max(float(abs(a - b).max()) for a, b in zip(via_ve, via_tabela))
+    print(f"{len(combinacoes)} consultas: VariableElimination {t_ve:.3f}s | tabela {t_tabela*1000:.2f} ms "
+          f"(maior diferença {diferenca:.1e})")
+    return tabela
+
 # --- FUNÇÃO DE EXPORTAÇÃO ---
 def exportar_modelo(modelo, nome_arquivo="modelo_robos_final.bif"):
     """
     Exporta o modelo Bayesiano completo (DAG + CPTs) para um
     arquivo .bif (XML), que pode ser aberto por softwares visuais
-    como o GeNIe.
+    como o GeNIe. A escrita é em fluxo (bn_xmlbif) e mantém as
+    posições dos nós de um arquivo anterior, se houver.
     """
     print(f"\n" + "="*50)
     print("7. Exportando modelo para visualização (formato XMLBIF)...")
     print("="*50)
-    
-    if XMLBIFWriter is None:
-        print("!!! EXPORTAÇÃO INTERROMPIDA !!!")
-        print("O 'XMLBIFWriter' não pôde ser importado.")
-        return
 
     try:
         try:
@@ -318,8 +357,10 @@ def exportar_modelo(modelo, nome_arquivo="modelo_robos_final.bif"):
             
         caminho_completo = os.path.join(script_dir, nome_arquivo)
 
-        writer = XMLBIFWriter(model=modelo)
-        writer.write_xmlbif(filename=caminho_completo)
+        propriedades = None
+        if os.path.exists(caminho_completo):
+            _, propriedades = ler_xmlbif(caminho_completo, com_propriedades=True)
+        escrever_xmlbif(RedeDiscreta.de_pgmpy(modelo), caminho_completo, propriedades)
         
         print(f"Sucesso! Modelo salvo como:")
         print(f"{caminho_completo}")
@@ -327,20 +368,43 @@ def exportar_modelo(modelo, nome_arquivo="modelo_robos_final.bif"):
     
     except Exception as e:
         print(f"!!! ERRO AO EXPORTAR O MODELO !!!")
-        print("A importação funcionou, mas a escrita falhou.")
         traceback.print_exc()
 
 
+def exportar_snapshot(tabela, nome_arquivo="modelo_robos_final.npz"):
+    """
+    Salva a rede e a tabela compilada num snapshot binário (bn_snapshot),
+    que um processo de consulta carrega em milissegundos sem o pgmpy.
+    """
+    print(f"\n" + "="*50)
+    print("8. Exportando snapshot binário (.npz)...")
+    print("="*50)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    caminho_completo = os.path.join(script_dir, nome_arquivo)
+    # Mesmas posições do GeNIe do .bif exportado no passo 7, se houver
+    caminho_bif = os.path.join(script_dir, os.path.splitext(nome_arquivo)[0] + '.bif')
+    propriedades = ler_xmlbif(caminho_bif, com_propriedades=True)[1] if os.path.exists(caminho_bif) else None
+    salvar_snapshot(caminho_completo, tabela.rede, tabela, propriedades=propriedades)
+    print(f"Snapshot salvo em: {caminho_completo} ({os.path.getsize(caminho_completo) / 1024:.1f} KB)")
+    print(f"Para consultar: python converter-modelo.py --info {nome_arquivo} --evidencia Marca=Xiaomi ...")
+
+
 # --- Função Principal ---
 if __name__ == "__main__":
     modelo_robos = criar_modelo_decisao_refatorado()
     
     if modelo_robos:
-        print("\nCriando objeto de inferência (VariableElimination)...")
-        inferencia_global = VariableElimination(modelo_robos)
+        print("\nCriando objeto de inferência (VariableElimination com cache de consultas)...")
+        # Mesma interface de query; consultas repetidas saem do cache LRU
+        inferencia_global = CacheConsultas.de_pgmpy(modelo_robos, motor='pgmpy')
         
         realizar_inferencias_fixas(inferencia_global)
+
+        tabela_compilada = comparar_tabela_compilada(modelo_robos)
+        print(f"\nCache de consultas: {inferencia_global.estatisticas()}")
         
         exportar_modelo(modelo_robos)
+        exportar_snapshot(tabela_compilada)
     else:
         print("\nO script não pôde continuar porque o modelo Bayesiano falhou na verificação.")
\ No newline at end of file
@@ -0,0 +1,178 @@
+# --- APRENDIZADO DAS CPTs (MLE / DIRICHLET) A PARTIR DE REGISTROS ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# As CPTs do bn-satisfacaov4 foram calibradas à mão. Com a estrutura
+# fixa, aprender os parâmetros é só contar: para cada variável, quantas
+# vezes cada (configuração dos pais, estado) aparece nos registros. Os
+# registros chegam em blocos de colunas de índices (-1 = ausente); cada
+# configuração da família vira um índice plano e um np.bincount conta o
+# bloco inteiro de uma vez. Os blocos são distribuídos entre processos
+# (como o passo E do hmm_treino) e só as contagens voltam para somar.
+# Linhas com algum valor ausente na família não contam para aquela CPT;
+# índices fora de [-1, card) são erro (ValueError com a coluna e o valor).
+# -----------------------------------------------------------------
+
+import os
+
+import numpy as np
+
+from bn_rede import RedeDiscreta
+
+# Registros por bloco (cada processo só tem um bloco na memória por vez)
+LINHAS_POR_BLOCO = 1_000_000
+
+
+def familias(rede):
+    """{variável: (família (pais..., variável), formato da CPT)}: tudo que os processos precisam."""
+    return {v: (tuple(rede.pais[v] + [v]), rede.cpt(v).shape) for v in rede.variaveis}
+
+
+def contagens_vazias(familias_rede):
+    return {v: np.zeros(formato, dtype=np.int64) for v, (_, formato) in familias_rede.items()}
+
+
+def somar_contagens(total, parcial):
+    for v, contagem in parcial.items():
+        total[v] += contagem
+
+
+def contar_bloco(familias_rede, bloco):
+    """
+    Contagens de um bloco {variável: array de índices (-1 = ausente)}.
+    Variáveis cuja família não está toda no bloco ficam com contagem zero.
+    """
+    contagens = contagens_vazias(familias_rede)
+    cardinalidades = {v: formato[-1] for v, (_, formato) in familias_rede.items()}
+    for x, coluna in bloco.items():
+        if x in cardinalidades:
+            coluna = np.asarray(coluna)
+            invalidos = (coluna < -1) | (coluna >= cardinalidades[x])
+            if invalidos.any():
+                raise ValueError(f"Coluna '{x}' com índice de estado {int(coluna[invalidos][0])} "
+                                 f"fora de [-1, {cardinalidades[x]})")
+    for v, (familia, formato) in familias_rede.items():
+        if any(x not in bloco for x in familia):
+            continue
+        # Índice plano da configuração (pais..., variável), como em np.ravel_multi_index
+        plano = np.zeros(len(bloco[v]), dtype=np.int64)
+        valido = np.ones(len(bloco[v]), dtype=bool)
+        for x, tamanho in zip(familia, formato):
+            coluna = np.asarray(bloco[x])
+            plano *= tamanho
+            plano += coluna
+            valido &= coluna >= 0
+        if not valido.all():
+            plano = plano[valido]
+        contagens[v] = np.bincount(plano, minlength=int(np.prod(formato))).reshape(formato)
+    return contagens
+
+
+def _contar_bloco_tarefa(argumentos):
+    # Ponto de entrada dos processos do pool (precisa ser uma função de módulo)
+    return contar_bloco(*argumentos)
+
+
+def fatiar_colunas(colunas, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Blocos {variável: fatia} de um conjunto de colunas do mesmo tamanho (arrays ou memmaps)."""
+    n = len(next(iter(colunas.values())))
+    for inicio in range(0, n, linhas_por_bloco):
+        yield {v: np.asarray(c[inicio:inicio + linhas_por_bloco]) for v, c in colunas.items()}
+
+
+def ler_colunas(pasta):
+    """Colunas salvas como <variável>.npy numa pasta, abertas como memmap (nada é lido ainda)."""
+    return {os.path.splitext(nome)[0]: np.load(os.path.join(pasta, nome), mmap_mode='r')
+            for nome in sorted(os.listdir(pasta)) if nome.endswith('.npy')}
+
+
+def blocos_csv(caminho, rede, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Blocos de colunas codificadas lidos de um CSV com nomes de estado (vazio = ausente). Usa pandas."""
+    import pandas as pd
+
+    from bn_lote import codificar_colunas
+
+    for tabela in pd.read_csv(caminho, chunksize=linhas_por_bloco, dtype=str, keep_default_na=False):
+        colunas = {}
+        for v in tabela.columns:
+            if v in rede.estados:
+                valores = tabela[v].to_numpy(dtype=object)
+                valores[valores == ''] = None
+                colunas[v] = valores
+        yield codificar_colunas(rede, colunas)
+
+
+def contar(fonte_blocos, familias_rede, executor=None, max_pendentes=None):
+    """
+    Soma as contagens de todos os blocos. Com 'executor', os blocos são
+    enviados ao pool à medida que são lidos, com no máximo 'max_pendentes'
+    em voo. Retorna (contagens, número de linhas).
+    """
+    total = contagens_vazias(familias_rede)
+    linhas = 0
+    if executor is None:
+        for bloco in fonte_blocos:
+            somar_contagens(total, contar_bloco(familias_rede, bloco))
+            linhas += len(next(iter(bloco.values())))
+        return total, linhas
+
+    pendentes = []
+    for bloco in fonte_blocos:
+        pendentes.append(executor.submit(_contar_bloco_tarefa, (familias_rede, bloco)))
+        linhas += len(next(iter(bloco.values())))
+        if len(pendentes) >= max_pendentes:
+            somar_contagens(total, pendentes.pop(0).result())
+    for futuro in pendentes:
+        somar_contagens(total, futuro.result())
+    return total, linhas
+
+
+def estimar_cpts(contagens, rede, pseudocontagem=0.0, amostra_equivalente=None):
+    """
+    CPTs a partir das contagens: MLE (pseudocontagem=0), Dirichlet uniforme
+    (pseudocontagem por célula) ou BDeu (amostra_equivalente distribuída
+    entre as células de cada CPT). Configurações dos pais sem nenhuma
+    contagem nos dados mantêm a distribuição atual da rede, com ou sem
+    priori (a suavização não as torna uniformes).
+    """
+    cpts = {}
+    for v in rede.variaveis:
+        # Testado nas contagens brutas, antes de somar a priori
+        vistas = contagens[v].sum(axis=-1, keepdims=True) > 0
+        contagem = contagens[v].astype(np.float64)
+        alfa = pseudocontagem if amostra_equivalente is None else amostra_equivalente / contagem.size
+        contagem += alfa
+        totais = contagem.sum(axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cpt = contagem / totais
+        cpts[v] = np.where(vistas, cpt, rede.cpt(v))
+    return cpts
+
+
+def aprender_cpts(fonte, rede, pseudocontagem=0.0, amostra_equivalente=None, n_processos=None,
+                  linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Aprende as CPTs da estrutura de 'rede' a partir dos registros.
+
+    fonte: {variável: coluna de índices} (arrays ou memmaps de ler_colunas),
+           ou um iterável de blocos nesse formato (ex.: blocos_csv).
+    n_processos: tamanho do pool (None = os.cpu_count(); 1 = sem pool).
+
+    Retorna (RedeDiscreta com as CPTs aprendidas, contagens, número de linhas).
+    """
+    blocos = fatiar_colunas(fonte, linhas_por_bloco) if isinstance(fonte, dict) else fonte
+    familias_rede = familias(rede)
+    n_processos = n_processos or os.cpu_count() or 1
+    executor = None
+    if n_processos > 1:
+        # Import tardio: o pool de processos só custa na partida de quem aprende em paralelo
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=n_processos)
+    try:
+        contagens, linhas = contar(blocos, familias_rede, executor, max_pendentes=2 * n_processos)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    cpts = estimar_cpts(contagens, rede, pseudocontagem, amostra_equivalente)
+    return RedeDiscreta(rede.estados, rede.pais, cpts), contagens, linhas
@@ -0,0 +1,176 @@
+# --- CACHE DE CONSULTAS POR EVIDÊNCIA (LRU) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# No tráfego do site poucas centenas de configurações dominam, mas cada
+# inferencia.query refaz a eliminação inteira. O CacheConsultas fica na
+# frente do motor (eliminação em NumPy do bn_eliminacao, ou o
+# VariableElimination do pgmpy) e memoriza a resposta por
+#   (impressão digital das CPTs relevantes, variáveis, evidência canônica)
+# com despejo LRU quando o total passa de 'limite_bytes'.
+#
+# "Relevantes" são as CPTs de que a resposta depende de fato: as dos
+# ancestrais das variáveis consultadas/observadas, menos a priori das
+# raízes observadas. Ao trocar uma CPT (RedeDiscreta.definir_cpt) só as
+# entradas que dependem dela são descartadas; as demais continuam valendo.
+# -----------------------------------------------------------------
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from bn_eliminacao import ancestrais, consultar
+from bn_rede import RedeDiscreta
+
+# Orçamento padrão do cache e custo fixo estimado por entrada (chave, tupla, dict)
+LIMITE_BYTES = 8 * 1024 * 1024
+CUSTO_ENTRADA = 400
+
+
+class CacheConsultas:
+    """
+    Memoização de P(variaveis | evidencia) sobre uma RedeDiscreta.
+    motor='numpy' usa bn_eliminacao.consultar; motor='pgmpy' usa um
+    VariableElimination sobre rede.para_pgmpy() (refeito quando a rede muda).
+    As distribuições devolvidas são somente leitura (compartilhadas com o cache).
+    """
+
+    def __init__(self, rede, limite_bytes=LIMITE_BYTES, motor='numpy'):
+        if motor not in ('numpy', 'pgmpy'):
+            raise ValueError(f"motor deve ser 'numpy' ou 'pgmpy', recebido '{motor}'")
+        self.rede = rede
+        self.limite_bytes = int(limite_bytes)
+        self.motor = motor
+        self._entradas = OrderedDict()  # chave -> (distribuição, relevantes, bytes)
+        self._versao = None             # rede.versao com que _digestos foi calculado
+        self._digestos = {}             # variável -> blake2b da CPT
+        self._inferencia = None
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+        self.invalidacoes = 0
+
+    @classmethod
+    def de_pgmpy(cls, modelo, **kwargs):
+        """Cache sobre a RedeDiscreta lida de um modelo pgmpy (as edições passam a ser pela rede)."""
+        return cls(RedeDiscreta.de_pgmpy(modelo), **kwargs)
+
+    # --- Versões ---
+
+    def sincronizar(self):
+        """Recalcula os digestos das CPTs se a rede mudou e descarta as entradas afetadas."""
+        if self._versao == self.rede.versao:
+            return
+        digestos = {v: hashlib.blake2b(self.rede.cpt(v).tobytes(), digest_size=16).digest()
+                    for v in self.rede.variaveis}
+        alteradas = {v for v in digestos if self._digestos.get(v) != digestos[v]}
+        if self._versao is not None and alteradas:
+            self.invalidar(alteradas)
+        self._digestos, self._versao = digestos, self.rede.versao
+        self._inferencia = None
+
+    def invalidar(self, variaveis=None):
+        """Descarta as entradas que dependem da CPT de alguma das 'variaveis' (todas se None)."""
+        if variaveis is None:
+            self.invalidacoes += len(self._entradas)
+            self.limpar()
+            return
+        variaveis = set(variaveis)
+        for chave in [c for c, (_, relevantes, _) in self._entradas.items() if relevantes & variaveis]:
+            _, _, liberado = self._entradas.pop(chave)
+            self.bytes_usados -= liberado
+            self.invalidacoes += 1
+
+    def relevantes(self, variaveis, evidencia):
+        """CPTs de que P(variaveis | evidencia) depende (evidencia já codificada)."""
+        return frozenset(v for v in ancestrais(self.rede, list(variaveis) + list(evidencia))
+                         if not (v in evidencia and not self.rede.pais[v]))
+
+    def chave(self, variaveis, evidencia):
+        """
+        blake2b(digestos das CPTs relevantes, variáveis ordenadas, evidência
+        ordenada em índices) em bytes, e o conjunto de relevantes.
+        """
+        self.sincronizar()
+        evidencia = self.rede.codificar_evidencia(evidencia or {})
+        relevantes = self.relevantes(variaveis, evidencia)
+        resumo = hashlib.blake2b(digest_size=16)
+        for v in self.rede.variaveis:
+            if v in relevantes:
+                resumo.update(self._digestos[v])
+        resumo.update(repr((sorted(variaveis), sorted(evidencia.items()))).encode('utf-8'))
+        return resumo.digest(), relevantes
+
+    # --- Consultas ---
+
+    def _calcular(self, variaveis, evidencia):
+        if self.motor == 'numpy':
+            return consultar(self.rede, variaveis, evidencia)
+        if self._inferencia is None:
+            from pgmpy.inference import VariableElimination
+            self._inferencia = VariableElimination(self.rede.para_pgmpy())
+        nomes = {v: self.rede.estados[v][i] for v, i in self.rede.codificar_evidencia(evidencia).items()}
+        fator = self._inferencia.query(list(variaveis), evidence=nomes or None, show_progress=False)
+        return np.transpose(fator.values, [fator.variables.index(v) for v in variaveis])
+
+    def consultar(self, variaveis, evidencia=None):
+        """
+        P(variaveis | evidencia) conjunta, normalizada, eixos na ordem de
+        'variaveis' (como bn_eliminacao.consultar), do cache quando possível.
+        """
+        variaveis = list(variaveis)
+        evidencia = evidencia or {}
+        chave, relevantes = self.chave(variaveis, evidencia)
+        # O cache guarda os eixos em ordem alfabética: a mesma consulta com as variáveis em outra ordem acerta
+        ordenadas = sorted(variaveis)
+        eixos = [ordenadas.index(v) for v in variaveis]
+        entrada = self._entradas.get(chave)
+        if entrada is not None:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return np.transpose(entrada[0], eixos)
+
+        self.faltas += 1
+        distribuicao = np.array(self._calcular(ordenadas, evidencia), dtype=np.float64)
+        distribuicao.flags.writeable = False
+        tamanho = distribuicao.nbytes + CUSTO_ENTRADA
+        if tamanho <= self.limite_bytes:
+            self._entradas[chave] = (distribuicao, relevantes, tamanho)
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.limite_bytes:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self.bytes_usados -= liberado
+                self.despejos += 1
+        return np.transpose(distribuicao, eixos)
+
+    def query(self, variables, evidence=None, joint=True, show_progress=False, **kwargs):
+        """
+        Mesma assinatura do VariableElimination.query (substituto direto nos
+        scripts): devolve um DiscreteFactor do pgmpy, ou {variável: fator}
+        com joint=False. Demais argumentos do pgmpy são ignorados.
+        """
+        from pgmpy.factors.discrete import DiscreteFactor
+
+        def fator(variaveis):
+            valores = self.consultar(variaveis, evidence)
+            return DiscreteFactor(variaveis, valores.shape, valores.copy(),
+                                  state_names={v: self.rede.estados[v] for v in variaveis})
+
+        if joint:
+            return fator(list(variables))
+        return {v: fator([v]) for v in variables}
+
+    def limpar(self):
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def estatisticas(self):
+        consultas = self.acertos + self.faltas
+        return {
+            'entradas': len(self._entradas), 'bytes': self.bytes_usados, 'limite_bytes': self.limite_bytes,
+            'acertos': self.acertos, 'faltas': self.faltas, 'despejos': self.despejos,
+            'invalidacoes': self.invalidacoes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,93 @@
+# --- TABELA DE POSTERIORES PRÉ-COMPILADA (EVIDÊNCIA COMPLETA NAS RAÍZES) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# No bn-satisfacaov4 toda consulta informa as sete raízes (Marca,
+# Navegacao, Tipo_Mop, Base_Limpeza, Mercado_Cinza, Avaliacao_Loja,
+# Valor_Investimento): só existem 4·2·2·2·2·3·3 = 576 respostas distintas
+# para Satisfacao_Final. A compilação calcula todas de uma vez (uma
+# eliminação de variáveis mantendo os eixos das evidências) e guarda um
+# array denso (card das evidências..., card do alvo); cada consulta passa
+# a ser uma indexação O(1).
+#
+# A tabela guarda a 'versao' da RedeDiscreta com que foi compilada e
+# recompila sozinha na próxima consulta se alguma CPT mudar.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from bn_eliminacao import ancestrais, eliminar, fatores_da_rede
+
+# Maior tabela compilada aceita (células = Π card das evidências · card do alvo)
+LIMITE_CELULAS = 10**7
+
+
+class TabelaPosterior:
+    """
+    P(alvo | evidencias) para todas as combinações das variáveis de
+    evidência (padrão: todas as raízes da rede).
+    """
+
+    def __init__(self, rede, alvo, evidencias=None, limite_celulas=LIMITE_CELULAS):
+        self.rede = rede
+        self.alvo = alvo
+        self.evidencias = list(rede.raizes if evidencias is None else evidencias)
+        if alvo in self.evidencias:
+            raise ValueError(f"O alvo '{alvo}' não pode estar entre as evidências")
+        celulas = rede.cardinalidade(alvo) * int(np.prod([rede.cardinalidade(v) for v in self.evidencias]))
+        if celulas > limite_celulas:
+            raise ValueError(f"Tabela com {celulas} células passa do limite ({limite_celulas})")
+        self._tabela = None
+        self._versao = None
+
+    @classmethod
+    def de_array(cls, rede, alvo, evidencias, tabela):
+        """Tabela já compilada (ex.: lida de um snapshot) valendo para a versão atual da rede."""
+        tabela = np.array(tabela, dtype=np.float64)
+        compilada = cls(rede, alvo, evidencias, limite_celulas=tabela.size)
+        formato = tuple(rede.cardinalidade(v) for v in compilada.evidencias + [alvo])
+        if tabela.shape != formato:
+            raise ValueError(f"Tabela deve ter shape {formato}, recebido {tabela.shape}")
+        tabela.flags.writeable = False
+        compilada._tabela, compilada._versao = tabela, rede.versao
+        return compilada
+
+    def compilar(self):
+        """Recalcula a tabela inteira a partir das CPTs atuais."""
+        rede = self.rede
+        manter = self.evidencias + [self.alvo]
+        # Raízes observadas dispensam a priori: P(alvo | e) não depende dela
+        sem_priori = {v for v in self.evidencias if not rede.pais[v]}
+        fatores = fatores_da_rede(rede, ancestrais(rede, manter), sem_priori=sem_priori)
+        conjunta = eliminar(fatores, manter, {v: rede.cardinalidade(v) for v in manter})
+        total = conjunta.sum(axis=-1, keepdims=True)
+        # Combinações de evidência impossíveis ficam NaN
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tabela = np.where(total > 0, conjunta / total, np.nan)
+        tabela.flags.writeable = False
+        self._tabela, self._versao = tabela, rede.versao
+        return tabela
+
+    @property
+    def tabela(self):
+        """Array (card das evidências..., card do alvo), recompilado se a rede mudou."""
+        if self._tabela is None or self._versao != self.rede.versao:
+            self.compilar()
+        return self._tabela
+
+    def indices(self, evidencia):
+        """{variável: estado} com todas as variáveis de evidência -> tupla de índices."""
+        faltando = [v for v in self.evidencias if v not in evidencia]
+        extras = [v for v in evidencia if v not in self.evidencias]
+        if faltando or extras:
+            raise ValueError(f"A evidência deve conter exatamente {self.evidencias} "
+                             f"(faltando {faltando}, sobrando {extras})")
+        return tuple(self.rede.indice_estado(v, evidencia[v]) for v in self.evidencias)
+
+    def consultar(self, evidencia):
+        """Distribuição P(alvo | evidencia), vetor (card do alvo,)."""
+        return self.tabela[self.indices(evidencia)]
+
+    def probabilidade(self, evidencia, estado):
+        """P(alvo = estado | evidencia) como float."""
+        return float(self.consultar(evidencia)[self.rede.indice_estado(self.alvo, estado)])
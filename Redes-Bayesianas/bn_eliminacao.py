@@ -0,0 +1,106 @@
+# --- ELIMINAÇÃO DE VARIÁVEIS EM NUMPY (FATORES COMO TENSORES) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Núcleo de inferência exata sobre uma RedeDiscreta sem pgmpy. Um fator é
+# um par (tensor, variáveis), um eixo por variável. Cada eliminação
+# multiplica os fatores que contêm a variável e soma o eixo dela em uma
+# única chamada np.einsum. Variáveis que não são ancestrais das
+# consultadas/observadas são podadas antes (as CPTs delas somam 1).
+# -----------------------------------------------------------------
+
+import numpy as np
+
+
+def ancestrais(rede, variaveis):
+    """Conjunto com 'variaveis' e todos os seus ancestrais."""
+    vistos = set()
+    pilha = list(variaveis)
+    while pilha:
+        v = pilha.pop()
+        if v not in vistos:
+            vistos.add(v)
+            pilha.extend(rede.pais[v])
+    return vistos
+
+
+def fatores_da_rede(rede, relevantes, evidencia=None, sem_priori=()):
+    """
+    Um fator por CPT das variáveis 'relevantes'. 'evidencia' ({var: índice})
+    fatia os eixos observados; as raízes em 'sem_priori' ficam sem fator
+    (condicionar numa raiz observada dispensa a priori dela).
+    """
+    evidencia = evidencia or {}
+    fatores = []
+    for v in rede.variaveis:
+        if v not in relevantes or v in sem_priori:
+            continue
+        eixos = rede.pais[v] + [v]
+        fatia = tuple(evidencia.get(x, slice(None)) for x in eixos)
+        fatores.append((rede.cpt(v)[fatia], tuple(x for x in eixos if x not in evidencia)))
+    return fatores
+
+
+def multiplicar(fatores, saida):
+    """Produto dos fatores somando tudo que não está em 'saida' (uma chamada einsum)."""
+    rotulos = {}
+    argumentos = []
+    for tensor, variaveis in fatores:
+        argumentos += [tensor, [rotulos.setdefault(v, len(rotulos)) for v in variaveis]]
+    argumentos.append([rotulos[v] for v in saida])
+    return np.einsum(*argumentos, optimize=len(fatores) > 2)
+
+
+def eliminar(fatores, manter, cardinalidades=None):
+    """
+    Soma todas as variáveis fora de 'manter' do produto dos fatores, em ordem
+    gulosa (a eliminação que gera o menor fator primeiro). Retorna o tensor
+    não normalizado com os eixos na ordem de 'manter'.
+    """
+    fatores = list(fatores)
+    manter = tuple(manter)
+    card = dict(cardinalidades or {})
+    for tensor, variaveis in fatores:
+        card.update(zip(variaveis, tensor.shape))
+    faltando = [v for v in manter if v not in card]
+    if faltando:
+        raise ValueError(f"Variáveis a manter que não aparecem em nenhum fator: {faltando}")
+    restantes = {v for _, variaveis in fatores for v in variaveis} - set(manter)
+
+    while restantes:
+        def custo(v):
+            uniao = set().union(*(vs for _, vs in fatores if v in vs))
+            return int(np.prod([card[x] for x in uniao - {v}]))
+        v = min(sorted(restantes), key=custo)
+        envolvidos = [f for f in fatores if v in f[1]]
+        fatores = [f for f in fatores if v not in f[1]]
+        uniao = []
+        for _, variaveis in envolvidos:
+            uniao += [x for x in variaveis if x != v and x not in uniao]
+        fatores.append((multiplicar(envolvidos, uniao), tuple(uniao)))
+        restantes.discard(v)
+
+    # Variáveis mantidas que não aparecem em fator algum (ex.: raiz sem priori) ficam constantes
+    presentes = [v for v in manter if any(v in vs for _, vs in fatores)]
+    resultado = multiplicar(fatores, presentes) if fatores else np.ones(())
+    forma = [card[v] if v in presentes else 1 for v in manter]
+    return np.broadcast_to(resultado.reshape(forma), tuple(card[v] for v in manter)).copy()
+
+
+def consultar(rede, variaveis, evidencia=None):
+    """
+    P(variaveis | evidencia) conjunta, normalizada, com eixos na ordem de
+    'variaveis'. 'evidencia' aceita nomes ou índices dos estados.
+    """
+    evidencia = rede.codificar_evidencia(evidencia or {})
+    variaveis = list(variaveis)
+    repetidas = [v for v in variaveis if v in evidencia]
+    if repetidas:
+        raise ValueError(f"Variáveis consultadas também estão na evidência: {repetidas}")
+    relevantes = ancestrais(rede, variaveis + list(evidencia))
+    fatores = fatores_da_rede(rede, relevantes, evidencia)
+    conjunta = eliminar(fatores, variaveis, {v: rede.cardinalidade(v) for v in variaveis})
+    total = conjunta.sum()
+    if total <= 0:
+        raise ValueError(f"Evidência com probabilidade nula: {evidencia}")
+    return conjunta / total
@@ -0,0 +1,240 @@
+# --- ÁRVORE DE JUNÇÃO (SHAFER-SHENOY) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Para ter as posteriores de várias variáveis (Qualidade_Limpeza,
+# Risco_Problema, Satisfacao_Uso, ...) uma eliminação por variável repete
+# quase todo o trabalho. A árvore de junção é compilada uma vez:
+#   1) moralização + triangulação gulosa (menor preenchimento);
+#   2) cliques maximais ligados por uma árvore geradora máxima (tamanho
+#      dos separadores), cada CPT atribuída ao menor clique que a contém.
+# Uma calibração (coleta + distribuição de mensagens) dá a marginal de
+# todas as variáveis de uma vez.
+#
+# As mensagens ficam guardadas entre calibrações. Trocar a evidência de
+# uma variável só invalida as mensagens que saem do clique onde ela está
+# (as que apontam para longe dele); as demais são reaproveitadas.
+# -----------------------------------------------------------------
+
+import itertools
+
+import numpy as np
+
+from bn_eliminacao import multiplicar
+
+
+def triangular(rede):
+    """
+    Moraliza o grafo e elimina as variáveis em ordem gulosa (menor número
+    de arestas de preenchimento, desempate pelo menor clique). Retorna os
+    cliques maximais como tuplas na ordem de rede.variaveis.
+    """
+    vizinhos = {v: set() for v in rede.variaveis}
+    for v in rede.variaveis:
+        familia = rede.pais[v] + [v]
+        for a, b in itertools.combinations(familia, 2):
+            vizinhos[a].add(b)
+            vizinhos[b].add(a)
+
+    def preenchimento(v):
+        return sum(1 for a, b in itertools.combinations(vizinhos[v], 2) if b not in vizinhos[a])
+
+    def peso(v):
+        return int(np.prod([rede.cardinalidade(x) for x in vizinhos[v] | {v}]))
+
+    posicao = {v: i for i, v in enumerate(rede.variaveis)}
+    cliques = []
+    restantes = set(rede.variaveis)
+    while restantes:
+        v = min(sorted(restantes, key=posicao.get), key=lambda x: (preenchimento(x), peso(x)))
+        clique = vizinhos[v] | {v}
+        if not any(clique <= c for c in cliques):
+            cliques.append(clique)
+        for a, b in itertools.combinations(vizinhos[v], 2):
+            vizinhos[a].add(b)
+            vizinhos[b].add(a)
+        for x in vizinhos[v]:
+            vizinhos[x].discard(v)
+        restantes.discard(v)
+    return [tuple(sorted(c, key=posicao.get)) for c in cliques]
+
+
+class ArvoreJuncao:
+    """
+    Motor de inferência exata por árvore de junção sobre uma RedeDiscreta.
+    Uso: definir_evidencia({...}) / atualizar_evidencia(var, estado) e
+    marginais(). Recompila os potenciais sozinho se alguma CPT mudar.
+    """
+
+    def __init__(self, rede):
+        self.rede = rede
+        self.cliques = triangular(rede)
+        n = len(self.cliques)
+
+        # Árvore geradora máxima pelo tamanho do separador (Kruskal); separadores
+        # vazios ligam componentes desconexas
+        componente = list(range(n))
+
+        def raiz(i):
+            while componente[i] != i:
+                componente[i] = componente[componente[i]]
+                i = componente[i]
+            return i
+
+        pares = sorted(itertools.combinations(range(n), 2),
+                       key=lambda p: -len(set(self.cliques[p[0]]) & set(self.cliques[p[1]])))
+        self.vizinhos = {i: [] for i in range(n)}
+        self.separadores = {}
+        for i, j in pares:
+            if raiz(i) != raiz(j):
+                componente[raiz(i)] = raiz(j)
+                self.vizinhos[i].append(j)
+                self.vizinhos[j].append(i)
+                separador = tuple(v for v in self.cliques[i] if v in self.cliques[j])
+                self.separadores[(i, j)] = self.separadores[(j, i)] = separador
+
+        # Clique de cada variável: o menor que a contém (ali ficam a evidência e a marginal)
+        self.clique_de = {v: min((i for i in range(n) if v in self.cliques[i]),
+                                 key=lambda i: self._tamanho(i))
+                          for v in rede.variaveis}
+        # Ordem de coleta (filhos antes dos pais) a partir do clique 0
+        self._coleta = []
+        visitados = {0}
+        pilha = [(0, None)]
+        while pilha:
+            i, pai = pilha.pop()
+            if pai is not None:
+                self._coleta.append((i, pai))
+            for j in self.vizinhos[i]:
+                if j not in visitados:
+                    visitados.add(j)
+                    pilha.append((j, i))
+        self._coleta.reverse()
+
+        self.evidencia = {}
+        self._mensagens = {}
+        self._marginais = None
+        self._versao = None
+        self.mensagens_calculadas = 0
+
+    def _tamanho(self, i):
+        return int(np.prod([self.rede.cardinalidade(v) for v in self.cliques[i]]))
+
+    def _compilar_potenciais(self):
+        """Potencial de cada clique = produto das CPTs atribuídas a ele."""
+        rede = self.rede
+        fatores = {i: [] for i in range(len(self.cliques))}
+        for v in rede.variaveis:
+            familia = set(rede.pais[v]) | {v}
+            dono = min((i for i, c in enumerate(self.cliques) if familia <= set(c)), key=self._tamanho)
+            fatores[dono].append((rede.cpt(v), tuple(rede.pais[v] + [v])))
+        self._potenciais = []
+        for i, clique in enumerate(self.cliques):
+            uniforme = (np.ones([rede.cardinalidade(v) for v in clique]), clique)
+            self._potenciais.append(multiplicar([uniforme] + fatores[i], clique))
+        self.descartar_mensagens()
+        self._versao = rede.versao
+
+    # --- Evidência ---
+
+    def _invalidar_a_partir(self, clique):
+        """Descarta as mensagens que apontam para longe de 'clique' (dependem do que há nele)."""
+        pilha = [(clique, None)]
+        while pilha:
+            i, anterior = pilha.pop()
+            for j in self.vizinhos[i]:
+                if j != anterior:
+                    self._mensagens.pop((i, j), None)
+                    pilha.append((j, i))
+        self._marginais = None
+
+    def atualizar_evidencia(self, variavel, estado):
+        """Observa (ou, com estado None, retira) uma variável; só a parte afetada é re-propagada."""
+        atual = self.evidencia.get(variavel)
+        novo = None if estado is None else self.rede.indice_estado(variavel, estado)
+        if novo == atual:
+            return
+        if novo is None:
+            del self.evidencia[variavel]
+        else:
+            self.evidencia[variavel] = novo
+        self._invalidar_a_partir(self.clique_de[variavel])
+
+    def definir_evidencia(self, evidencia):
+        """Troca o conjunto de evidência inteiro (variáveis que não mudaram não invalidam nada)."""
+        evidencia = self.rede.codificar_evidencia(evidencia or {})
+        for v in list(self.evidencia):
+            if v not in evidencia:
+                self.atualizar_evidencia(v, None)
+        for v, estado in evidencia.items():
+            self.atualizar_evidencia(v, estado)
+
+    # --- Propagação ---
+
+    def _fatores_locais(self, i):
+        fatores = [(self._potenciais[i], self.cliques[i])]
+        for v, estado in self.evidencia.items():
+            if self.clique_de[v] == i:
+                indicador = np.zeros(self.rede.cardinalidade(v))
+                indicador[estado] = 1.0
+                fatores.append((indicador, (v,)))
+        return fatores
+
+    def _mensagem(self, i, j):
+        if (i, j) not in self._mensagens:
+            fatores = self._fatores_locais(i)
+            fatores += [(self._mensagens[(k, i)], self.separadores[(k, i)]) for k in self.vizinhos[i] if k != j]
+            mensagem = multiplicar(fatores, self.separadores[(i, j)])
+            # Renormaliza para não estourar/zerar em redes grandes (não muda as marginais)
+            total = mensagem.sum()
+            self._mensagens[(i, j)] = mensagem / total if total > 0 else mensagem
+            self.mensagens_calculadas += 1
+        return self._mensagens[(i, j)]
+
+    def descartar_mensagens(self):
+        """Esquece todas as mensagens: a próxima calibração é completa."""
+        self._mensagens = {}
+        self._marginais = None
+
+    def calibrar(self):
+        """Coleta e distribuição, recalculando só as mensagens invalidadas."""
+        if self._versao != self.rede.versao:
+            self._compilar_potenciais()
+        for i, j in self._coleta:
+            self._mensagem(i, j)
+        for j, i in reversed(self._coleta):
+            self._mensagem(i, j)
+
+    def crenca(self, i):
+        """Crença (não normalizada) do clique i: potencial · evidência · mensagens recebidas."""
+        self.calibrar()
+        fatores = self._fatores_locais(i)
+        fatores += [(self._mensagens[(k, i)], self.separadores[(k, i)]) for k in self.vizinhos[i]]
+        return multiplicar(fatores, self.cliques[i])
+
+    def marginais(self, variaveis=None):
+        """
+        {variável: P(variável | evidência)} para 'variaveis' (padrão: todas).
+        Observadas saem como indicadoras. Calibra uma vez por evidência.
+        """
+        if self._marginais is None or self._versao != self.rede.versao:
+            self.calibrar()
+            marginais = {}
+            for i, clique in enumerate(self.cliques):
+                donas = [v for v in clique if self.clique_de[v] == i]
+                if not donas:
+                    continue
+                crenca = self.crenca(i)
+                total = crenca.sum()
+                if total <= 0:
+                    raise ValueError(f"Evidência com probabilidade nula: {self.evidencia}")
+                for v in donas:
+                    eixo = clique.index(v)
+                    marginais[v] = crenca.sum(axis=tuple(e for e in range(len(clique)) if e != eixo)) / total
+            self._marginais = marginais
+        if variaveis is None:
+            variaveis = self.rede.variaveis
+        return {v: self._marginais[v] for v in variaveis}
+
+    def marginal(self, variavel):
+        return self.marginais([variavel])[variavel]
@@ -0,0 +1,138 @@
+# --- CONSULTAS EM LOTE (CATÁLOGO INTEIRO DE ANÚNCIOS) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Em vez de um inferencia.query por anúncio, a evidência chega em colunas:
+# {variável: array (N,) de índices de estado}, com -1 para "não
+# informado". As linhas são agrupadas pelo padrão de colunas informadas;
+# para cada padrão compila-se uma TabelaPosterior (bn_compilado) e as
+# respostas de todas as linhas saem de uma única indexação avançada.
+# Padrões cuja tabela seria grande demais caem para uma eliminação por
+# combinação distinta de evidência (np.unique), nunca uma por linha.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from bn_compilado import LIMITE_CELULAS, TabelaPosterior
+from bn_eliminacao import consultar
+
+AUSENTE = -1
+
+
+def codificar_colunas(rede, colunas):
+    """
+    {variável: sequência de nomes de estado (None = ausente)} ->
+    {variável: array int8/int16 de índices, -1 para ausente}.
+    """
+    codificadas = {}
+    for v, valores in colunas.items():
+        if v not in rede.estados:
+            raise ValueError(f"Coluna de variável desconhecida: '{v}'")
+        # Como texto, None vira 'None': um único np.unique resolve nomes e ausentes
+        unicos, inversos = np.unique(np.asarray(valores, dtype=object).astype(str), return_inverse=True)
+        mapa = np.array([AUSENTE if u == 'None' else rede.indice_estado(v, u) for u in unicos])
+        dtype = np.int8 if rede.cardinalidade(v) < 128 else np.int16
+        codificadas[v] = mapa[inversos].astype(dtype)
+    return codificadas
+
+
+def top_k(probabilidades, k, rotulos=None):
+    """
+    Os k maiores valores em ordem decrescente: lista de (índice ou rótulo, probabilidade).
+    NaN (evidência impossível) nunca entra no ranking.
+    """
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    validos = np.flatnonzero(~np.isnan(probabilidades))
+    k = min(k, len(validos))
+    if k == 0:
+        return []
+    melhores = validos[np.argpartition(-probabilidades[validos], k - 1)[:k]]
+    melhores = melhores[np.argsort(-probabilidades[melhores], kind='stable')]
+    return [(rotulos[i] if rotulos is not None else int(i), float(probabilidades[i])) for i in melhores]
+
+
+class ConsultaLote:
+    """
+    P(alvo | evidência de cada linha) para tabelas colunares. As tabelas
+    compiladas por padrão de colunas ficam guardadas entre chamadas (e se
+    recompilam sozinhas quando uma CPT da rede muda).
+    """
+
+    def __init__(self, rede, alvo, limite_celulas=LIMITE_CELULAS):
+        self.rede = rede
+        self.alvo = alvo
+        self.limite_celulas = limite_celulas
+        self._tabelas = {}
+
+    def _tabela(self, variaveis):
+        if variaveis not in self._tabelas:
+            celulas = self.rede.cardinalidade(self.alvo) * int(np.prod(
+                [self.rede.cardinalidade(v) for v in variaveis]))
+            self._tabelas[variaveis] = (TabelaPosterior(self.rede, self.alvo, list(variaveis))
+                                        if celulas <= self.limite_celulas else None)
+        return self._tabelas[variaveis]
+
+    def _validar(self, colunas):
+        if not colunas:
+            raise ValueError("Informe ao menos uma coluna de evidência")
+        if self.alvo in colunas:
+            raise ValueError(f"O alvo '{self.alvo}' não pode ser coluna de evidência")
+        desconhecidas = [v for v in colunas if v not in self.rede.estados]
+        if desconhecidas:
+            raise ValueError(f"Colunas de variáveis desconhecidas: {desconhecidas}")
+        tamanhos = {len(c) for c in colunas.values()}
+        if len(tamanhos) > 1:
+            raise ValueError(f"As colunas devem ter o mesmo tamanho, recebido {sorted(tamanhos)}")
+        # Ordem fixa das colunas (a da rede), para o padrão não depender do dict
+        nomes = [v for v in self.rede.variaveis if v in colunas]
+        matriz = np.stack([np.asarray(colunas[v]) for v in nomes], axis=1)
+        for j, v in enumerate(nomes):
+            coluna = matriz[:, j]
+            if np.any((coluna < AUSENTE) | (coluna >= self.rede.cardinalidade(v))):
+                raise ValueError(f"Coluna '{v}' com índices fora de [-1, {self.rede.cardinalidade(v)})")
+        return nomes, matriz
+
+    def distribuicoes(self, colunas):
+        """(N, card do alvo): a distribuição do alvo para cada linha (NaN se a evidência é impossível)."""
+        nomes, matriz = self._validar(colunas)
+        N = len(matriz)
+        saida = np.empty((N, self.rede.cardinalidade(self.alvo)))
+        informadas = matriz != AUSENTE
+        if len(nomes) < 63:
+            # Padrão de cada linha como máscara de bits: np.unique em inteiros é bem mais rápido que axis=0
+            mascaras = informadas @ np.left_shift(np.int64(1), np.arange(len(nomes), dtype=np.int64))
+            _, primeiras, grupo = np.unique(mascaras, return_index=True, return_inverse=True)
+            padroes = informadas[primeiras]
+        else:
+            padroes, grupo = np.unique(informadas, axis=0, return_inverse=True)
+        grupo = grupo.reshape(-1)
+        for g, padrao in enumerate(padroes):
+            linhas = np.flatnonzero(grupo == g) if len(padroes) > 1 else np.arange(N)
+            colunas_padrao = np.flatnonzero(padrao)
+            variaveis = tuple(nomes[j] for j in colunas_padrao)
+            indices = matriz[np.ix_(linhas, colunas_padrao)]
+            tabela = self._tabela(variaveis)
+            if tabela is not None:
+                saida[linhas] = tabela.tabela[tuple(indices.T)]
+            else:
+                saida[linhas] = self._por_combinacao(variaveis, indices)
+        return saida
+
+    def _por_combinacao(self, variaveis, indices):
+        """Uma eliminação por combinação distinta de evidência (padrões grandes demais para tabela)."""
+        unicas, inversos = np.unique(indices, axis=0, return_inverse=True)
+        respostas = np.empty((len(unicas), self.rede.cardinalidade(self.alvo)))
+        for i, linha in enumerate(unicas):
+            try:
+                respostas[i] = consultar(self.rede, [self.alvo], dict(zip(variaveis, linha.tolist())))
+            except ValueError:
+                respostas[i] = np.nan
+        return respostas[inversos.reshape(-1)]
+
+    def probabilidades(self, colunas, estado):
+        """(N,): P(alvo = estado | evidência) de cada linha."""
+        return self.distribuicoes(colunas)[:, self.rede.indice_estado(self.alvo, estado)]
+
+    def ranking(self, colunas, estado, k=10, rotulos=None):
+        """Os k anúncios com maior P(alvo = estado): lista de (rótulo ou índice, probabilidade)."""
+        return top_k(self.probabilidades(colunas, estado), k, rotulos)
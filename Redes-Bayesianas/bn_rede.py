@@ -0,0 +1,167 @@
+# --- REDE BAYESIANA DISCRETA (SOMENTE NUMPY) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Representação neutra da rede usada pelos motores rápidos (tabela
+# compilada, consultas em lote, cache...): nomes dos estados, pais e
+# uma CPT por variável como array NumPy com eixos (pais..., variável),
+# isto é, cpt[pa_1, ..., pa_k, x] = P(x | pa_1, ..., pa_k). É a mesma
+# ordem da TABLE do XMLBIF (o estado da variável varia mais rápido).
+#
+# As CPTs ficam somente leitura: toda mudança passa por definir_cpt, que
+# incrementa 'versao'. Quem guarda resultados derivados (tabelas
+# compiladas, caches) compara a versão e recalcula sozinho.
+# pgmpy só é importado por de_pgmpy / para_pgmpy.
+# -----------------------------------------------------------------
+
+import hashlib
+import json
+
+import numpy as np
+
+
+class RedeDiscreta:
+    """
+    estados: {variável: [nomes dos estados]}
+    pais:    {variável: [pais]} (variáveis ausentes são raízes)
+    cpts:    {variável: array (card dos pais..., card da variável)}
+    """
+
+    def __init__(self, estados, pais, cpts):
+        self.estados = {str(v): [str(e) for e in nomes] for v, nomes in estados.items()}
+        self.pais = {v: [str(p) for p in pais.get(v, [])] for v in self.estados}
+        for v, lista in self.pais.items():
+            desconhecidos = [p for p in lista if p not in self.estados]
+            if desconhecidos:
+                raise ValueError(f"Pais desconhecidos de '{v}': {desconhecidos}")
+        self.variaveis = self._ordem_topologica()
+        self.mapa_estados = {v: {e: i for i, e in enumerate(nomes)} for v, nomes in self.estados.items()}
+        self.versao = 0
+        self._cpts = {}
+        faltando = [v for v in self.variaveis if v not in cpts]
+        if faltando:
+            raise ValueError(f"Variáveis sem CPT: {faltando}")
+        for v in self.variaveis:
+            self._instalar(v, cpts[v])
+
+    def _ordem_topologica(self):
+        """Variáveis com todos os pais antes dos filhos (Kahn); erro se houver ciclo."""
+        faltam = {v: len(p) for v, p in self.pais.items()}
+        filhos = {v: [] for v in self.estados}
+        for v, lista in self.pais.items():
+            for p in lista:
+                filhos[p].append(v)
+        prontas = [v for v in self.estados if faltam[v] == 0]
+        ordem = []
+        while prontas:
+            v = prontas.pop(0)
+            ordem.append(v)
+            for f in filhos[v]:
+                faltam[f] -= 1
+                if faltam[f] == 0:
+                    prontas.append(f)
+        if len(ordem) != len(self.estados):
+            raise ValueError("O grafo da rede tem ciclo")
+        return ordem
+
+    def _instalar(self, variavel, valores):
+        formato = tuple(self.cardinalidade(p) for p in self.pais[variavel]) + (self.cardinalidade(variavel),)
+        cpt = np.array(valores, dtype=np.float64)  # cópia: o chamador não altera a CPT por fora
+        if cpt.shape != formato:
+            raise ValueError(f"CPT de '{variavel}' deve ter shape {formato} (pais..., variável), "
+                             f"recebido {cpt.shape}")
+        # Mesma tolerância de np.allclose, sem o custo fixo dele (pesa ao carregar milhares de CPTs)
+        if cpt.min() < 0 or np.abs(cpt.sum(axis=-1) - 1.0).max() > 1e-5 + 1e-8:
+            raise ValueError(f"CPT de '{variavel}': valores não-negativos e cada distribuição deve somar 1")
+        cpt.flags.writeable = False
+        self._cpts[variavel] = cpt
+
+    # --- Acesso ---
+
+    def cardinalidade(self, variavel):
+        return len(self.estados[variavel])
+
+    def cpt(self, variavel):
+        """CPT (somente leitura) com eixos (pais..., variável)."""
+        return self._cpts[variavel]
+
+    def definir_cpt(self, variavel, valores):
+        """Troca a CPT de uma variável (mesmo layout de cpt()) e invalida os derivados."""
+        if variavel not in self.estados:
+            raise ValueError(f"Variável desconhecida: '{variavel}'")
+        self._instalar(variavel, valores)
+        self.versao += 1
+
+    @property
+    def raizes(self):
+        return [v for v in self.variaveis if not self.pais[v]]
+
+    def filhos(self, variavel):
+        return [v for v in self.variaveis if variavel in self.pais[v]]
+
+    def indice_estado(self, variavel, estado):
+        """Nome (ou índice) do estado -> índice inteiro."""
+        if isinstance(estado, (int, np.integer)):
+            if not 0 <= estado < self.cardinalidade(variavel):
+                raise ValueError(f"Estado {estado} fora do intervalo de '{variavel}'")
+            return int(estado)
+        try:
+            return self.mapa_estados[variavel][estado]
+        except KeyError:
+            raise ValueError(f"Estado '{estado}' desconhecido para '{variavel}' "
+                             f"(esperado um de {self.estados.get(variavel)})") from None
+
+    def codificar_evidencia(self, evidencia):
+        """{variável: estado (nome ou índice)} -> {variável: índice}."""
+        desconhecidas = [v for v in evidencia if v not in self.estados]
+        if desconhecidas:
+            raise ValueError(f"Variáveis de evidência desconhecidas: {desconhecidas}")
+        return {v: self.indice_estado(v, e) for v, e in evidencia.items()}
+
+    def impressao_digital(self):
+        """sha256 (hex) da estrutura, dos nomes e das CPTs."""
+        estrutura = [[v, self.estados[v], self.pais[v]] for v in self.variaveis]
+        resumo = hashlib.sha256(json.dumps(estrutura).encode('utf-8'))
+        for v in self.variaveis:
+            resumo.update(self._cpts[v].tobytes())
+        return resumo.hexdigest()
+
+    # --- Conversão pgmpy <-> RedeDiscreta ---
+
+    @classmethod
+    def de_pgmpy(cls, modelo):
+        """Lê estrutura, nomes dos estados e CPTs de um modelo pgmpy (DiscreteBayesianNetwork)."""
+        estados, pais, cpts = {}, {}, {}
+        for cpd in modelo.get_cpds():
+            v = cpd.variable
+            estados[v] = list(cpd.state_names[v])
+        for cpd in modelo.get_cpds():
+            v = cpd.variable
+            pais[v] = list(cpd.variables[1:])
+            # pgmpy: eixos (variável, pais...); aqui: (pais..., variável)
+            valores = np.moveaxis(np.asarray(cpd.get_values(), dtype=np.float64).reshape(cpd.cardinality), 0, -1)
+            # Alinha a ordem dos estados dos pais com a da CPT de cada pai
+            for eixo, p in enumerate(pais[v]):
+                ordem = [list(cpd.state_names[p]).index(e) for e in estados[p]]
+                valores = np.take(valores, ordem, axis=eixo)
+            cpts[v] = valores
+        return cls(estados, pais, cpts)
+
+    def para_pgmpy(self):
+        """Modelo pgmpy equivalente (importa pgmpy)."""
+        from pgmpy.factors.discrete import TabularCPD
+        from pgmpy.models import DiscreteBayesianNetwork
+
+        modelo = DiscreteBayesianNetwork([(p, v) for v in self.variaveis for p in self.pais[v]])
+        modelo.add_nodes_from(self.variaveis)
+        for v in self.variaveis:
+            pais = self.pais[v]
+            card = self.cardinalidade(v)
+            # TabularCPD espera (card, Π card dos pais) com o primeiro pai variando mais devagar
+            valores = np.moveaxis(self._cpts[v], -1, 0).reshape(card, -1)
+            modelo.add_cpds(TabularCPD(
+                variable=v, variable_card=card, values=valores,
+                evidence=pais or None, evidence_card=[self.cardinalidade(p) for p in pais] or None,
+                state_names={x: self.estados[x] for x in [v] + pais},
+            ))
+        return modelo
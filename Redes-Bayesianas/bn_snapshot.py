@@ -0,0 +1,102 @@
+# --- SNAPSHOT BINÁRIO DA REDE (.npz) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# Cada bn-satisfacao*.py remonta a rede com TabularCPD, chama
+# check_model() e importa o pgmpy inteiro antes da primeira consulta. O
+# snapshot guarda a RedeDiscreta em arrays planos num .npz (sem pickle):
+#   variaveis             nomes, em ordem topológica
+#   n_estados, estados    cardinalidades e nomes dos estados concatenados
+#   n_pais, pais          nº de pais e índices dos pais concatenados
+#   cpts                  todas as CPTs achatadas (layout de RedeDiscreta.cpt)
+#   n_propriedades,       <PROPERTY> do XMLBIF por variável (ex.: posições
+#   propriedades          do GeNIe), para a volta .npz -> .bif não perdê-las
+# e, opcionalmente, uma TabelaPosterior já compilada (tabela_*). Ler o
+# snapshot só importa NumPy: o processo de consulta fica pronto em
+# milissegundos. A conversão de/para XMLBIF fica no bn_xmlbif.
+# -----------------------------------------------------------------
+
+import numpy as np
+
+from bn_compilado import TabelaPosterior
+from bn_rede import RedeDiscreta
+
+VERSAO_FORMATO = 1
+
+
+def salvar_snapshot(caminho, rede, tabela=None, comprimir=True, propriedades=None):
+    """
+    Grava a rede (e a TabelaPosterior 'tabela', se dada) em 'caminho' (.npz).
+    'propriedades' ({variável: [textos]}) guarda as <PROPERTY> do XMLBIF.
+    comprimir=False usa np.savez: leitura um pouco mais rápida, arquivo bem
+    maior (cada array leva cabeçalhos próprios e os nomes são UTF-32).
+    """
+    variaveis = rede.variaveis
+    propriedades = propriedades or {}
+    posicao = {v: i for i, v in enumerate(variaveis)}
+    dados = {
+        'versao_formato': np.array(VERSAO_FORMATO),
+        'variaveis': np.array(variaveis, dtype=str),
+        'n_estados': np.array([rede.cardinalidade(v) for v in variaveis], dtype=np.int64),
+        'estados': np.array([e for v in variaveis for e in rede.estados[v]], dtype=str),
+        'n_pais': np.array([len(rede.pais[v]) for v in variaveis], dtype=np.int64),
+        'pais': np.array([posicao[p] for v in variaveis for p in rede.pais[v]], dtype=np.int64),
+        'cpts': np.concatenate([rede.cpt(v).ravel() for v in variaveis]),
+        'n_propriedades': np.array([len(propriedades.get(v, [])) for v in variaveis], dtype=np.int64),
+        'propriedades': np.array([p for v in variaveis for p in propriedades.get(v, [])], dtype=str),
+    }
+    if tabela is not None:
+        if tabela.rede is not rede:
+            raise ValueError("A tabela compilada é de outra rede")
+        dados['tabela_alvo'] = np.array(tabela.alvo, dtype=str)
+        dados['tabela_evidencias'] = np.array(tabela.evidencias, dtype=str)
+        dados['tabela'] = tabela.tabela  # recompila antes se a rede mudou
+    (np.savez_compressed if comprimir else np.savez)(caminho, **dados)
+
+
+def carregar_snapshot(caminho, com_propriedades=False):
+    """
+    (RedeDiscreta, TabelaPosterior ou None) lidos de um snapshot .npz. Com
+    com_propriedades=True devolve também {variável: [textos das <PROPERTY>]}.
+    """
+    with np.load(caminho, allow_pickle=False) as arquivo:
+        dados = {chave: arquivo[chave] for chave in arquivo.files}
+    versao = int(dados.get('versao_formato', -1))
+    if versao != VERSAO_FORMATO:
+        raise ValueError(f"Snapshot '{caminho}' com versão de formato {versao} (esperada {VERSAO_FORMATO})")
+
+    variaveis = [str(v) for v in dados['variaveis']]
+    fim_estados = np.cumsum(dados['n_estados'])
+    fim_pais = np.cumsum(dados['n_pais'])
+    estados, pais = {}, {}
+    for i, v in enumerate(variaveis):
+        estados[v] = [str(e) for e in dados['estados'][fim_estados[i] - dados['n_estados'][i]:fim_estados[i]]]
+        pais[v] = [variaveis[j] for j in dados['pais'][fim_pais[i] - dados['n_pais'][i]:fim_pais[i]]]
+
+    cpts = {}
+    inicio = 0
+    for v in variaveis:
+        formato = tuple(len(estados[p]) for p in pais[v]) + (len(estados[v]),)
+        tamanho = int(np.prod(formato))
+        cpts[v] = dados['cpts'][inicio:inicio + tamanho].reshape(formato)
+        inicio += tamanho
+    if inicio != dados['cpts'].size:
+        raise ValueError(f"Snapshot '{caminho}' inconsistente: {dados['cpts'].size} valores de CPT, "
+                         f"esperados {inicio}")
+    rede = RedeDiscreta(estados, pais, cpts)
+
+    tabela = None
+    if 'tabela' in dados:
+        tabela = TabelaPosterior.de_array(rede, str(dados['tabela_alvo']),
+                                          [str(v) for v in dados['tabela_evidencias']], dados['tabela'])
+    if not com_propriedades:
+        return rede, tabela
+
+    propriedades = {}
+    if 'propriedades' in dados:
+        fim = np.cumsum(dados['n_propriedades'])
+        for i, v in enumerate(variaveis):
+            textos = dados['propriedades'][fim[i] - dados['n_propriedades'][i]:fim[i]]
+            if len(textos):
+                propriedades[v] = [str(t) for t in textos]
+    return rede, tabela, propriedades
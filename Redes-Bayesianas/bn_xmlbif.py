@@ -0,0 +1,87 @@
+# --- LEITURA/ESCRITA DE XMLBIF EM FLUXO (STREAMING) ---
+# Disciplina: FGA0221 - Inteligência Artificial
+# Tema: Tratando Incerteza
+#
+# XMLBIFReader/XMLBIFWriter do pgmpy montam a árvore DOM inteira (e um
+# TabularCPD por variável), o que vai bem com 13 nós mas não com redes de
+# milhares. Aqui:
+#   - leitura com ElementTree.iterparse: cada <VARIABLE>/<DEFINITION> é
+#     processado ao fechar e descartado em seguida; o texto da <TABLE> vai
+#     direto para um array NumPy (np.fromstring);
+#   - escrita linha a linha no arquivo, uma CPT por vez.
+# A ordem da <TABLE> (GIVEN... com o primeiro variando mais devagar, o
+# estado da variável mais rápido) é a mesma de RedeDiscreta.cpt(v).ravel().
+# -----------------------------------------------------------------
+
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from bn_rede import RedeDiscreta
+
+
+def ler_xmlbif(caminho, com_propriedades=False):
+    """
+    RedeDiscreta lida de um arquivo XMLBIF. Com com_propriedades=True
+    devolve também {variável: [textos das <PROPERTY>]} (ex.: posições do GeNIe).
+    """
+    estados, pais, tabelas, propriedades = {}, {}, {}, {}
+    rede_xml = None
+    for evento, elemento in ET.iterparse(caminho, events=('start', 'end')):
+        tag = elemento.tag
+        if evento == 'start':
+            if tag == 'NETWORK':
+                rede_xml = elemento
+            continue
+        if tag == 'VARIABLE':
+            nome = elemento.findtext('NAME').strip()
+            estados[nome] = [o.text.strip() for o in elemento.iter('OUTCOME')]
+            propriedades[nome] = [p.text.strip() for p in elemento.iter('PROPERTY')]
+        elif tag == 'DEFINITION':
+            nome = elemento.findtext('FOR').strip()
+            pais[nome] = [g.text.strip() for g in elemento.iter('GIVEN')]
+            tabelas[nome] = np.fromstring(elemento.findtext('TABLE', ''), sep=' ')
+        else:
+            continue
+        # Registro processado: solta os filhos já lidos para a memória não crescer
+        elemento.clear()
+        if rede_xml is not None:
+            rede_xml.clear()
+
+    cpts = {}
+    for v, valores in tabelas.items():
+        desconhecidas = [x for x in pais[v] + [v] if x not in estados]
+        if desconhecidas:
+            raise ValueError(f"<DEFINITION> de '{v}' cita variáveis sem <VARIABLE>: {desconhecidas}")
+        formato = tuple(len(estados[x]) for x in pais[v] + [v])
+        if valores.size != int(np.prod(formato)):
+            raise ValueError(f"<TABLE> de '{v}' com {valores.size} valores, esperados {int(np.prod(formato))}")
+        cpts[v] = valores.reshape(formato)
+    rede = RedeDiscreta(estados, pais, cpts)
+    return (rede, propriedades) if com_propriedades else rede
+
+
+def escrever_xmlbif(rede, caminho, propriedades=None, nome='UNTITLED'):
+    """
+    Grava a RedeDiscreta em XMLBIF (versão 0.3, abre no GeNIe), uma variável
+    por vez. 'propriedades' ({variável: [textos]}) vira <PROPERTY>.
+    """
+    propriedades = propriedades or {}
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write('<?xml version="1.0" encoding="UTF-8"?>\n<BIF VERSION="0.3">\n\t<NETWORK>\n')
+        arquivo.write(f'\t\t<NAME>{escape(nome)}</NAME>\n')
+        for v in rede.variaveis:
+            linhas = [f'\t\t<VARIABLE TYPE="nature">\n\t\t\t<NAME>{escape(v)}</NAME>\n']
+            linhas += [f'\t\t\t<OUTCOME>{escape(e)}</OUTCOME>\n' for e in rede.estados[v]]
+            linhas += [f'\t\t\t<PROPERTY>{escape(p)}</PROPERTY>\n' for p in propriedades.get(v, [])]
+            linhas.append('\t\t</VARIABLE>\n')
+            arquivo.write(''.join(linhas))
+        for v in rede.variaveis:
+            linhas = [f'\t\t<DEFINITION>\n\t\t\t<FOR>{escape(v)}</FOR>\n']
+            linhas += [f'\t\t\t<GIVEN>{escape(p)}</GIVEN>\n' for p in rede.pais[v]]
+            # repr de float é a menor representação que volta ao mesmo valor
+            linhas.append(f"\t\t\t<TABLE>{' '.join(map(repr, rede.cpt(v).ravel().tolist()))}</TABLE>\n")
+            linhas.append('\t\t</DEFINITION>\n')
+            arquivo.write(''.join(linhas))
+        arquivo.write('\t</NETWORK>\n</BIF>\n')
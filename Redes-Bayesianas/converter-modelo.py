@@ -0,0 +1,87 @@
+# --- CONVERSOR XMLBIF <-> SNAPSHOT .npz ---
+# Converte a rede entre o XMLBIF exportado pelo bn-satisfacaov4 (legível,
+# abre no GeNIe) e o snapshot binário do bn_snapshot (carrega sem pgmpy).
+#
+# Uso:  python converter-modelo.py modelo_robos_final.bif modelo_robos_final.npz [--compilar Satisfacao_Final]
+#       python converter-modelo.py modelo_robos_final.npz modelo_robos_final.bif
+#       python converter-modelo.py --info modelo_robos_final.npz [--evidencia Marca=Xiaomi ...]
+# -----------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+
+inicio_processo = time.perf_counter()
+from bn_compilado import TabelaPosterior  # noqa: E402
+from bn_eliminacao import consultar  # noqa: E402
+from bn_snapshot import carregar_snapshot, salvar_snapshot  # noqa: E402
+from bn_xmlbif import escrever_xmlbif, ler_xmlbif  # noqa: E402
+
+
+def ler(caminho):
+    """(rede, tabela compilada ou None, propriedades do XMLBIF) de um .npz ou .bif."""
+    if caminho.lower().endswith('.npz'):
+        return carregar_snapshot(caminho, com_propriedades=True)
+    rede, propriedades = ler_xmlbif(caminho, com_propriedades=True)
+    return rede, None, propriedades
+
+
+def mostrar_info(caminho, evidencia):
+    inicio = time.perf_counter()
+    rede, tabela = carregar_snapshot(caminho)
+    t_carregar = time.perf_counter() - inicio
+    print(f"Arquivo: {caminho} ({os.path.getsize(caminho) / 1024:.1f} KB)")
+    print(f"Variáveis: {len(rede.variaveis)} | valores de CPT: {sum(rede.cpt(v).size for v in rede.variaveis)}")
+    print(f"Leitura: {t_carregar * 1e3:.2f} ms | pronto (imports + leitura): "
+          f"{(time.perf_counter() - inicio_processo) * 1e3:.1f} ms | pgmpy importado: "
+          f"{'sim' if 'pgmpy' in sys.modules else 'não'}")
+    if tabela is None:
+        return
+    print(f"Tabela compilada: P({tabela.alvo} | {', '.join(tabela.evidencias)}) {tabela.tabela.shape}")
+    if not evidencia:
+        return
+    faltando = [v for v in tabela.evidencias if v not in evidencia]
+    inicio = time.perf_counter()
+    try:
+        if faltando or any(v not in tabela.evidencias for v in evidencia):
+            # Evidência parcial: a tabela não serve, cai para a eliminação de variáveis
+            distribuicao = consultar(rede, [tabela.alvo], evidencia)
+            motor = f"eliminação de variáveis; a tabela precisa também de {faltando}" if faltando \
+                else "eliminação de variáveis"
+        else:
+            distribuicao = tabela.consultar(evidencia)
+            motor = "tabela compilada"
+    except ValueError as erro:
+        print(f"Consulta inválida: {erro}")
+        return
+    duracao = time.perf_counter() - inicio
+    valores = ', '.join(f"{e}: {p:.4f}" for e, p in zip(rede.estados[tabela.alvo], distribuicao))
+    print(f"P({tabela.alvo} | {evidencia}) = {{{valores}}} ({duracao * 1e6:.0f} µs, {motor})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Converte a rede entre XMLBIF e snapshot .npz')
+    parser.add_argument('arquivos', nargs='+', help='entrada e saída (.bif/.xml ou .npz)')
+    parser.add_argument('--compilar', metavar='ALVO', help='inclui a TabelaPosterior do alvo (evidência nas raízes)')
+    parser.add_argument('--sem-compressao', action='store_true', help='np.savez em vez de np.savez_compressed')
+    parser.add_argument('--info', action='store_true', help='mostra o conteúdo e o tempo de carga de um .npz')
+    parser.add_argument('--evidencia', nargs='*', default=[], metavar='VAR=ESTADO',
+                        help='com --info: consulta a tabela compilada')
+    args = parser.parse_args()
+
+    if args.info:
+        mostrar_info(args.arquivos[0], dict(par.split('=', 1) for par in args.evidencia))
+        sys.exit()
+    if len(args.arquivos) != 2:
+        parser.error("informe um arquivo de entrada e um de saída")
+
+    entrada, saida = args.arquivos
+    rede, tabela, propriedades = ler(entrada)
+    if args.compilar:
+        tabela = TabelaPosterior(rede, args.compilar)
+    if saida.lower().endswith('.npz'):
+        salvar_snapshot(saida, rede, tabela, comprimir=not args.sem_compressao, propriedades=propriedades)
+    else:
+        escrever_xmlbif(rede, saida, propriedades)
+    print(f"{entrada} ({os.path.getsize(entrada) / 1024:.1f} KB) -> {saida} ({os.path.getsize(saida) / 1024:.1f} KB)")